@@ -0,0 +1,189 @@
+"""
+The CPU-bound part of each endpoint, as plain functions of plain data.
+
+main.py decodes and validates the request, hands one of these to the worker
+pool (career_core.workers) and encodes the result. They may run on a thread
+or in another process, so they take and return only picklable values, read
+the current snapshot themselves, and signal bad input with ValueError.
+"""
+import numpy as np
+
+from career_core.logic import (
+    stream_probabilities, rank_subject_careers, suggest_careers,
+    recommend_colleges, college_page, match_subjects, search_catalogue,
+    calculate_quiz_scores, calculate_answer_scores, QUIZ_CATEGORIES, current_snapshot
+)
+from career_core.allocation import allocate_seats, student_preferences
+from career_core.batch import COLUMNS, score_batch
+from career_core.metrics import phase
+from career_core.streams import STREAMS
+
+
+def stage1(answers, marks):
+    # Map Q1-Q24 to scores (Logic from Notebook)
+    # Q1-3: analytical, Q4-6: numerical, Q7-9: communication, Q10-12: creativity,
+    # Q13-15: scientific, Q16-18: business, Q19-21: practical, Q22-24: leadership
+    with phase("score"):
+        scores = calculate_answer_scores(answers)
+
+        # Prepare user data
+        user_data = scores.copy()
+        user_data.update(marks)
+
+        stream, probabilities = stream_probabilities(user_data)
+
+    return {
+        "predicted_stream": stream,
+        "confidence_percent": round(100 * probabilities[stream], 1),
+        "stream_probabilities": probabilities,
+        "scores": scores
+    }
+
+
+def stage2(stream, interests):
+    """
+    Returns the stage 2 response, or None when no career path fits.
+    """
+    with phase("recommend"):
+        ranked = rank_subject_careers(stream, interests)
+
+    if not ranked:
+        return None
+
+    # Confidence is the share of the student's interest behind the pick
+    best = ranked[0]
+    subject_share = sum(s["score"] for s in ranked if s["subject"] == best["subject"])
+    career_share = sum(s["score"] for s in ranked if s["career"] == best["career"])
+    return {
+        "predicted_subject": best["subject"],
+        "predicted_career": best["career"],
+        "career_confidence_percent": round(100 * career_share, 1),
+        "subject_confidence_percent": round(100 * subject_share, 1),
+        "suggestions": ranked
+    }
+
+
+def stage3(stream, subject, location, cursor=None):
+    snapshot = current_snapshot()
+    # The subject may be spelled differently in the catalogue ("ITI
+    # Electrician" vs "ITI - Electrician/Mechanic"), or mistyped
+    subjects = match_subjects(stream, subject, snapshot)
+
+    # Get a page of college recommendations, distance-ranked from the
+    # student's location when one is given
+    with phase("recommend"):
+        colleges, next_cursor = college_page(
+            stream, subjects, page_size=10, cursor=cursor, snapshot=snapshot, location=location
+        )
+
+    return {
+        "recommended_colleges": colleges,
+        "total_count": len(colleges),
+        "matched_subjects": list(subjects),
+        "next_cursor": next_cursor
+    }
+
+
+def search(query, fields, k, stream):
+    return search_catalogue(query, fields=fields, k=k, stream=stream)
+
+
+def predict_stream(quiz_responses, marks):
+    """
+    Returns (stream, calculated scores, stream probabilities). Raises
+    ValueError for incomplete quiz responses.
+    """
+    calculated_scores = calculate_quiz_scores(quiz_responses)
+    user_data = calculated_scores.copy()
+    user_data.update(marks)
+    stream, probabilities = stream_probabilities(user_data)
+    return stream, calculated_scores, probabilities
+
+
+def rank_careers(stream, interests, top_n):
+    return rank_subject_careers(stream, interests, top_n=top_n)
+
+
+def careers_across_streams(interests, streams, top_n):
+    return suggest_careers(interests, streams=streams, top_n=top_n)
+
+
+def colleges(stream, subject, query, weights, max_colleges, location, rank_by, cursor=None):
+    """
+    /recommend-colleges: returns (colleges, next cursor). query is
+    (equals, contains, ranges) or None for the plain ranking.
+    """
+    return college_page(
+        stream, subject, page_size=max_colleges, cursor=cursor, query=query,
+        weights=weights, location=location, rank_by=rank_by
+    )
+
+
+def run_stages(chunk):
+    """
+    Runs stage 1-3 for a chunk of (index, record) pairs and returns one result
+    dict per record, in order.
+    """
+    snapshot = current_snapshot()
+    careers = snapshot.career_model()
+    results = []
+    rows, interests, valid = [], [], []
+    for index, record in chunk:
+        try:
+            row = [float(record.get(col, 0)) for col in COLUMNS]
+            # Stage 2 uses whichever interest keys the record carries
+            interest_row = [float(record.get(key, 0)) for key in careers.interests]
+            if min(interest_row, default=0) < 0:
+                raise ValueError("negative interest score")
+        except (AttributeError, TypeError, ValueError):
+            results.append({"index": index, "error": "Invalid student record"})
+            continue
+        rows.append(row)
+        interests.append(interest_row)
+        valid.append((index, record))
+
+    if not valid:
+        return results
+
+    scores, streams, probabilities = score_batch(np.array(rows, dtype=np.float64), return_probabilities=True)
+    # Probability the scorer gives each student's own stream
+    confidences = probabilities[np.arange(len(streams)), [STREAMS.index(s) for s in streams]]
+    picks = careers.best_batch(np.array(interests, dtype=np.float64), streams)
+    for (index, record), row_scores, stream, confidence, pick in zip(
+        valid, scores.tolist(), streams, confidences.tolist(), picks
+    ):
+        result = {
+            "index": index,
+            "predicted_stream": stream,
+            "confidence_percent": round(100 * confidence, 1),
+            "scores": dict(zip(QUIZ_CATEGORIES, row_scores)),
+        }
+        if "student_id" in record:
+            result["student_id"] = record["student_id"]
+
+        subject, career = careers.candidates[pick][2:] if pick is not None else (None, None)
+        result["predicted_subject"] = subject
+        result["predicted_career"] = career
+
+        # Stage 3
+        colleges = recommend_colleges(
+            stream, match_subjects(stream, subject, snapshot), max_colleges=10, snapshot=snapshot
+        ) if subject else []
+        result["recommended_colleges"] = colleges
+        result["total_count"] = len(colleges)
+        results.append(result)
+
+    results.sort(key=lambda r: r["index"])
+    return results
+
+
+def allocate(students, max_choices, rank_by, seed):
+    """
+    /allocations: returns the SeatAllocation for a cohort of student dicts.
+    """
+    with phase("allocate"):
+        return allocate_seats(students, max_choices=max_choices, rank_by=rank_by, seed=seed)
+
+
+def preferences(student, max_choices, rank_by):
+    return student_preferences([student], max_choices, rank_by)[0]
@@ -1,18 +1,135 @@
 
-from fastapi import FastAPI, HTTPException, Request
+import os
+import secrets
+import orjson
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Dict, Any, Optional
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from typing import Dict, Any, List, Optional
+from . import jobs
 from .models import (
     StreamPredictionRequest, StreamResponse,
-    CareerPathRequest, CareerResponse,
-    CollegeRecommendationRequest, CollegeResponse
+    CareerPathRequest, CareerResponse, CareerSuggestionRequest, CareerSuggestion,
+    CollegeRecommendationRequest, CollegeResponse,
+    Stage1Payload, Stage2Payload, Stage3Payload, PipelinePayload,
+    AllocationRequest, StudentChoices
 )
-from .logic import recommend_stream, recommend_subject_career, recommend_colleges, calculate_quiz_scores
-from .data import QUIZ_QUESTIONS, QUIZ_TO_SUBJECT_CAREER
+from career_core.logic import data_version, current_snapshot, recommendation_cache_stats, warmup
+from career_core.data import QUIZ_QUESTIONS
+from career_core import snapshot as snapshots
+from career_core.catalogue import DEFAULT_SOURCE, DEFAULT_SUBJECT_CAREERS
+from career_core.caching import LRUCache, StaticResponseCache, etag_matches
+from career_core import metrics
+from career_core.metrics import phase
+from career_core.workers import Overloaded, pool
+from career_core.analytics import CohortAnalytics
+from career_core.prediction_log import PredictionLog
+from career_core.admission import (
+    AdmissionController, AdmissionMiddleware, CHEAP, EXPENSIVE, BULK
+)
+
+# Set CATALOGUE_WATCH_INTERVAL (seconds) to reload the data files automatically
+# when they change; POST /admin/reload works either way.
+CATALOGUE_WATCH_INTERVAL = float(os.environ.get("CATALOGUE_WATCH_INTERVAL", 0))
+# When set, /admin endpoints require a matching X-Admin-Token header
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
+# /pipeline sessions: how many are kept, and for how long (seconds) after last use
+PIPELINE_SESSIONS = int(os.environ.get("PIPELINE_SESSIONS", 10000))
+PIPELINE_SESSION_TTL = float(os.environ.get("PIPELINE_SESSION_TTL", 3600))
+# Cohort analytics (GET /analytics): set ANALYTICS_SNAPSHOT_PATH to keep the
+# aggregates across restarts; they are saved every ANALYTICS_SNAPSHOT_INTERVAL
+# seconds and on shutdown
+ANALYTICS_SNAPSHOT_PATH = os.environ.get("ANALYTICS_SNAPSHOT_PATH")
+ANALYTICS_SNAPSHOT_INTERVAL = float(os.environ.get("ANALYTICS_SNAPSHOT_INTERVAL", 60))
+ANALYTICS_RETENTION_DAYS = int(os.environ.get("ANALYTICS_RETENTION_DAYS", 90))
+
+# Prediction log: set PREDICTION_LOG_PATH to append every prediction served
+# (inputs, output, catalogue version) to a SQLite file, written in groups of
+# up to PREDICTION_LOG_BATCH entries at most PREDICTION_LOG_FLUSH_MS apart.
+# PREDICTION_LOG_DURABILITY is off, normal or full; past
+# PREDICTION_LOG_QUEUE_LIMIT pending entries, new ones are dropped (and
+# counted) rather than slowing requests. Replay with backend/replay_log.py.
+PREDICTION_LOG_PATH = os.environ.get("PREDICTION_LOG_PATH")
+PREDICTION_LOG_DURABILITY = os.environ.get("PREDICTION_LOG_DURABILITY", "normal")
+PREDICTION_LOG_BATCH = int(os.environ.get("PREDICTION_LOG_BATCH", 512))
+PREDICTION_LOG_FLUSH_MS = float(os.environ.get("PREDICTION_LOG_FLUSH_MS", 50))
+PREDICTION_LOG_QUEUE_LIMIT = int(os.environ.get("PREDICTION_LOG_QUEUE_LIMIT", 10000))
+# Admission control: at most ADMISSION_MAX_CONCURRENT requests are served at
+# once; up to ADMISSION_QUEUE_LIMIT more wait (cheap routes first) for at most
+# ADMISSION_QUEUE_TIMEOUT seconds, the rest get 503. Each client (IP address,
+# or the first X-Forwarded-For one with ADMISSION_TRUST_FORWARDED=1) may make
+# RATE_LIMIT_PER_SECOND requests a second with bursts of RATE_LIMIT_BURST,
+# and gets 429 past that; 0 turns the rate limit off.
+ADMISSION_MAX_CONCURRENT = int(os.environ.get("ADMISSION_MAX_CONCURRENT", 64))
+ADMISSION_QUEUE_LIMIT = int(os.environ.get("ADMISSION_QUEUE_LIMIT", 256))
+ADMISSION_QUEUE_TIMEOUT = float(os.environ.get("ADMISSION_QUEUE_TIMEOUT", 5))
+ADMISSION_TRUST_FORWARDED = os.environ.get("ADMISSION_TRUST_FORWARDED") == "1"
+RATE_LIMIT_PER_SECOND = float(os.environ.get("RATE_LIMIT_PER_SECOND", 20))
+RATE_LIMIT_BURST = float(os.environ.get("RATE_LIMIT_BURST", 60))
+# Seat allocations (POST /allocations) kept in memory for incremental
+# updates: how many, and for how long (seconds) after the last change
+ALLOCATIONS_KEPT = int(os.environ.get("ALLOCATIONS_KEPT", 4))
+ALLOCATION_TTL = float(os.environ.get("ALLOCATION_TTL", 86400))
+
+cohorts = CohortAnalytics(retention_days=ANALYTICS_RETENTION_DAYS)
+prediction_log = PredictionLog(
+    PREDICTION_LOG_PATH, durability=PREDICTION_LOG_DURABILITY, batch_size=PREDICTION_LOG_BATCH,
+    flush_interval=PREDICTION_LOG_FLUSH_MS / 1000, queue_limit=PREDICTION_LOG_QUEUE_LIMIT,
+) if PREDICTION_LOG_PATH else None
 
-app = FastAPI(title="Career Guidance API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the data and build every index before taking traffic; process
+    # workers do the same for their own copy
+    warmup()
+    pool.start()
+    if prediction_log is not None:
+        prediction_log.start()
+    if ANALYTICS_SNAPSHOT_PATH:
+        cohorts.load(ANALYTICS_SNAPSHOT_PATH)
+        cohorts.autosave(ANALYTICS_SNAPSHOT_PATH, ANALYTICS_SNAPSHOT_INTERVAL)
+    if CATALOGUE_WATCH_INTERVAL > 0:
+        snapshots.watch(
+            [
+                os.environ.get("COLLEGE_DB_PATH") or DEFAULT_SOURCE,
+                os.environ.get("SUBJECT_CAREERS_PATH") or DEFAULT_SUBJECT_CAREERS,
+            ],
+            interval=CATALOGUE_WATCH_INTERVAL,
+        )
+    yield
+    pool.shutdown()
+    if ANALYTICS_SNAPSHOT_PATH:
+        cohorts.save(ANALYTICS_SNAPSHOT_PATH)
+    if prediction_log is not None:
+        prediction_log.close()
 
+app = FastAPI(title="Career Guidance API", lifespan=lifespan)
+
+# Cost class of each route for the admission queue; anything else is STANDARD
+ADMISSION_ROUTES = [
+    ("/", CHEAP),
+    ("/quiz-questions", CHEAP),
+    ("/interests/*", CHEAP),
+    ("/admin/*", CHEAP),
+    ("/stage3", EXPENSIVE),
+    ("/recommend-colleges", EXPENSIVE),
+    ("/suggest-careers", EXPENSIVE),
+    ("/pipeline", EXPENSIVE),
+    ("/predict-stream:batch", BULK),
+    ("/allocations", BULK),
+]
+
+admission = AdmissionController(
+    max_concurrent=ADMISSION_MAX_CONCURRENT, queue_limit=ADMISSION_QUEUE_LIMIT,
+    queue_timeout=ADMISSION_QUEUE_TIMEOUT, rate=RATE_LIMIT_PER_SECOND, burst=RATE_LIMIT_BURST,
+)
+# Innermost, so shed requests still get CORS headers and show in the metrics.
+# /metrics is exempt so monitoring keeps working under overload.
+app.add_middleware(
+    AdmissionMiddleware, controller=admission, routes=ADMISSION_ROUTES,
+    exempt=["/metrics"], trust_forwarded=ADMISSION_TRUST_FORWARDED,
+)
 # Configure CORS for frontend connection
 app.add_middleware(
     CORSMiddleware,
@@ -20,110 +137,188 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Read by the frontend for "show more"
+    expose_headers=["X-Next-Cursor"],
 )
+# Outermost, so latency includes CORS handling
+app.add_middleware(metrics.MetricsMiddleware)
+
+@app.exception_handler(Overloaded)
+async def overloaded(request: Request, exc: Overloaded):
+    # Backpressure from the worker pool: shed the request instead of queueing it
+    return JSONResponse(
+        status_code=503, content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
 
 @app.get("/")
 def read_root():
     return {"message": "Welcome to the Career Guidance API"}
 
+# Static catalogue responses are serialized once per data version
+_static_cache = StaticResponseCache(data_version)
+STATIC_CACHE_CONTROL = "public, max-age=300"
+
+def _cached_json(request: Request, key, build):
+    body, etag = _static_cache.get(key, build)
+    headers = {"ETag": etag, "Cache-Control": STATIC_CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
 @app.get("/quiz-questions")
-def get_quiz_questions():
-    return QUIZ_QUESTIONS
+def get_quiz_questions(request: Request):
+    return _cached_json(request, "quiz-questions", lambda: QUIZ_QUESTIONS)
 
 # --- Legacy Support for Frontend Stages ---
 
-class Stage1Request(BaseModel):
-    # Allow flexible dict input to handle Q1...Q24 and other flat fields
-    # We use a permissive model or just accept Request and parse manually if keys are dynamic check
-    # But better to define fields if known.
-    # Frontend sends flat JSON with "Q1": val, "maths": val...
-    # Let's use extra=allow compatible model
-    maths_marks_percent: float
-    social_science_marks_percent: float
-    commerce_marks_percent: float = 0
-    # Capture all Qs in extra fields
-    class Config:
-        extra = "allow"
+def _decode(payload_type, body):
+    try:
+        with phase("decode"):
+            return payload_type.decode(body)
+    except ValueError as e:
+        # orjson.JSONDecodeError is a ValueError too
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _json(payload):
+    # orjson straight to bytes, skipping FastAPI's jsonable_encoder pass
+    with phase("serialize"):
+        return Response(content=orjson.dumps(payload), media_type="application/json")
+
+# Schools identify themselves with an X-School header (or a "school" field in
+# batch records) so /analytics can break the numbers down per school
+def _record_stage(school, stage, result, stream=None):
+    # Counts one /stage1-/stage3 style result in the cohort analytics
+    if stage == 1:
+        cohorts.record(school, result["predicted_stream"], result["scores"], result["confidence_percent"])
+    elif stage == 2:
+        cohorts.record(school, stream, subject=result["predicted_subject"], career=result["predicted_career"])
+    else:
+        cohorts.record(school, stream, colleges=result["recommended_colleges"])
+
+def _log(endpoint, inputs, output):
+    # Queues one entry for the prediction log; never waits on the disk.
+    # Outputs are serialized later, so they must not be changed after this.
+    if prediction_log is not None:
+        prediction_log.append(endpoint, inputs, output, current_snapshot())
 
 @app.post("/stage1")
 async def stage1_predict(request: Request):
-    data = await request.json()
-    
-    # Map Q1-Q24 to scores (Logic from Notebook)
-    # Q1-3: analytical
-    # Q4-6: numerical
-    # Q7-9: communication
-    # Q10-12: creativity
-    # Q13-15: scientific
-    # Q16-18: business
-    # Q19-21: practical
-    # Q22-24: leadership
-    
-    def get_avg(keys):
-        vals = [float(data.get(k, 0)) for k in keys]
-        return sum(vals) / len(vals) if vals else 0
-        
-    scores = {
-        "analytical_reasoning_score": get_avg(["Q1", "Q2", "Q3"]),
-        "numerical_aptitude_score": get_avg(["Q4", "Q5", "Q6"]),
-        "communication_score": get_avg(["Q7", "Q8", "Q9"]),
-        "creativity_score": get_avg(["Q10", "Q11", "Q12"]),
-        "scientific_interest_score": get_avg(["Q13", "Q14", "Q15"]),
-        "business_interest_score": get_avg(["Q16", "Q17", "Q18"]),
-        "practical_skills_score": get_avg(["Q19", "Q20", "Q21"]),
-        "leadership_score": get_avg(["Q22", "Q23", "Q24"]),
-    }
-    
-    # Prepare user data
-    user_data = scores.copy()
-    user_data.update({
-        "maths_marks_percent": float(data.get("maths_marks_percent", 0)),
-        "social_science_marks_percent": float(data.get("social_science_marks_percent", 0)),
-        "commerce_marks_percent": float(data.get("commerce_marks_percent", 0)),
-    })
-    
-    stream = recommend_stream(user_data)
-    
-    return {
-        "predicted_stream": stream,
-        "confidence_percent": 85.0, # Mock confidence as logic doesn't output prob
-        "scores": scores
-    }
+    payload = _decode(Stage1Payload, await request.body())
+    result = await pool.run(jobs.stage1, payload.answers, payload.marks())
+    _record_stage(request.headers.get("x-school"), 1, result)
+    _log("stage1", {"answers": payload.answers, "marks": payload.marks()}, result)
+    return _json(result)
 
 @app.post("/predict-stream", response_model=StreamResponse)
-def predict_stream(request: StreamPredictionRequest):
+async def predict_stream(request: StreamPredictionRequest, x_school: Optional[str] = Header(default=None)):
     """
     New Endpoint: Calculates psychometric scores from quiz responses and predicts the best stream.
     """
-    calculated_scores = calculate_quiz_scores(request.quiz_responses)
-    user_data = calculated_scores.copy()
-    user_data.update({
+    marks = {
         "maths_marks_percent": request.maths_marks_percent,
         "social_science_marks_percent": request.social_science_marks_percent,
         "commerce_marks_percent": request.commerce_marks_percent
-    })
-    stream = recommend_stream(user_data)
-    return StreamResponse(
-        recommended_stream=stream,
-        calculated_scores=calculated_scores
-    )
+    }
+    try:
+        stream, calculated_scores, probabilities = await pool.run(
+            jobs.predict_stream, request.quiz_responses, marks
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    confidence = round(100 * probabilities[stream], 1)
+    cohorts.record(x_school, stream, calculated_scores, confidence)
+    result = {
+        "recommended_stream": stream,
+        "calculated_scores": calculated_scores,
+        "confidence_percent": confidence,
+        "stream_probabilities": probabilities
+    }
+    _log("predict-stream", {"quiz_responses": request.quiz_responses, "marks": marks}, result)
+    return StreamResponse(**result)
 
 @app.get("/interests/{stream}")
-def get_stream_interests(stream: str):
-    if stream not in QUIZ_TO_SUBJECT_CAREER:
+def get_stream_interests(stream: str, request: Request):
+    subject_careers = current_snapshot().subject_careers
+    if stream not in subject_careers:
         raise HTTPException(status_code=400, detail="Invalid stream")
-    return list(QUIZ_TO_SUBJECT_CAREER[stream].keys())
+    return _cached_json(
+        request, ("interests", stream),
+        lambda: list(subject_careers[stream].keys())
+    )
 
 @app.post("/recommend-career", response_model=CareerResponse)
-def recommend_career(request: CareerPathRequest):
-    subject, career = recommend_subject_career(request.stream, request.interests)
-    if not subject:
+async def recommend_career(request: CareerPathRequest, x_school: Optional[str] = Header(default=None)):
+    ranked = await pool.run(jobs.rank_careers, request.stream, request.interests, request.top_n)
+    if not ranked:
         raise HTTPException(status_code=404, detail="Could not determine a career path.")
-    return CareerResponse(recommended_subject=subject, recommended_career=career)
+    cohorts.record(x_school, request.stream, subject=ranked[0]["subject"], career=ranked[0]["career"])
+    result = {
+        "recommended_subject": ranked[0]["subject"],
+        "recommended_career": ranked[0]["career"],
+        "suggestions": ranked
+    }
+    _log("recommend-career", {"stream": request.stream, "interests": request.interests, "top_n": request.top_n}, result)
+    return CareerResponse(**result)
+
+@app.post("/suggest-careers", response_model=Dict[str, List[CareerSuggestion]])
+async def suggest_careers_across_streams(request: CareerSuggestionRequest):
+    """
+    Ranked subject/career suggestions for several streams (all by default)
+    from one set of interest scores.
+    """
+    return await pool.run(jobs.careers_across_streams, request.interests, request.streams, request.top_n)
+
+SEARCH_FIELDS = ("college_name", "city", "subjects")
+
+@app.get("/search")
+async def search_catalogue(
+    q: str = Query(min_length=1, max_length=200),
+    fields: List[str] = Query(default=list(SEARCH_FIELDS)),
+    k: int = Query(default=10, ge=1, le=100),
+    stream: Optional[str] = None,
+):
+    """
+    Typo-tolerant search over college names, cities and subjects (trigram
+    matching). Returns {"colleges": [...], "cities": [...], "subjects": [...]}
+    for the requested fields, best matches first, each with a match_score
+    (the share of the query found, 0-1). stream restricts colleges and
+    subjects to one stream.
+    """
+    unknown = set(fields) - set(SEARCH_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown search fields: {', '.join(sorted(unknown))}")
+    return _json(await pool.run(jobs.search, q, tuple(fields), k, stream))
 
 @app.post("/recommend-colleges", response_model=list[CollegeResponse])
-def get_college_recommendations(request: CollegeRecommendationRequest):
-    colleges = recommend_colleges(request.stream, request.subject)
+async def get_college_recommendations(
+    request: CollegeRecommendationRequest, response: Response, x_school: Optional[str] = Header(default=None)
+):
+    """
+    One page of colleges. When there are more, the X-Next-Cursor response
+    header holds the cursor for the next page.
+    """
+    location = None
+    if request.latitude is not None and request.longitude is not None:
+        location = (request.latitude, request.longitude)
+    elif request.rank_by == "travel_time":
+        raise HTTPException(status_code=400, detail="rank_by=travel_time needs latitude and longitude")
+    query = request.filters.to_query() if request.filters else None
+    try:
+        colleges, next_cursor = await pool.run(
+            jobs.colleges, request.stream, request.subject, query, request.weights,
+            request.max_colleges, location, request.rank_by, request.cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    cohorts.record(x_school, request.stream, colleges=colleges)
+    _log("recommend-colleges", {
+        "stream": request.stream, "subject": request.subject, "query": query, "weights": request.weights,
+        "max_colleges": request.max_colleges, "location": location, "rank_by": request.rank_by,
+        "cursor": request.cursor,
+    }, {"colleges": colleges, "next_cursor": next_cursor})
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
     return colleges
 
 @app.post("/stage2")
@@ -132,46 +327,423 @@ async def stage2_predict(request: Request):
     Legacy endpoint for Stage 2: Career and Subject prediction
     Frontend sends: predicted_stream + interest scores (e.g., math_interest: 5)
     """
-    data = await request.json()
-    stream = data.get("predicted_stream")
+    payload = _decode(Stage2Payload, await request.body())
+    stream = payload.predicted_stream
+    snapshot = current_snapshot()
     
-    if not stream or stream not in QUIZ_TO_SUBJECT_CAREER:
+    if not stream or stream not in snapshot.subject_careers:
         raise HTTPException(status_code=400, detail="Invalid or missing stream")
     
-    # Extract interest scores from the payload
-    # Frontend sends keys like "math_interest", "chemistry_interest", etc.
-    interests = {k: v for k, v in data.items() if k != "predicted_stream"}
-    
-    # Use the logic to recommend subject and career
-    subject, career = recommend_subject_career(stream, interests)
-    
-    if not subject:
+    # Interest scores are every other key the frontend sends,
+    # e.g. "math_interest", "chemistry_interest", etc.
+    result = await pool.run(jobs.stage2, stream, payload.interests)
+    if result is None:
         raise HTTPException(status_code=404, detail="Could not determine career path")
-    
-    return {
-        "predicted_subject": subject,
-        "predicted_career": career,
-        "career_confidence_percent": 88.0,  # Mock confidence
-        "subject_confidence_percent": 90.0  # Mock confidence
-    }
+    _record_stage(request.headers.get("x-school"), 2, result, stream)
+    _log("stage2", {"stream": stream, "interests": payload.interests}, result)
+    return _json(result)
 
 @app.post("/stage3")
 async def stage3_colleges(request: Request):
     """
     Legacy endpoint for Stage 3: College recommendations
-    Frontend sends: predicted_stream + predicted_subject
+    Frontend sends: predicted_stream + predicted_subject, plus the previous
+    response's next_cursor to show more
     """
-    data = await request.json()
-    stream = data.get("predicted_stream")
-    subject = data.get("predicted_subject")
+    payload = _decode(Stage3Payload, await request.body())
+    stream = payload.predicted_stream
+    subject = payload.predicted_subject
     
     if not stream or not subject:
         raise HTTPException(status_code=400, detail="Missing stream or subject")
-    
-    # Get college recommendations
-    colleges = recommend_colleges(stream, subject, max_colleges=10)
-    
-    return {
-        "recommended_colleges": colleges,
-        "total_count": len(colleges)
-    }
+
+    try:
+        result = await pool.run(jobs.stage3, stream, subject, payload.location(), payload.cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    _record_stage(request.headers.get("x-school"), 3, result, stream)
+    _log("stage3", {"stream": stream, "subject": subject, "location": payload.location(), "cursor": payload.cursor}, result)
+    return _json(result)
+
+# --- Pipeline ---
+
+# Session token -> what the student's earlier pipeline calls worked out
+# (stream, subject, location). Kept in this process only; a client that
+# loses its session can always resend the earlier stages' input.
+_sessions = LRUCache(maxsize=PIPELINE_SESSIONS, ttl=PIPELINE_SESSION_TTL)
+
+@app.post("/pipeline")
+async def pipeline(request: Request):
+    """
+    Runs stage 1, 2 and 3 in one round trip, streaming each stage's result as
+    an NDJSON line ({"stage": n, "session": token, ...the stage's response})
+    as soon as it is ready.
+    Each stage runs when its input is in the request: stage1 answers and marks,
+    stage2 interests, and stage 3 whenever a subject is known (from stage 2, or
+    stage3.predicted_subject). What a stage needs from earlier ones comes from
+    this request or, given a session token, from earlier calls, so after
+    /pipeline {"stage1": ...} the client can send {"session": ..., "stage2": ...}
+    and get stages 2 and 3 back. An unknown or expired session (a restart,
+    the TTL, another worker process) starts a new one, unless the request
+    needs what the old one held; then it is a 404.
+    """
+    payload = _decode(PipelinePayload, await request.body())
+    state = _sessions.get(payload.session) if payload.session is not None else None
+    lost_session = payload.session is not None and state is None
+    if state is not None:
+        token = payload.session
+    else:
+        state = {}
+        token = secrets.token_urlsafe(16)
+
+    stage1, stage2, stage3 = payload.stage1, payload.stage2, payload.stage3
+    stream = (stage2 and stage2.predicted_stream) or (stage3 and stage3.predicted_stream) or state.get("stream")
+    subject = (stage3 and stage3.predicted_subject) or state.get("subject")
+    location = (stage3 and stage3.location()) or state.get("location")
+
+    # Catch what can't work before streaming anything
+    if stage1 is None:
+        if stage2 is not None and stream not in current_snapshot().subject_careers:
+            if lost_session and not stream:
+                raise HTTPException(status_code=404, detail="Unknown or expired session")
+            raise HTTPException(status_code=400, detail="Invalid or missing stream")
+        if stage2 is None and stage3 is not None and (not stream or not subject):
+            if lost_session:
+                raise HTTPException(status_code=404, detail="Unknown or expired session")
+            raise HTTPException(status_code=400, detail="Missing stream or subject")
+        if stage2 is None and stage3 is None:
+            raise HTTPException(status_code=400, detail="Nothing to run: send stage1, stage2 or stage3")
+
+    def line(stage, result):
+        return orjson.dumps({"stage": stage, "session": token, **result}) + b"\n"
+
+    # The first stage is subject to backpressure like any request; the rest
+    # wait for room once the response is under way
+    first = None
+    if stage1 is not None:
+        first = await pool.run(jobs.stage1, stage1.answers, stage1.marks())
+        stream = first["predicted_stream"]
+        # A new stream invalidates the earlier subject
+        if stream != state.get("stream"):
+            subject = stage3 and stage3.predicted_subject
+    state.update(stream=stream, subject=subject, location=location)
+    _sessions.put(token, state)
+
+    school = request.headers.get("x-school")
+
+    async def stages():
+        nonlocal subject
+        if first is not None:
+            _record_stage(school, 1, first)
+            _log("stage1", {"answers": stage1.answers, "marks": stage1.marks()}, first)
+            yield line(1, first)
+        if stage2 is not None:
+            result = await pool.run(jobs.stage2, stream, stage2.interests, wait=True)
+            if result is None:
+                yield line(2, {"error": "Could not determine career path"})
+                return
+            subject = result["predicted_subject"]
+            state["subject"] = subject
+            _sessions.put(token, state)
+            _record_stage(school, 2, result, stream)
+            _log("stage2", {"stream": stream, "interests": stage2.interests}, result)
+            yield line(2, result)
+        if subject and (stage2 is not None or stage3 is not None):
+            # A cursor only continues the subject it came from
+            cursor = stage3.cursor if stage3 is not None and stage2 is None else None
+            try:
+                result = await pool.run(jobs.stage3, stream, subject, location, cursor, wait=True)
+            except ValueError as e:
+                yield line(3, {"error": str(e)})
+                return
+            _record_stage(school, 3, result, stream)
+            _log("stage3", {"stream": stream, "subject": subject, "location": location, "cursor": cursor}, result)
+            yield line(3, result)
+
+    return StreamingResponse(stages(), media_type="application/x-ndjson")
+
+# --- Catalogue Administration ---
+
+def _require_admin(x_admin_token: Optional[str] = Header(default=None)):
+    if ADMIN_TOKEN and x_admin_token != ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+@app.get("/admin/catalogue", dependencies=[Depends(_require_admin)])
+def catalogue_status():
+    """
+    Reports the catalogue snapshot currently serving requests.
+    """
+    status = current_snapshot().info()
+    status["reloading"] = snapshots.is_reloading()
+    status["last_reload_error"] = snapshots.last_reload_error()
+    return status
+
+@app.post("/admin/reload", status_code=202, dependencies=[Depends(_require_admin)])
+def reload_catalogue():
+    """
+    Rebuilds the catalogue snapshot from the data files in the background and
+    swaps it in when ready. In-flight requests finish on the old snapshot.
+    """
+    started = snapshots.reload_async()
+    return {"reload_started": started, "current_version": current_snapshot().version}
+
+# --- Analytics ---
+
+@app.get("/analytics", dependencies=[Depends(_require_admin)])
+def cohort_analytics(
+    day: Optional[str] = None,
+    school: Optional[str] = None,
+    top: int = Query(default=10, ge=1, le=100),
+):
+    """
+    Live aggregates of the predictions served, for one day (YYYY-MM-DD, UTC)
+    and/or school, or all of them: students per stream, the top careers and
+    colleges, and the distribution (histogram, mean, quantiles) of every
+    category score and of the stream confidence.
+    """
+    return _json(cohorts.summary(day, school, top))
+
+# --- Seat Allocation ---
+
+# Allocation id -> SeatAllocation, kept in this process only
+_allocations = LRUCache(maxsize=ALLOCATIONS_KEPT, ttl=ALLOCATION_TTL)
+
+def _student_choices(student_id, choices):
+    # The dict the allocation jobs take; student ids are handled as strings
+    if choices.preferences is None and (not choices.stream or not choices.subject):
+        raise HTTPException(
+            status_code=400, detail=f"Student {student_id}: give preferences, or a stream and subject"
+        )
+    student = choices.model_dump()
+    student["student_id"] = str(student_id)
+    return student
+
+def _allocation(allocation_id):
+    allocation = _allocations.get(allocation_id)
+    if allocation is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired allocation")
+    return allocation
+
+@app.post("/allocations", dependencies=[Depends(_require_admin)])
+async def create_allocation(request: AllocationRequest):
+    """
+    Allocates college seats to a whole cohort with deferred acceptance (see
+    career_core/allocation.py): every student gets the best college on
+    their list that has a seat for them, higher merit first where a college
+    is oversubscribed. Returns the allocation id (for later changes), a
+    summary and every student's seat.
+    """
+    students = [_student_choices(student.student_id, student) for student in request.students]
+    # After str(), so 1 and "1" are the same student
+    seen = set()
+    for student in students:
+        if student["student_id"] in seen:
+            raise HTTPException(status_code=400, detail=f"Duplicate student_id {student['student_id']}")
+        seen.add(student["student_id"])
+    allocation = await pool.run(jobs.allocate, students, request.max_choices, request.rank_by, request.seed)
+    allocation_id = secrets.token_urlsafe(12)
+    _allocations.put(allocation_id, (allocation, request.max_choices, request.rank_by))
+    return _json({
+        "allocation_id": allocation_id,
+        "summary": allocation.summary(),
+        "assignments": allocation.assignments(),
+    })
+
+@app.get("/allocations/{allocation_id}", dependencies=[Depends(_require_admin)])
+def get_allocation(allocation_id: str, assignments: bool = False):
+    allocation, _, _ = _allocation(allocation_id)
+    result = {"allocation_id": allocation_id, "summary": allocation.summary()}
+    if assignments:
+        result["assignments"] = allocation.assignments()
+    return _json(result)
+
+@app.get("/allocations/{allocation_id}/students/{student_id}", dependencies=[Depends(_require_admin)])
+def get_student_seat(allocation_id: str, student_id: str):
+    allocation, _, _ = _allocation(allocation_id)
+    if student_id not in allocation:
+        raise HTTPException(status_code=404, detail="Unknown student")
+    return allocation.assignment(student_id)
+
+@app.put("/allocations/{allocation_id}/students/{student_id}", dependencies=[Depends(_require_admin)])
+async def update_student_choices(allocation_id: str, student_id: str, choices: StudentChoices):
+    """
+    Adds a student to an allocation or changes their choices (empty
+    preferences withdraw them), re-allocating only the seats this affects.
+    Returns the student's seat and every seat that changed.
+    """
+    allocation, max_choices, rank_by = _allocation(allocation_id)
+    student = _student_choices(student_id, choices)
+    preferences = student["preferences"]
+    if preferences is None:
+        preferences = await pool.run(jobs.preferences, student, max_choices, rank_by)
+    # Applied on the event loop, so changes to one allocation never interleave
+    changed = allocation.update(student["student_id"], preferences, choices.merit)
+    _allocations.put(allocation_id, (allocation, max_choices, rank_by))
+    return _json({
+        "assignment": allocation.assignment(student["student_id"]),
+        "changed": [{"student_id": key, "college_id": college_id} for key, college_id in changed.items()],
+    })
+
+# --- Metrics and Profiling ---
+
+def _cache_metrics():
+    stats = recommendation_cache_stats()
+    lines = []
+    for name, kind in (("hits", "counter"), ("misses", "counter"), ("evictions", "counter"), ("size", "gauge")):
+        metric = f"recommendation_cache_{name}" + ("_total" if kind == "counter" else "")
+        lines.append(f"# TYPE {metric} {kind}")
+        lines.append(f"{metric} {stats[name]}")
+    lines.append("# TYPE catalogue_version gauge")
+    lines.append(f"catalogue_version {data_version()}")
+    return lines
+
+metrics.register_collector(_cache_metrics)
+metrics.register_collector(pool.metrics)
+metrics.register_collector(admission.metrics)
+if prediction_log is not None:
+    metrics.register_collector(prediction_log.metrics)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """
+    Request latency histograms (per route and per phase) and cache counters,
+    in the Prometheus text exposition format.
+    """
+    return PlainTextResponse(
+        metrics.render_prometheus(), media_type="text/plain; version=0.0.4"
+    )
+
+@app.post("/admin/profile", dependencies=[Depends(_require_admin)])
+def start_profile(requests: int = 100, interval_ms: float = 5.0):
+    """
+    Arms the sampling profiler for the next `requests` requests. Fetch the
+    result with GET /admin/profile.
+    """
+    if requests < 1 or interval_ms <= 0:
+        raise HTTPException(status_code=400, detail="requests and interval_ms must be positive")
+    metrics.profiler.arm(requests, interval=interval_ms / 1000)
+    return metrics.profiler.status()
+
+@app.get("/admin/profile", response_class=PlainTextResponse, dependencies=[Depends(_require_admin)])
+def get_profile():
+    """
+    Returns the samples collected so far as folded stacks, ready for
+    flamegraph.pl or speedscope.
+    """
+    return PlainTextResponse(metrics.profiler.folded())
+
+# --- Bulk Endpoint ---
+
+# Records are scored through the vectorized path this many at a time, which
+# keeps memory flat no matter how large the upload is.
+BATCH_CHUNK_SIZE = 256
+# A JSON array has to be read whole before it can be parsed, so larger ones
+# get 413; NDJSON uploads are read line by line and have no limit.
+BATCH_JSON_MAX_BYTES = int(os.environ.get("BATCH_JSON_MAX_BYTES", 8 * 1024 * 1024))
+
+async def _iter_ndjson(request: Request):
+    """
+    Yields one decoded record per line of an NDJSON body, reading the body
+    incrementally instead of loading it all at once.
+    """
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield _decode_line(line)
+    if buffer.strip():
+        yield _decode_line(buffer)
+
+def _decode_line(line):
+    # A malformed line becomes an error result for that record only
+    try:
+        return orjson.loads(line)
+    except orjson.JSONDecodeError:
+        return None
+
+def _too_large():
+    return HTTPException(
+        status_code=413,
+        detail=f"JSON array uploads are limited to {BATCH_JSON_MAX_BYTES} bytes; "
+        "send larger classes as NDJSON (Content-Type: application/x-ndjson)",
+    )
+
+async def _iter_json_array(request: Request):
+    if int(request.headers.get("content-length") or 0) > BATCH_JSON_MAX_BYTES:
+        raise _too_large()
+    body = bytearray()
+    async for data in request.stream():
+        body += data
+        if len(body) > BATCH_JSON_MAX_BYTES:
+            raise _too_large()
+    records = orjson.loads(body)
+    if not isinstance(records, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array of students")
+    for record in records:
+        yield record
+
+class _UploadStreamingResponse(StreamingResponse):
+    """
+    Streams results while the request body is still being read. Starlette's
+    StreamingResponse listens for a disconnect on ASGI < 2.4 servers (uvicorn),
+    and that listener swallows the rest of the body; here the body reader is
+    the only consumer of receive(), and sees a disconnect as ClientDisconnect.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+
+@app.post("/predict-stream:batch")
+async def predict_stream_batch(request: Request):
+    """
+    Bulk endpoint: runs stage 1, 2 and 3 for every student in the upload.
+    Accepts a JSON array, or NDJSON (Content-Type: application/x-ndjson) with
+    one flat student record per line, using the same keys as /stage1 and
+    /stage2 (Q1..Q24, marks, interest scores, optional student_id).
+    Results are streamed back as NDJSON, one line per student, in input order.
+    """
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type:
+        records = _iter_ndjson(request)
+    else:
+        records = _iter_json_array(request)
+
+    # Pull the first chunk before streaming so a bad JSON body still gets a 400
+    async def next_chunk(start):
+        chunk = []
+        async for record in records:
+            chunk.append((start + len(chunk), record))
+            if len(chunk) == BATCH_CHUNK_SIZE:
+                break
+        return chunk
+
+    try:
+        chunk = await next_chunk(0)
+    except orjson.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Malformed JSON in upload")
+
+    # The first chunk is subject to backpressure like any request; once the
+    # upload is under way, later chunks wait for room instead of failing
+    first = await pool.run(jobs.run_stages, chunk) if chunk else []
+
+    school = request.headers.get("x-school")
+
+    async def stream_results(chunk, results):
+        while chunk:
+            records = dict(chunk)
+            for result in results:
+                if "error" not in result:
+                    record = records[result["index"]]
+                    cohorts.record(
+                        record.get("school") or school, result["predicted_stream"], result["scores"],
+                        result["confidence_percent"], result["predicted_subject"], result["predicted_career"],
+                        result["recommended_colleges"] if result["predicted_subject"] else None,
+                    )
+                _log("predict-stream:batch", {"record": records[result["index"]]}, result)
+                yield orjson.dumps(result) + b"\n"
+            chunk = await next_chunk(chunk[-1][0] + 1)
+            results = await pool.run(jobs.run_stages, chunk, wait=True) if chunk else []
+
+    return _UploadStreamingResponse(stream_results(chunk, first), media_type="application/x-ndjson")
@@ -1,6 +1,8 @@
 
-from pydantic import BaseModel
-from typing import Dict, Optional, List
+import orjson
+from pydantic import BaseModel, Field, confloat, conint
+from typing import Dict, Optional, List, Literal, Union
+from career_core.logic import QUESTION_KEY_SLOTS
 
 # --- Request Models ---
 
@@ -18,21 +20,118 @@ class CareerPathRequest(BaseModel):
     stream: str
     # Detailed interests for the specific stream (1-5 scale)
     # e.g. {"math_interest": 5, "cs_interest": 4}
-    interests: Dict[str, int]
+    interests: Dict[str, conint(ge=0)]
+    # How many ranked suggestions to return alongside the top pick
+    top_n: int = Field(default=3, ge=1, le=50)
+
+class CareerSuggestionRequest(BaseModel):
+    # Interest scores across any streams (1-5 scale)
+    interests: Dict[str, confloat(ge=0)]
+    # Streams to suggest for; all of them when omitted
+    streams: Optional[List[str]] = None
+    top_n: int = Field(default=3, ge=1, le=50)
+
+class CollegeFilters(BaseModel):
+    # Yes/no requirements
+    hostel: Optional[bool] = None
+    scholarship: Optional[bool] = None
+    transport_available: Optional[bool] = None
+    # Any of the listed values
+    city: Optional[List[str]] = None
+    gender_specific: Optional[List[str]] = None
+    accreditation: Optional[List[str]] = None
+    placement_opportunities: Optional[List[str]] = None
+    # All of the listed facilities
+    facilities: Optional[List[str]] = None
+    # Ranges
+    max_tuition_fees: Optional[float] = None
+    min_rating: Optional[float] = None
+    max_distance_km: Optional[float] = None
+    min_average_package: Optional[float] = None
+
+    def to_query(self):
+        """
+        Converts to the (equals, contains, ranges) form used by QueryEngine.
+        """
+        equals = {}
+        for field in ("hostel", "scholarship", "transport_available"):
+            if getattr(self, field) is not None:
+                equals[field] = [getattr(self, field)]
+        for field in ("city", "gender_specific", "accreditation", "placement_opportunities"):
+            if getattr(self, field) is not None:
+                equals[field] = getattr(self, field)
+        contains = {"facilities": self.facilities} if self.facilities else {}
+        ranges = {}
+        if self.max_tuition_fees is not None:
+            ranges["tuition_fees"] = (None, self.max_tuition_fees)
+        if self.min_rating is not None:
+            ranges["rating"] = (self.min_rating, None)
+        if self.max_distance_km is not None:
+            ranges["distance_km"] = (None, self.max_distance_km)
+        if self.min_average_package is not None:
+            ranges["average_package"] = (self.min_average_package, None)
+        return equals, contains, ranges
 
 class CollegeRecommendationRequest(BaseModel):
     stream: str
     subject: str
+    # Optional student location; when given, colleges are ranked by real
+    # distance from it instead of the stored distance_km
+    latitude: Optional[float] = Field(default=None, ge=-90, le=90)
+    longitude: Optional[float] = Field(default=None, ge=-180, le=180)
+    rank_by: Literal["distance", "travel_time"] = "distance"
+    # Page size; pass the X-Next-Cursor header of a response as cursor to
+    # get the following page
+    max_colleges: int = Field(default=5, ge=1, le=100)
+    cursor: Optional[str] = None
+    # Optional filters and ranking weights, e.g. {"rating": 2, "tuition_fees": -1}.
+    # Weighted fields are normalized to 0..1; negative weights prefer low values.
+    filters: Optional[CollegeFilters] = None
+    weights: Optional[Dict[str, float]] = None
+
+class StudentChoices(BaseModel):
+    # Either the student's own ranked college_ids, or a stream and subject
+    # (plus an optional location) to rank colleges like /recommend-colleges
+    preferences: Optional[List[int]] = None
+    stream: Optional[str] = None
+    subject: Optional[str] = None
+    latitude: Optional[float] = Field(default=None, ge=-90, le=90)
+    longitude: Optional[float] = Field(default=None, ge=-180, le=180)
+    # Higher merit is seated first where colleges are oversubscribed
+    merit: Optional[float] = None
+
+class AllocationStudent(StudentChoices):
+    student_id: Union[int, str]
+
+class AllocationRequest(BaseModel):
+    students: List[AllocationStudent]
+    # Colleges ranked per student when preferences aren't given
+    max_choices: int = Field(default=10, ge=1, le=50)
+    rank_by: Literal["distance", "travel_time"] = "distance"
+    # Seeds the lottery that breaks ties between equal merit
+    seed: int = 0
 
 # --- Response Models ---
 
 class StreamResponse(BaseModel):
     recommended_stream: str
     calculated_scores: Dict[str, float]
+    # From the active stream scorer (see career_core/streams.py)
+    confidence_percent: Optional[float] = None
+    stream_probabilities: Optional[Dict[str, float]] = None
+
+class CareerSuggestion(BaseModel):
+    stream: str
+    interest: str
+    subject: str
+    career: str
+    # Share of the student's interest in the stream (0-1)
+    score: float
 
 class CareerResponse(BaseModel):
     recommended_subject: str
     recommended_career: str
+    suggestions: List[CareerSuggestion] = []
 
 class CollegeResponse(BaseModel):
     college_id: int
@@ -40,6 +139,145 @@ class CollegeResponse(BaseModel):
     city: str
     rating: float
     distance_km: float
+    travel_time_min: Optional[float] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
     tuition_fees: int
     facilities: List[str]
+    seats: Optional[int] = None
+    score: Optional[float] = None
     # Add other fields as needed
+
+# --- Legacy Stage Payloads ---
+# /stage1-/stage3 take flat JSON from the frontend. These are decoded with
+# orjson straight into slotted structures; decode() raises ValueError for
+# anything malformed.
+
+_QUESTION_KEYS = tuple(QUESTION_KEY_SLOTS)
+_MARKS_KEYS = ("maths_marks_percent", "social_science_marks_percent", "commerce_marks_percent")
+
+def _decode_object(body):
+    data = orjson.loads(body)
+    if not isinstance(data, dict):
+        raise ValueError("Expected a JSON object")
+    return data
+
+def _number(data, key):
+    value = data.get(key, 0)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{key} must be a number") from None
+
+def _optional_number(data, key):
+    return None if data.get(key) is None else _number(data, key)
+
+class Stage1Payload:
+    """
+    Q1..Q24 answers (in QUESTION_KEY_SLOTS order, 0 when missing) plus marks.
+    """
+    __slots__ = ("answers",) + _MARKS_KEYS
+
+    def __init__(self, answers, maths_marks_percent, social_science_marks_percent, commerce_marks_percent=0.0):
+        self.answers = answers
+        self.maths_marks_percent = maths_marks_percent
+        self.social_science_marks_percent = social_science_marks_percent
+        self.commerce_marks_percent = commerce_marks_percent
+
+    @classmethod
+    def decode(cls, body):
+        return cls.from_dict(_decode_object(body))
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls([_number(data, k) for k in _QUESTION_KEYS], *(_number(data, k) for k in _MARKS_KEYS))
+
+    def marks(self):
+        return {k: getattr(self, k) for k in _MARKS_KEYS}
+
+class Stage2Payload:
+    """
+    predicted_stream plus interest scores (every other key, e.g. math_interest).
+    """
+    __slots__ = ("predicted_stream", "interests")
+
+    def __init__(self, predicted_stream, interests):
+        self.predicted_stream = predicted_stream
+        self.interests = interests
+
+    @classmethod
+    def decode(cls, body):
+        return cls.from_dict(_decode_object(body))
+
+    @classmethod
+    def from_dict(cls, data):
+        data = dict(data)
+        stream = data.pop("predicted_stream", None)
+        for key, value in data.items():
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                data[key] = value = _number(data, key)
+            if value < 0:
+                raise ValueError(f"{key} must not be negative")
+        return cls(stream, data)
+
+class Stage3Payload:
+    """
+    predicted_stream and predicted_subject, with an optional student location
+    and the cursor of the page to continue from.
+    """
+    __slots__ = ("predicted_stream", "predicted_subject", "latitude", "longitude", "cursor")
+
+    def __init__(self, predicted_stream, predicted_subject, latitude=None, longitude=None, cursor=None):
+        self.predicted_stream = predicted_stream
+        self.predicted_subject = predicted_subject
+        self.latitude = latitude
+        self.longitude = longitude
+        self.cursor = cursor
+
+    @classmethod
+    def decode(cls, body):
+        return cls.from_dict(_decode_object(body))
+
+    @classmethod
+    def from_dict(cls, data):
+        cursor = data.get("cursor")
+        if cursor is not None and not isinstance(cursor, str):
+            raise ValueError("cursor must be a string")
+        return cls(
+            data.get("predicted_stream"), data.get("predicted_subject"),
+            _optional_number(data, "latitude"), _optional_number(data, "longitude"), cursor,
+        )
+
+    def location(self):
+        if self.latitude is None or self.longitude is None:
+            return None
+        return (self.latitude, self.longitude)
+
+class PipelinePayload:
+    """
+    /pipeline: an optional session token plus the input of any of the three
+    stages, each in the flat form its stage endpoint takes, e.g.
+    {"session": "...", "stage1": {"Q1": 4, ...}, "stage2": {"math_interest": 5, ...},
+     "stage3": {"latitude": 34.08, "longitude": 74.80}}
+    """
+    __slots__ = ("session", "stage1", "stage2", "stage3")
+
+    def __init__(self, session=None, stage1=None, stage2=None, stage3=None):
+        self.session = session
+        self.stage1 = stage1
+        self.stage2 = stage2
+        self.stage3 = stage3
+
+    @classmethod
+    def decode(cls, body):
+        data = _decode_object(body)
+        session = data.get("session")
+        if session is not None and not isinstance(session, str):
+            raise ValueError("session must be a string")
+        stages = []
+        for key, payload_type in (("stage1", Stage1Payload), ("stage2", Stage2Payload), ("stage3", Stage3Payload)):
+            section = data.get(key)
+            if section is not None and not isinstance(section, dict):
+                raise ValueError(f"{key} must be a JSON object")
+            stages.append(None if section is None else payload_type.from_dict(section))
+        return cls(session, *stages)
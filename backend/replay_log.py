@@ -0,0 +1,164 @@
+"""
+Replays a prediction log (career_core.prediction_log) against the current
+code and catalogue, and reports which responses would now come out different.
+
+Run from the project root, with the same COLLEGE_DB_PATH /
+SUBJECT_CAREERS_PATH as the server if the catalogue matters:
+    python -m backend.replay_log predictions.db --diff changed.ndjson
+
+Entries are read in chunks and batch records re-scored through the
+vectorized path a chunk at a time, so a log of millions of entries replays
+in one pass with flat memory.
+"""
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+
+from career_core.logic import warmup
+from career_core.prediction_log import read
+
+from . import jobs
+
+BATCH_ENDPOINT = "predict-stream:batch"
+BATCH_CHUNK_SIZE = 256
+
+
+def _location(value):
+    return tuple(value) if value is not None else None
+
+
+def _query(value):
+    return tuple(value) if value is not None else None
+
+
+def _predict_stream(inputs):
+    stream, calculated_scores, probabilities = jobs.predict_stream(inputs["quiz_responses"], inputs["marks"])
+    return {
+        "recommended_stream": stream,
+        "calculated_scores": calculated_scores,
+        "confidence_percent": round(100 * probabilities[stream], 1),
+        "stream_probabilities": probabilities,
+    }
+
+
+def _recommend_career(inputs):
+    ranked = jobs.rank_careers(inputs["stream"], inputs["interests"], inputs["top_n"])
+    if not ranked:
+        # main.py answers 404 here
+        return {"error": "Could not determine a career path."}
+    return {
+        "recommended_subject": ranked[0]["subject"],
+        "recommended_career": ranked[0]["career"],
+        "suggestions": ranked,
+    }
+
+
+def _recommend_colleges(inputs):
+    colleges, next_cursor = jobs.colleges(
+        inputs["stream"], inputs["subject"], _query(inputs["query"]), inputs["weights"],
+        inputs["max_colleges"], _location(inputs["location"]), inputs["rank_by"], inputs["cursor"],
+    )
+    return {"colleges": colleges, "next_cursor": next_cursor}
+
+
+# endpoint -> inputs -> the response main.py would log for them now
+REPLAYERS = {
+    "stage1": lambda inputs: jobs.stage1(inputs["answers"], inputs["marks"]),
+    "stage2": lambda inputs: jobs.stage2(inputs["stream"], inputs["interests"]),
+    "stage3": lambda inputs: jobs.stage3(
+        inputs["stream"], inputs["subject"], _location(inputs["location"]), inputs["cursor"]
+    ),
+    "predict-stream": _predict_stream,
+    "recommend-career": _recommend_career,
+    "recommend-colleges": _recommend_colleges,
+}
+
+
+def _normalize(value):
+    # Compare as the log stores things (tuples as lists, dates as strings)
+    return json.loads(json.dumps(value, default=str))
+
+
+def replay(entries):
+    """
+    Yields (entry, replayed output) for (id, endpoint, version, built_at,
+    inputs, output) entries. Replaying raises nothing: an error becomes
+    {"error": ...} as the output.
+    """
+    pending = []
+
+    def flush_batch():
+        # Every upload numbers its records from 0, so run the chunk by
+        # position and put each entry's own index back on its result
+        chunk = [(position, entry[4]["record"]) for position, entry in enumerate(pending)]
+        by_position = {result["index"]: result for result in jobs.run_stages(chunk)}
+        for position, entry in enumerate(pending):
+            result = by_position.get(position)
+            if result is not None:
+                result["index"] = entry[5].get("index", position)
+            yield entry, result
+        pending.clear()
+
+    for entry in entries:
+        endpoint, inputs = entry[1], entry[4]
+        if endpoint == BATCH_ENDPOINT:
+            pending.append(entry)
+            if len(pending) == BATCH_CHUNK_SIZE:
+                yield from flush_batch()
+            continue
+        replayer = REPLAYERS.get(endpoint)
+        try:
+            output = replayer(inputs) if replayer else {"error": f"Unknown endpoint {endpoint}"}
+        except (ValueError, KeyError, TypeError) as e:
+            output = {"error": f"{type(e).__name__}: {e}"}
+        yield entry, output
+    if pending:
+        yield from flush_batch()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("log", help="SQLite prediction log (PREDICTION_LOG_PATH)")
+    parser.add_argument("--endpoint", action="append", help="only replay these endpoints (repeatable)")
+    parser.add_argument("--after-id", type=int, default=0, help="start after this log entry id")
+    parser.add_argument("--limit", type=int, help="stop after this many entries")
+    parser.add_argument("--diff", help="write every changed response to this NDJSON file")
+    args = parser.parse_args()
+
+    warmup()
+    entries = read(args.log, endpoints=args.endpoint, after_id=args.after_id)
+    if args.limit is not None:
+        entries = (entry for _, entry in zip(range(args.limit), entries))
+
+    totals, changed = Counter(), Counter()
+    diff = open(args.diff, "w") if args.diff else None
+    start = time.perf_counter()
+    try:
+        for entry, output in replay(entries):
+            entry_id, endpoint, version, built_at, inputs, logged = entry
+            totals[endpoint] += 1
+            output = _normalize(output)
+            if output != logged:
+                changed[endpoint] += 1
+                if diff is not None:
+                    diff.write(json.dumps({
+                        "id": entry_id, "endpoint": endpoint, "catalogue_version": version,
+                        "catalogue_built_at": built_at, "input": inputs,
+                        "logged": logged, "replayed": output,
+                    }) + "\n")
+    finally:
+        if diff is not None:
+            diff.close()
+    elapsed = time.perf_counter() - start
+
+    count = sum(totals.values())
+    for endpoint, total in sorted(totals.items()):
+        print(f"{endpoint:24s} {total:>10,} replayed {changed[endpoint]:>10,} changed")
+    print(f"{count:,} entries in {elapsed:.2f}s ({count / elapsed if elapsed else 0:,.0f}/s)")
+    return 1 if changed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""
+/pipeline with a session the server no longer has (restart, TTL, another
+worker process). Run from the project root:
+    python -m pytest backend/test_pipeline.py
+"""
+import json
+
+from fastapi.testclient import TestClient
+
+from backend.main import app
+
+INTERESTS = {"math_interest": 5, "physics_interest": 4}
+
+
+def _stages(response):
+    return [json.loads(line) for line in response.text.splitlines() if line.strip()]
+
+
+def test_expired_session_starts_a_new_one_when_inputs_suffice():
+    with TestClient(app) as client:
+        response = client.post("/pipeline", json={
+            "session": "expired-token", "stage2": {"predicted_stream": "Science", **INTERESTS},
+        })
+        assert response.status_code == 200
+        stages = _stages(response)
+        assert [stage["stage"] for stage in stages] == [2, 3]
+        token = stages[0]["session"]
+        assert token != "expired-token"
+
+        # The new session works like any other
+        response = client.post("/pipeline", json={"session": token, "stage3": {"latitude": 34.08, "longitude": 74.80}})
+        assert response.status_code == 200
+        assert [stage["stage"] for stage in _stages(response)] == [3]
+
+
+def test_expired_session_is_404_when_it_was_needed():
+    with TestClient(app) as client:
+        response = client.post("/pipeline", json={"session": "expired-token", "stage2": INTERESTS})
+        assert response.status_code == 404
+        response = client.post("/pipeline", json={"session": "expired-token", "stage3": {"latitude": 34.08, "longitude": 74.80}})
+        assert response.status_code == 404
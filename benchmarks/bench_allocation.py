@@ -0,0 +1,85 @@
+"""
+Times seat allocation for a synthetic cohort: building preferences, the
+batch allocation, and incremental updates, checked against a full rerun.
+
+Run from the project root:
+    python -m benchmarks.bench_allocation --students 100000 --colleges 5000
+"""
+import argparse
+import random
+import time
+
+from benchmarks.load_test import make_catalogue
+from career_core.allocation import SeatAllocation, college_seats, student_preferences
+from career_core.snapshot import build_snapshot
+
+
+def make_cohort(snapshot, n, seed=0):
+    rng = random.Random(seed)
+    pairs = list(snapshot.index.pairs())
+    students = []
+    for i in range(n):
+        stream, subject = rng.choice(pairs)
+        student = {"student_id": i, "stream": stream, "subject": subject, "merit": round(rng.uniform(35, 100), 1)}
+        # Most students share a location, the rest are ranked without one
+        if rng.random() < 0.8:
+            student["latitude"] = 34 + rng.uniform(-0.6, 0.6)
+            student["longitude"] = 74.8 + rng.uniform(-0.6, 0.6)
+        students.append(student)
+    return students
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, default=100_000)
+    parser.add_argument("--colleges", type=int, default=5000)
+    parser.add_argument("--choices", type=int, default=10)
+    parser.add_argument("--updates", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    snapshot = build_snapshot(make_catalogue(args.colleges, args.seed))
+    students = make_cohort(snapshot, args.students, args.seed)
+    capacities, names = college_seats(snapshot)
+
+    start = time.perf_counter()
+    preferences = student_preferences(students, args.choices, snapshot=snapshot)
+    preferences_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    allocation = SeatAllocation.allocate(
+        capacities, ((s["student_id"], p, s["merit"]) for s, p in zip(students, preferences)), names, args.seed
+    )
+    allocate_time = time.perf_counter() - start
+
+    # Students reorder their choices one at a time
+    rng = random.Random(args.seed)
+    timings, changed = [], 0
+    for _ in range(args.updates):
+        i = rng.randrange(args.students)
+        preferences[i] = rng.sample(preferences[i], len(preferences[i]))
+        start = time.perf_counter()
+        changed += len(allocation.update(i, preferences[i]))
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+
+    rerun = SeatAllocation.allocate(
+        capacities, ((s["student_id"], p, s["merit"]) for s, p in zip(students, preferences)), names, args.seed
+    )
+    assert allocation.assignments() == rerun.assignments(), "incremental updates differ from a full rerun"
+    assert not allocation.blocking_pairs(), "allocation is not stable"
+
+    summary = allocation.summary()
+    print(f"students:    {args.students} over {args.colleges} colleges, {summary['placed']} placed")
+    print(f"preferences: {preferences_time:.3f}s ({args.students / preferences_time:,.0f} students/s)")
+    print(f"allocate:    {allocate_time:.3f}s ({args.students / allocate_time:,.0f} students/s)")
+    if timings:
+        print(
+            f"update:      p50 {timings[len(timings) // 2] * 1e3:.3f}ms"
+            f" p99 {timings[int(len(timings) * 0.99)] * 1e3:.3f}ms,"
+            f" {changed / len(timings):.1f} seats changed on average"
+        )
+
+
+if __name__ == "__main__":
+    main()
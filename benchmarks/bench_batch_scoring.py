@@ -0,0 +1,64 @@
+"""
+Compares the scalar scoring path (calculate_quiz_scores + recommend_stream,
+one dict per student) with the vectorized career_core.batch.score_batch.
+
+Run from the project root:
+    python -m benchmarks.bench_batch_scoring --students 200000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from career_core.batch import CATEGORIES, NUM_QUESTIONS, MARKS_COLUMNS, score_batch
+from career_core.data import QUIZ_QUESTIONS
+from career_core.logic import calculate_quiz_scores, recommend_stream
+
+
+def make_cohort(n, seed=0):
+    rng = np.random.default_rng(seed)
+    answers = rng.integers(1, 6, size=(n, NUM_QUESTIONS))
+    marks = rng.integers(0, 101, size=(n, len(MARKS_COLUMNS)))
+    return np.hstack([answers, marks])
+
+
+def scalar_scores(matrix):
+    keys = [f"{cat}_{i}" for cat in CATEGORIES for i in range(len(QUIZ_QUESTIONS[cat]))]
+    scores, streams = [], []
+    for row in matrix.tolist():
+        responses = dict(zip(keys, row[:NUM_QUESTIONS]))
+        calculated = calculate_quiz_scores(responses)
+        user_data = calculated.copy()
+        user_data.update(zip(MARKS_COLUMNS, row[NUM_QUESTIONS:]))
+        scores.append([calculated[cat] for cat in CATEGORIES])
+        streams.append(recommend_stream(user_data))
+    return np.array(scores), np.array(streams, dtype=object)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    matrix = make_cohort(args.students, args.seed)
+
+    start = time.perf_counter()
+    ref_scores, ref_streams = scalar_scores(matrix)
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scores, streams = score_batch(matrix)
+    batch_time = time.perf_counter() - start
+
+    assert np.array_equal(scores, ref_scores), "category scores differ"
+    assert np.array_equal(streams, ref_streams), "stream labels differ"
+
+    print(f"students: {args.students}")
+    print(f"scalar:   {scalar_time:.3f}s ({args.students / scalar_time:,.0f} rows/s)")
+    print(f"batch:    {batch_time:.3f}s ({args.students / batch_time:,.0f} rows/s)")
+    print(f"speedup:  {scalar_time / batch_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
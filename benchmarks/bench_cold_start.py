@@ -0,0 +1,76 @@
+"""
+Cold-start cost of the recommendation core.
+
+Each measurement runs in a fresh interpreter and reports
+- how long importing career_core.logic and backend.main takes
+- warmup() time, split into its steps
+- the latency of the first college requests (plain, geo and filtered),
+  with and without warmup() beforehand
+
+Run from the project root:
+    python -m benchmarks.bench_cold_start --colleges 55 100000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.load_test import ROOT, make_catalogue
+
+# Runs in the child interpreter; prints one JSON object
+CHILD = """
+import json, sys, time
+warm = sys.argv[1] == "warm"
+start = time.perf_counter()
+import career_core.logic as logic
+core_import = time.perf_counter() - start
+start = time.perf_counter()
+import backend.main
+app_import = time.perf_counter() - start
+result = {"import_core_ms": core_import * 1000, "import_app_ms": app_import * 1000}
+if warm:
+    result["warmup"] = logic.warmup()
+calls = {
+    "first_recommend_ms": lambda: logic.recommend_colleges("Science", "Physics", 10),
+    "first_geo_ms": lambda: logic.recommend_colleges("Arts", "History", 10, location=(34.08, 74.8)),
+    "first_query_ms": lambda: logic.query_colleges("Commerce", "Economics", ranges={"rating": (4, None)}),
+}
+for name, call in calls.items():
+    start = time.perf_counter()
+    call()
+    result[name] = (time.perf_counter() - start) * 1000
+print(json.dumps(result))
+"""
+
+
+def measure(source, warm):
+    env = dict(os.environ, COLLEGE_DB_PATH=source)
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD, "warm" if warm else "cold"],
+        cwd=ROOT, env=env, check=True, stdout=subprocess.PIPE,
+    ).stdout
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--colleges", type=int, nargs="+", default=[55])
+    args = parser.parse_args()
+
+    for n in args.colleges:
+        source = make_catalogue(n)
+        # Compile the catalogue once so neither run pays for it
+        measure(source, warm=False)
+        cold = measure(source, warm=False)
+        warm = measure(source, warm=True)
+        print(f"{n} colleges")
+        print(f"  import career_core.logic: {cold['import_core_ms']:.1f} ms, "
+              f"backend.main: {cold['import_app_ms']:.1f} ms")
+        print(f"  warmup(): {warm['warmup']}")
+        for key in ("first_recommend_ms", "first_geo_ms", "first_query_ms"):
+            print(f"  {key[:-3]:<18} without warmup {cold[key]:9.2f} ms   after warmup {warm[key]:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
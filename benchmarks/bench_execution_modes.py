@@ -0,0 +1,156 @@
+"""
+Throughput under mixed load for each execution mode (EXECUTION_MODE).
+
+Starts uvicorn once per mode and, for a fixed duration, runs two kinds of
+clients side by side: "batch" clients uploading whole classes to
+/predict-stream:batch (CPU-heavy), and "light" clients cycling through
+/stage1, /stage2 and /stage3. Reports the light requests' latency and rate,
+the batch throughput in students/s, and how many requests were shed with 503.
+
+Run from the project root:
+    python -m benchmarks.bench_execution_modes --duration 20 --colleges 10000
+    python -m benchmarks.bench_execution_modes --modes thread process --workers 4
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+import httpx
+
+from career_core.catalogue import load_subject_careers
+
+from benchmarks.load_test import ROOT, _free_port, make_catalogue, make_students, percentile
+
+LIGHT_ENDPOINTS = ("/stage1", "/stage2", "/stage3")
+
+
+@contextmanager
+def serve(mode, args, source):
+    port = _free_port()
+    env = dict(os.environ, COLLEGE_DB_PATH=source, EXECUTION_MODE=mode,
+               EXECUTION_QUEUE_LIMIT=str(args.queue_limit))
+    if args.workers:
+        env["EXECUTION_WORKERS"] = str(args.workers)
+    # Every simulated student comes from one address
+    env.setdefault("RATE_LIMIT_PER_SECOND", "0")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        start = time.perf_counter()
+        while True:
+            if server.poll() is not None:
+                raise RuntimeError("uvicorn exited during startup")
+            try:
+                httpx.get(base_url + "/", timeout=1.0)
+                break
+            except httpx.TransportError:
+                if time.perf_counter() - start > 600:
+                    raise RuntimeError("uvicorn did not start in time")
+                time.sleep(0.1)
+        yield base_url
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def make_upload(bodies, size):
+    # Flat batch records: stage 1 answers and marks plus stage 2 interests
+    return "\n".join(
+        json.dumps(dict(stage2, **stage1, student_id=i))
+        for i, (stage1, stage2) in enumerate(zip(bodies["/stage1"][:size], bodies["/stage2"][:size]))
+    )
+
+
+async def mixed_load(base_url, args, bodies, upload):
+    deadline = time.perf_counter() + args.duration
+    latencies, light_errors, shed = [], 0, 0
+    students = 0
+
+    async def light(client, offset):
+        nonlocal light_errors, shed
+        i = offset
+        while time.perf_counter() < deadline:
+            path = LIGHT_ENDPOINTS[i % len(LIGHT_ENDPOINTS)]
+            body = bodies[path][i % len(bodies[path])]
+            i += 1
+            start = time.perf_counter()
+            response = await client.post(path, content=json.dumps(body),
+                                         headers={"content-type": "application/json"})
+            if response.status_code == 503:
+                shed += 1
+            elif response.status_code >= 400:
+                light_errors += 1
+            else:
+                latencies.append(time.perf_counter() - start)
+
+    async def batch(client):
+        nonlocal students, shed
+        while time.perf_counter() < deadline:
+            response = await client.post("/predict-stream:batch", content=upload,
+                                         headers={"content-type": "application/x-ndjson"})
+            if response.status_code == 503:
+                shed += 1
+                await asyncio.sleep(float(response.headers.get("retry-after", 1)))
+            else:
+                students += response.text.count("\n")
+
+    limits = httpx.Limits(max_connections=args.light_clients + args.batch_clients)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120.0) as client:
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(light(client, n * 997) for n in range(args.light_clients)),
+            *(batch(client) for _ in range(args.batch_clients)),
+        )
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "light_p50_ms": round(percentile(latencies, 50) * 1000, 2) if latencies else None,
+        "light_p99_ms": round(percentile(latencies, 99) * 1000, 2) if latencies else None,
+        "light_rps": round(len(latencies) / elapsed, 1),
+        "batch_students_per_s": round(students / elapsed, 1),
+        "shed_503": shed,
+        "light_errors": light_errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--modes", nargs="+", default=["inline", "thread", "process"],
+                        choices=("inline", "thread", "process"))
+    parser.add_argument("--workers", type=int, help="EXECUTION_WORKERS (default: the mode's own)")
+    parser.add_argument("--queue-limit", type=int, default=128)
+    parser.add_argument("--colleges", type=int, default=55)
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds per mode")
+    parser.add_argument("--light-clients", type=int, default=16)
+    parser.add_argument("--batch-clients", type=int, default=2)
+    parser.add_argument("--batch-size", type=int, default=1000, help="students per upload")
+    args = parser.parse_args()
+
+    source = make_catalogue(args.colleges)
+    # Light request bodies are drawn from the same population as the uploads
+    bodies = make_students(max(args.batch_size, 2000), [], load_subject_careers())
+    upload = make_upload(bodies, args.batch_size)
+
+    print(f"{args.colleges} colleges, {args.light_clients} light + {args.batch_clients} batch clients "
+          f"({args.batch_size} students/upload), {args.duration:g}s per mode")
+    print(f"{'mode':<9}{'light p50 ms':>13}{'light p99 ms':>13}{'light req/s':>12}"
+          f"{'batch stud/s':>14}{'shed 503':>10}{'errors':>8}")
+    for mode in args.modes:
+        with serve(mode, args, source) as base_url:
+            stats = asyncio.run(mixed_load(base_url, args, bodies, upload))
+        print(f"{mode:<9}{stats['light_p50_ms']!s:>13}{stats['light_p99_ms']!s:>13}{stats['light_rps']:>12}"
+              f"{stats['batch_students_per_s']:>14}{stats['shed_503']:>10}{stats['light_errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
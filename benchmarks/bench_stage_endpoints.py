@@ -0,0 +1,83 @@
+"""
+Microbenchmark for the legacy /stage1, /stage2 and /stage3 handlers.
+
+Calls each handler directly with a prepared request body and renders its
+response the way FastAPI would, so the numbers cover body decoding, the
+recommendation logic and response encoding, without HTTP/middleware cost.
+
+Run from the project root:
+    python -m benchmarks.bench_stage_endpoints --iterations 20000
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+from starlette.requests import Request
+
+from backend.main import stage1_predict, stage2_predict, stage3_colleges
+
+
+def make_bodies(n, seed=0):
+    rng = random.Random(seed)
+    stage1, stage2, stage3 = [], [], []
+    for _ in range(n):
+        payload = {f"Q{i}": rng.randint(1, 5) for i in range(1, 25)}
+        payload.update(
+            maths_marks_percent=rng.randint(0, 100),
+            social_science_marks_percent=rng.randint(0, 100),
+            commerce_marks_percent=rng.randint(0, 100),
+        )
+        stage1.append(json.dumps(payload).encode())
+        stage2.append(json.dumps({
+            "predicted_stream": "Science",
+            "math_interest": rng.randint(1, 5), "chemistry_interest": rng.randint(1, 5),
+            "biology_interest": rng.randint(1, 5), "cs_interest": rng.randint(1, 5),
+            "physics_interest": rng.randint(1, 5),
+        }).encode())
+        stage3.append(json.dumps({
+            "predicted_stream": "Science",
+            "predicted_subject": rng.choice(["Physics", "Chemistry", "Biology", "Mathematics"]),
+        }).encode())
+    return {"/stage1": (stage1_predict, stage1), "/stage2": (stage2_predict, stage2),
+            "/stage3": (stage3_colleges, stage3)}
+
+
+def make_request(path, body):
+    scope = {
+        "type": "http", "method": "POST", "path": path,
+        "headers": [(b"content-type", b"application/json")],
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return Request(scope, receive)
+
+
+async def run(handler, path, bodies):
+    start = time.perf_counter()
+    for body in bodies:
+        result = await handler(make_request(path, body))
+        if not isinstance(result, Response):
+            # What FastAPI does with a plain return value
+            result = JSONResponse(jsonable_encoder(result))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    for path, (handler, bodies) in make_bodies(args.iterations).items():
+        asyncio.run(run(handler, path, bodies[:1000]))  # warm up caches
+        elapsed = asyncio.run(run(handler, path, bodies))
+        print(f"{path}: {elapsed / args.iterations * 1e6:.1f} us/request")
+
+
+if __name__ == "__main__":
+    main()
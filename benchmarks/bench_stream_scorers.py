@@ -0,0 +1,50 @@
+"""
+Compares the stream scorers in career_core.streams against the reference
+rules (streams.RuleScorer): throughput, agreement of the labels with the
+rules, and the spread of the reported confidence.
+
+Run from the project root:
+    python -m benchmarks.bench_stream_scorers --students 200000
+    python -m benchmarks.bench_stream_scorers --model my_linear_model.json
+"""
+import argparse
+import time
+
+import numpy as np
+
+from career_core.batch import NUM_QUESTIONS, batch_quiz_scores
+from career_core.streams import STREAMS, LinearScorer, RuleScorer, SoftRuleScorer
+
+from benchmarks.bench_batch_scoring import make_cohort
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, default=200_000)
+    parser.add_argument("--model", help="linear model JSON file to include")
+    args = parser.parse_args()
+
+    cohort = make_cohort(args.students)
+    features = np.hstack([batch_quiz_scores(cohort), cohort[:, NUM_QUESTIONS:].astype(np.float64)])
+
+    start = time.perf_counter()
+    reference, _ = RuleScorer().predict(features)
+    elapsed = time.perf_counter() - start
+    print(f"{'reference rules':<16} {elapsed:7.3f}s ({args.students / elapsed:12,.0f} rows/s)")
+
+    scorers = [SoftRuleScorer()]
+    if args.model:
+        scorers.append(LinearScorer.load(args.model))
+    for scorer in scorers:
+        start = time.perf_counter()
+        labels, probabilities = scorer.predict(features)
+        elapsed = time.perf_counter() - start
+        agreement = np.mean(labels == reference)
+        own = probabilities[np.arange(len(labels)), [STREAMS.index(s) for s in labels]]
+        p5, p50, p95 = np.percentile(own, [5, 50, 95])
+        print(f"{scorer.name:<16} {elapsed:7.3f}s ({args.students / elapsed:12,.0f} rows/s)  "
+              f"agreement {agreement:.2%}  confidence p5/p50/p95 {p5:.2f}/{p50:.2f}/{p95:.2f}")
+
+
+if __name__ == "__main__":
+    main()
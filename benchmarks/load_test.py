@@ -0,0 +1,377 @@
+"""
+Load test for the Career Guidance API.
+
+Drives /stage1, /stage2, /stage3, /predict-stream, /recommend-career and
+/recommend-colleges with a synthetic student population, either in-process
+(httpx over ASGI, full middleware stack) or against a local uvicorn server,
+over synthetic catalogues of any size. Reports p50/p95/p99 latency and
+requests/sec per endpoint, and peak RSS of the process serving the app.
+
+Run from the project root:
+    python -m benchmarks.load_test run --colleges 55 10000 1000000 --output current.json
+    python -m benchmarks.load_test run --mode uvicorn --concurrency 32
+    python -m benchmarks.load_test compare baseline.json current.json --threshold 0.10
+
+compare exits with status 1 when any latency percentile or peak RSS grows, or
+requests/sec drops, by more than the threshold.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+from career_core.catalogue import DEFAULT_SOURCE, load_subject_careers
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Generated catalogues are kept here between runs (git-ignored)
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+ENDPOINTS = ("/stage1", "/stage2", "/stage3", "/predict-stream", "/recommend-career", "/recommend-colleges")
+METRICS = ("p50_ms", "p95_ms", "p99_ms", "rps")
+
+
+# --- Synthetic data ---
+
+def make_catalogue(n, seed=0):
+    """
+    Returns the path of a colleges.json with n rows, generated from the real
+    catalogue (same streams, subjects and field types, jittered numbers and
+    locations). The shipped catalogue is used as is for n=55.
+    """
+    with open(DEFAULT_SOURCE, encoding="utf-8") as f:
+        base = json.load(f)
+    if n == len(base):
+        return DEFAULT_SOURCE
+
+    os.makedirs(DATA_DIR, exist_ok=True)
+    # v2: rows carry seats
+    path = os.path.join(DATA_DIR, f"colleges_v2_{n}_{seed}.json")
+    if not os.path.exists(path):
+        rng = random.Random(seed)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        # Streamed out one row at a time; only the compile step holds them all
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("[\n")
+            for i in range(n):
+                college = dict(base[i % len(base)])
+                copy = i // len(base)
+                college["college_id"] = i + 1
+                if copy:
+                    college["college_name"] = f"{college['college_name']} #{copy}"
+                distance = rng.randint(1, 80)
+                college["distance_km"] = distance
+                college["travel_time_min"] = distance * rng.randint(2, 4)
+                college["latitude"] = round(college["latitude"] + rng.uniform(-0.5, 0.5), 4)
+                college["longitude"] = round(college["longitude"] + rng.uniform(-0.5, 0.5), 4)
+                college["tuition_fees"] = rng.randrange(5000, 150000, 500)
+                college["rating"] = round(rng.uniform(3.0, 5.0), 1)
+                college["average_package"] = round(rng.uniform(1.5, 12.0), 1)
+                college["seats"] = rng.randrange(30, 310, 10)
+                f.write(("    " if i == 0 else ",\n    ") + json.dumps(college))
+            f.write("\n]\n")
+        os.replace(tmp_path, path)
+
+    compiled = os.path.splitext(path)[0] + ".bin"
+    if not os.path.exists(compiled) or os.path.getmtime(compiled) < os.path.getmtime(path):
+        # Compile in a child process so its memory doesn't count against ours
+        subprocess.run([sys.executable, "-m", "career_core.catalogue", path, compiled], cwd=ROOT, check=True)
+    return path
+
+
+def make_students(n, quiz_keys, subject_careers, seed=0):
+    """
+    Returns {endpoint: [n request bodies]} for a synthetic population of n
+    students: random answers and marks, and a stream/subject drawn from the
+    subject/career mapping.
+    """
+    rng = random.Random(seed)
+    streams = sorted(subject_careers)
+    cities = [(34.08, 74.80), (32.73, 74.86), (28.61, 77.21), (12.97, 77.59), (19.08, 72.88)]
+    bodies = {path: [] for path in ENDPOINTS}
+    for _ in range(n):
+        marks = {
+            "maths_marks_percent": rng.randint(0, 100),
+            "social_science_marks_percent": rng.randint(0, 100),
+            "commerce_marks_percent": rng.randint(0, 100),
+        }
+        stream = rng.choice(streams)
+        interests = {key: rng.randint(1, 5) for key in subject_careers[stream]}
+        subject = rng.choice([subject for subject, _ in subject_careers[stream].values()])
+        lat, lon = rng.choice(cities)
+        location = {"latitude": lat + rng.uniform(-1, 1), "longitude": lon + rng.uniform(-1, 1)}
+        # Half the students share their location
+        located = rng.random() < 0.5
+
+        stage1 = {f"Q{i}": rng.randint(1, 5) for i in range(1, 25)}
+        stage1.update(marks)
+        bodies["/stage1"].append(stage1)
+        bodies["/stage2"].append(dict(interests, predicted_stream=stream))
+        stage3 = {"predicted_stream": stream, "predicted_subject": subject}
+        bodies["/stage3"].append(dict(stage3, **location) if located else stage3)
+        bodies["/predict-stream"].append(
+            dict(marks, quiz_responses={key: rng.randint(1, 5) for key in quiz_keys})
+        )
+        bodies["/recommend-career"].append({"stream": stream, "interests": interests})
+        colleges = {"stream": stream, "subject": subject, "max_colleges": 10}
+        if located:
+            colleges.update(location)
+        if rng.random() < 0.3:
+            colleges["filters"] = {"hostel": True, "min_rating": 3.5}
+            colleges["weights"] = {"rating": 1.0, "tuition_fees": -0.5}
+        bodies["/recommend-colleges"].append(colleges)
+    return bodies
+
+
+# --- Driving requests ---
+
+def percentile(sorted_values, q):
+    # Nearest-rank percentile
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, round(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+async def drive(client, path, bodies, concurrency):
+    """
+    Sends every body to path with `concurrency` requests in flight and returns
+    the endpoint's stats.
+    """
+    latencies = []
+    errors = 0
+    queue = iter(bodies)
+
+    async def worker():
+        nonlocal errors
+        for body in queue:
+            start = time.perf_counter()
+            response = await client.post(path, content=json.dumps(body),
+                                         headers={"content-type": "application/json"})
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "rps": round(len(latencies) / elapsed, 1),
+    }
+
+
+async def drive_all(client, args):
+    quiz = (await client.get("/quiz-questions")).json()
+    quiz_keys = [f"{cat}_{i}" for cat, questions in quiz.items() for i in range(len(questions))]
+    bodies = make_students(args.requests + args.warmup, quiz_keys, load_subject_careers(), args.seed)
+    results = {}
+    for path in args.endpoints:
+        await drive(client, path, bodies[path][:args.warmup], args.concurrency)
+        results[path] = await drive(client, path, bodies[path][args.warmup:], args.concurrency)
+    return results
+
+
+# --- Targets ---
+
+def run_inprocess(args, source):
+    # The catalogue is loaded on first use, so this must be set before warmup
+    os.environ["COLLEGE_DB_PATH"] = source
+    # The whole synthetic population comes from one address
+    os.environ.setdefault("RATE_LIMIT_PER_SECOND", "0")
+    start = time.perf_counter()
+    from backend.main import app
+    from career_core.logic import warmup
+    # ASGITransport doesn't run the app's lifespan, which would do this
+    warmup()
+    startup = time.perf_counter() - start
+
+    async def go():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            return await drive_all(client, args)
+
+    endpoints = asyncio.run(go())
+    # ru_maxrss is in KiB on Linux
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {"startup_s": round(startup, 3), "peak_rss_mb": round(peak_rss, 1), "endpoints": endpoints}
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _peak_rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+def run_uvicorn(args, source):
+    port = _free_port()
+    env = dict(os.environ, COLLEGE_DB_PATH=source)
+    env.setdefault("RATE_LIMIT_PER_SECOND", "0")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        start = time.perf_counter()
+        while True:
+            if server.poll() is not None:
+                raise RuntimeError("uvicorn exited during startup")
+            try:
+                httpx.get(base_url + "/", timeout=1.0)
+                break
+            except httpx.TransportError:
+                if time.perf_counter() - start > args.startup_timeout:
+                    raise RuntimeError("uvicorn did not start in time")
+                time.sleep(0.1)
+        startup = time.perf_counter() - start
+
+        async def go():
+            limits = httpx.Limits(max_connections=args.concurrency)
+            async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+                return await drive_all(client, args)
+
+        endpoints = asyncio.run(go())
+        return {"startup_s": round(startup, 3), "peak_rss_mb": _peak_rss_mb(server.pid), "endpoints": endpoints}
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def run(args):
+    if args.mode == "inprocess" and len(args.colleges) > 1:
+        # One app per process: run each catalogue size in a child
+        runs = []
+        for n in args.colleges:
+            child = [sys.executable, "-m", "benchmarks.load_test", "run", "--colleges", str(n),
+                     "--mode", args.mode, "--requests", str(args.requests), "--warmup", str(args.warmup),
+                     "--concurrency", str(args.concurrency), "--seed", str(args.seed),
+                     "--endpoints", *args.endpoints, "--output", "-"]
+            output = subprocess.run(child, cwd=ROOT, check=True, stdout=subprocess.PIPE).stdout
+            runs.extend(json.loads(output)["runs"])
+    else:
+        runs = []
+        for n in args.colleges:
+            source = make_catalogue(n, args.seed)
+            target = run_inprocess if args.mode == "inprocess" else run_uvicorn
+            runs.append(dict(colleges=n, **target(args, source)))
+
+    report = {
+        "mode": args.mode,
+        "concurrency": args.concurrency,
+        "requests": args.requests,
+        "python": sys.version.split()[0],
+        "runs": runs,
+    }
+    if args.output == "-":
+        print(json.dumps(report))
+        return
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+def print_report(report):
+    print(f"mode={report['mode']} concurrency={report['concurrency']} requests/endpoint={report['requests']}")
+    for run_ in report["runs"]:
+        print(f"\n{run_['colleges']} colleges (startup {run_['startup_s']}s, peak RSS {run_['peak_rss_mb']} MB)")
+        print(f"  {'endpoint':<22}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>10}{'errors':>8}")
+        for path, stats in run_["endpoints"].items():
+            print(f"  {path:<22}{stats['p50_ms']:>9}{stats['p95_ms']:>9}{stats['p99_ms']:>9}"
+                  f"{stats['rps']:>10}{stats['errors']:>8}")
+
+
+# --- Comparison ---
+
+def compare(args):
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    before = {run_["colleges"]: run_ for run_ in baseline["runs"]}
+    regressions = []
+    for run_ in current["runs"]:
+        old = before.get(run_["colleges"])
+        if old is None:
+            continue
+        checks = [("peak_rss_mb", None, old["peak_rss_mb"], run_["peak_rss_mb"])]
+        for path, stats in run_["endpoints"].items():
+            if path in old["endpoints"]:
+                for metric in METRICS:
+                    checks.append((metric, path, old["endpoints"][path][metric], stats[metric]))
+
+        print(f"\n{run_['colleges']} colleges")
+        for metric, path, was, now in checks:
+            if not was or now is None:
+                continue
+            change = (now - was) / was
+            # Higher is worse for everything except throughput
+            worse = -change if metric == "rps" else change
+            flag = "REGRESSION" if worse > args.threshold else ""
+            if flag:
+                regressions.append((run_["colleges"], path, metric))
+            print(f"  {path or '':<22}{metric:<13}{was:>10}{now:>10}{change:>+9.1%}  {flag}")
+
+    if regressions:
+        print(f"\n{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}")
+        sys.exit(1)
+    print("\nNo regressions")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the load test")
+    run_parser.add_argument("--mode", choices=("inprocess", "uvicorn"), default="inprocess")
+    run_parser.add_argument("--colleges", type=int, nargs="+", default=[55],
+                            help="catalogue sizes to test (55 = the shipped catalogue)")
+    run_parser.add_argument("--requests", type=int, default=2000, help="requests per endpoint")
+    run_parser.add_argument("--warmup", type=int, default=200)
+    run_parser.add_argument("--concurrency", type=int, default=16)
+    run_parser.add_argument("--endpoints", nargs="+", default=list(ENDPOINTS), choices=ENDPOINTS)
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--startup-timeout", type=float, default=600.0)
+    run_parser.add_argument("--output", help="write the results as JSON to this file ('-' for stdout)")
+
+    compare_parser = commands.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.10,
+                                help="allowed relative regression (default 0.10 = 10%%)")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args)
+    else:
+        compare(args)
+
+
+if __name__ == "__main__":
+    main()
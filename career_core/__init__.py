@@ -0,0 +1,9 @@
+"""
+Recommendation core shared by the FastAPI backend and the Streamlit app:
+quiz scoring, stream/subject/career rules, and the college catalogue with
+its indexes.
+
+Importing the package is cheap; the data files are loaded on first use.
+Call career_core.logic.warmup() at startup to load them and build every
+index before traffic arrives.
+"""
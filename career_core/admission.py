@@ -0,0 +1,295 @@
+"""
+Admission control: per-client rate limits and a global concurrency limit,
+so a traffic spike queues (briefly) or is turned away at the door instead of
+dragging every request's latency down with it.
+
+AdmissionMiddleware sits in front of the app and, for each HTTP request:
+1. charges one token from the client's token bucket (rate per second, up to
+   burst saved up); a client that runs dry gets 429 with Retry-After.
+2. takes one of max_concurrent slots. When they are all taken the request
+   waits in a priority queue, cheap routes first and FIFO within a priority.
+   Past queue_limit waiting requests, a newcomer pushes out the most recent
+   waiter of a more expensive priority, or is refused if there is none;
+   refused, pushed-out and timed-out (queue_timeout seconds) requests get 503
+   with Retry-After.
+The slot is held until the response is finished, streaming included.
+
+Priorities are classes of route cost, not exact job sizes: an approximation
+of shortest-job-first that keeps the quiz and interest lists responsive
+while /stage3 and batch uploads wait.
+
+Everything runs on the event loop, so the state needs no locks.
+"""
+import asyncio
+import json
+import math
+import time
+from collections import deque
+
+from . import metrics
+from .caching import LRUCache
+
+# Route cost classes, cheapest (served first) to most expensive
+CHEAP, STANDARD, EXPENSIVE, BULK = range(4)
+PRIORITY_NAMES = ("cheap", "standard", "expensive", "bulk")
+
+OUTCOMES = ("admitted", "rate_limited", "queue_full", "evicted", "timeout")
+
+QUEUE_WAIT = metrics.HistogramFamily(
+    "admission_queue_wait_seconds", "Time admitted requests waited for a slot.", ("priority",)
+)
+
+
+class Shed(Exception):
+    """
+    A request turned away. status is 429 or 503, retry_after a hint in seconds.
+    """
+
+    def __init__(self, status, outcome, retry_after, detail):
+        super().__init__(detail)
+        self.status = status
+        self.outcome = outcome
+        self.retry_after = retry_after
+
+
+class TokenBuckets:
+    """
+    One token bucket per client key, refilled at `rate` tokens per second up
+    to `burst`. Buckets of clients not seen for as long as a refill takes
+    are forgotten (they would be full anyway); at most max_clients are kept.
+    """
+
+    def __init__(self, rate, burst, max_clients=100_000, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._buckets = LRUCache(maxsize=max_clients, ttl=burst / rate)
+
+    def take(self, key):
+        """
+        Takes one token; returns 0, or the seconds until one is available if
+        the bucket is empty.
+        """
+        now = self._clock()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = [self.burst, now]
+        tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+        bucket[1] = now
+        if tokens < 1:
+            bucket[0] = tokens
+            self._buckets.put(key, bucket)
+            return (1 - tokens) / self.rate
+        bucket[0] = tokens - 1
+        self._buckets.put(key, bucket)
+        return 0
+
+    def __len__(self):
+        return self._buckets.stats()["size"]
+
+
+class AdmissionController:
+    """
+    Rate limits and concurrency slots. Call admit(client, priority) before
+    serving a request and release() once it is done. Not thread-safe: use
+    from the event loop only.
+    """
+
+    def __init__(self, max_concurrent=64, queue_limit=256, queue_timeout=5.0,
+                 rate=None, burst=None, max_clients=100_000):
+        self.max_concurrent = max_concurrent
+        self.queue_limit = queue_limit
+        self.queue_timeout = queue_timeout
+        self.buckets = TokenBuckets(rate, burst or rate, max_clients) if rate else None
+        self._in_flight = 0
+        # priority -> futures of the requests waiting for a slot, oldest first
+        self._waiting = [deque() for _ in PRIORITY_NAMES]
+        self._queued = 0
+        # Moving average of how long a slot is held, for the Retry-After hint
+        self._avg_hold = 0.1
+        self.counts = {(priority, outcome): 0 for priority in range(len(PRIORITY_NAMES)) for outcome in OUTCOMES}
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    @property
+    def queue_depth(self):
+        return self._queued
+
+    def _retry_after(self):
+        return max(1, math.ceil((self._queued + 1) * self._avg_hold / self.max_concurrent))
+
+    def _shed(self, priority, outcome, status, retry_after, detail):
+        self.counts[(priority, outcome)] += 1
+        return Shed(status, outcome, retry_after, detail)
+
+    async def admit(self, client, priority):
+        """
+        Returns once the request holds a slot. Raises Shed if it is rate
+        limited, can't be queued, is pushed out of the queue or times out.
+        """
+        if self.buckets is not None and client is not None:
+            wait = self.buckets.take(client)
+            if wait:
+                raise self._shed(priority, "rate_limited", 429, max(1, math.ceil(wait)),
+                                 "Too many requests from this client, retry later")
+
+        if self._in_flight < self.max_concurrent:
+            self._in_flight += 1
+            self.counts[(priority, "admitted")] += 1
+            QUEUE_WAIT.observe((PRIORITY_NAMES[priority],), 0.0)
+            return
+
+        if self._queued >= self.queue_limit and not self._evict(priority):
+            raise self._shed(priority, "queue_full", 503, self._retry_after(), "Server busy, retry later")
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[priority].append(future)
+        self._queued += 1
+        start = time.perf_counter()
+        try:
+            await asyncio.wait((future,), timeout=self.queue_timeout)
+        except BaseException:
+            # Cancelled (client gone) while waiting; give back a slot that
+            # was handed over in the meantime
+            if not self._withdraw(priority, future) and future.done() and future.exception() is None:
+                self.release()
+            raise
+        if not future.done():
+            self._withdraw(priority, future)
+            raise self._shed(priority, "timeout", 503, self._retry_after(), "Server busy, retry later")
+        # Raises Shed if pushed out of the queue
+        future.result()
+        self.counts[(priority, "admitted")] += 1
+        QUEUE_WAIT.observe((PRIORITY_NAMES[priority],), time.perf_counter() - start)
+
+    def _withdraw(self, priority, future):
+        # Takes a waiter out of the queue; False if it already left it
+        try:
+            self._waiting[priority].remove(future)
+        except ValueError:
+            return False
+        self._queued -= 1
+        future.cancel()
+        return True
+
+    def _evict(self, priority):
+        # Makes room for a request of `priority` by pushing out the newest
+        # waiter of the most expensive priority above it
+        for worse in range(len(PRIORITY_NAMES) - 1, priority, -1):
+            if self._waiting[worse]:
+                future = self._waiting[worse].pop()
+                self._queued -= 1
+                future.set_exception(self._shed(
+                    worse, "evicted", 503, self._retry_after(), "Server busy, retry later"
+                ))
+                return True
+        return False
+
+    def release(self, held=None):
+        """
+        Frees a slot, handing it straight to the next waiter if there is one.
+        held is how long the slot was used, in seconds.
+        """
+        if held is not None:
+            self._avg_hold += 0.05 * (held - self._avg_hold)
+        for waiting in self._waiting:
+            while waiting:
+                future = waiting.popleft()
+                self._queued -= 1
+                if not future.done():
+                    future.set_result(None)
+                    return
+        self._in_flight -= 1
+
+    def metrics(self):
+        """
+        Prometheus text lines; pass to metrics.register_collector.
+        """
+        lines = [
+            "# TYPE admission_in_flight gauge",
+            f"admission_in_flight {self._in_flight}",
+            "# TYPE admission_concurrency_limit gauge",
+            f"admission_concurrency_limit {self.max_concurrent}",
+            "# TYPE admission_queue_limit gauge",
+            f"admission_queue_limit {self.queue_limit}",
+            "# TYPE admission_queue_depth gauge",
+        ]
+        for priority, name in enumerate(PRIORITY_NAMES):
+            lines.append(f'admission_queue_depth{{priority="{name}"}} {len(self._waiting[priority])}')
+        if self.buckets is not None:
+            lines.append("# TYPE admission_tracked_clients gauge")
+            lines.append(f"admission_tracked_clients {len(self.buckets)}")
+        lines.append("# TYPE admission_requests_total counter")
+        for (priority, outcome), count in self.counts.items():
+            lines.append(
+                f'admission_requests_total{{priority="{PRIORITY_NAMES[priority]}",outcome="{outcome}"}} {count}'
+            )
+        return lines + QUEUE_WAIT.render()
+
+
+def client_address(scope, trust_forwarded=False):
+    """
+    The client a request is rate limited as: its IP address, or with
+    trust_forwarded the first X-Forwarded-For address (only behind a proxy
+    that sets it).
+    """
+    if trust_forwarded:
+        for name, value in scope["headers"]:
+            if name == b"x-forwarded-for":
+                return value.decode("latin-1").split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else None
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware applying an AdmissionController to HTTP requests.
+    routes is a list of (path, priority): a path ending in "*" matches every
+    path starting with the rest, any other only itself; the first match
+    wins, and unmatched paths are STANDARD. Paths in `exempt` (e.g. /metrics) skip
+    admission entirely.
+    """
+
+    def __init__(self, app, controller, routes=(), exempt=(), trust_forwarded=False):
+        self.app = app
+        self.controller = controller
+        self.routes = list(routes)
+        self.exempt = frozenset(exempt)
+        self.trust_forwarded = trust_forwarded
+
+    def priority(self, path):
+        for route, priority in self.routes:
+            if path == route or (route.endswith("*") and path.startswith(route[:-1])):
+                return priority
+        return STANDARD
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exempt:
+            return await self.app(scope, receive, send)
+
+        controller = self.controller
+        try:
+            await controller.admit(
+                client_address(scope, self.trust_forwarded), self.priority(scope["path"])
+            )
+        except Shed as e:
+            body = json.dumps({"detail": str(e)}).encode()
+            await send({
+                "type": "http.response.start",
+                "status": e.status,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(e.retry_after).encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.release(time.perf_counter() - start)
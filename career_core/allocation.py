@@ -0,0 +1,373 @@
+"""
+Capacity-aware seat allocation for a whole cohort.
+
+recommend_colleges ranks colleges for one student at a time, so every
+student with the same stream and subject is pointed at the same nearest
+colleges whatever their size. Here a cohort's ranked preferences (built the
+same way, or given by the students) are matched against each college's
+seats with student-proposing deferred acceptance:
+- students propose to colleges in order of preference
+- a college holds the best proposals up to its seats (by merit, then a
+  seeded lottery that breaks ties the same way for every college) and
+  rejects the rest, who propose to their next choice
+The result is stable: no student prefers a college that has a free seat or
+holds someone with lower priority. It is also the best stable assignment
+for every student, and nobody gains by misreporting preferences.
+
+Deferred acceptance gives the same result whatever order students propose
+in, so a batch proposes best priority first: no proposal is ever displaced
+and each student stops at the first college with room. Everything a college
+held or rejected stays on per-college heaps, which makes changes
+incremental:
+- a student leaving frees a seat; it goes to the best student the college
+  rejected who still wants it, whose old seat goes the same way (a vacancy
+  chain)
+- a student joining, or coming back with new choices, proposes as usual,
+  and anyone displaced moves down their own list
+Each step touches only the students whose seats change, and the outcome is
+exactly what a full rerun would give.
+"""
+import heapq
+import math
+import zlib
+
+from . import snapshot as _snapshots
+from .logic import match_subjects, recommend_colleges
+
+# Choices built per student when they don't give their own
+DEFAULT_CHOICES = 10
+
+
+class SeatAllocation:
+    """
+    A deferred-acceptance assignment of students to college seats, kept up to
+    date as students join, change their choices or withdraw.
+    capacities maps college_id -> seats (None for no limit).
+    """
+
+    def __init__(self, capacities, names=None, seed=0):
+        self.seed = seed
+        self._college_ids = list(capacities)
+        self._colleges = {college_id: c for c, college_id in enumerate(self._college_ids)}
+        self._capacity = [math.inf if seats is None else seats for seats in capacities.values()]
+        self._load = [0] * len(self._college_ids)
+        # Per college: held proposals, worst first, as (-merit key, stamp),
+        # and rejected ones, best first, as (merit key, version, position)
+        self._held = [[] for _ in self._college_ids]
+        self._rejected = [[] for _ in self._college_ids]
+        self._names = names or {}
+
+        self._student_ids = []
+        self._students = {}
+        # Per student: preferences (college indexes), the position of the
+        # college holding them (len(preferences) when unassigned), that
+        # college (-1 when none), priority key (lower is better), and
+        # counters that make stale heap entries recognizable: stamp changes
+        # whenever the student moves, version when their choices change
+        self._preferences = []
+        self._position = []
+        self._assigned = []
+        self._key = []
+        self._stamp = []
+        self._version = []
+        # student -> college before the current change, for every student
+        # it touched
+        self._changed = {}
+
+    @classmethod
+    def allocate(cls, capacities, students, names=None, seed=0):
+        """
+        Allocates a whole cohort of (student_id, preferences, merit) at once.
+        preferences are college_ids, best first.
+        """
+        allocation = cls(capacities, names, seed)
+        for student_id, preferences, merit in students:
+            allocation._register(student_id, preferences, merit)
+        # Best priority first: nobody is ever displaced
+        for s in sorted(range(len(allocation._student_ids)), key=allocation._key.__getitem__):
+            allocation._propose(s)
+        allocation._changed = {}
+        return allocation
+
+    def __len__(self):
+        return len(self._student_ids)
+
+    def __contains__(self, student_id):
+        return student_id in self._students
+
+    def _priority(self, student_id, merit, s):
+        # Higher merit first, then the seeded lottery; the student index
+        # keeps keys unique
+        lottery = zlib.crc32(f"{self.seed}:{student_id}".encode())
+        return (-float(merit or 0.0), lottery, s)
+
+    def _register(self, student_id, preferences, merit):
+        if student_id in self._students:
+            raise ValueError(f"Duplicate student_id {student_id!r}")
+        s = len(self._student_ids)
+        self._student_ids.append(student_id)
+        self._students[student_id] = s
+        self._preferences.append(self._indexes(preferences))
+        self._position.append(0)
+        self._assigned.append(-1)
+        self._key.append(self._priority(student_id, merit, s))
+        self._stamp.append(0)
+        self._version.append(0)
+        return s
+
+    def _indexes(self, preferences):
+        # College indexes of the known colleges, first mention only
+        return [c for c in dict.fromkeys(map(self._colleges.get, preferences)) if c is not None]
+
+    # --- Core ---
+
+    def _hold(self, s, c, i):
+        self._changed.setdefault(s, self._assigned[s])
+        self._position[s] = i
+        self._assigned[s] = c
+        self._stamp[s] += 1
+        k0, k1, k2 = self._key[s]
+        heapq.heappush(self._held[c], (-k0, -k1, -k2, self._stamp[s]))
+
+    def _propose(self, s):
+        # s proposes down its list from its current position; students it
+        # displaces carry on down theirs
+        preferences, position, assigned, key = self._preferences, self._position, self._assigned, self._key
+        capacity, load, held, rejected = self._capacity, self._load, self._held, self._rejected
+        stamp, version, changed = self._stamp, self._version, self._changed
+        pending = [s]
+        while pending:
+            s = pending.pop()
+            choices = preferences[s]
+            k = key[s]
+            i = position[s]
+            while i < len(choices):
+                c = choices[i]
+                if load[c] < capacity[c]:
+                    load[c] += 1
+                    self._hold(s, c, i)
+                    break
+                heap = held[c]
+                while heap and stamp[-heap[0][2]] != heap[0][3]:
+                    heapq.heappop(heap)
+                if heap and k < (-heap[0][0], -heap[0][1], -heap[0][2]):
+                    w = -heapq.heappop(heap)[2]
+                    heapq.heappush(rejected[c], (*key[w], version[w], position[w]))
+                    changed.setdefault(w, c)
+                    assigned[w] = -1
+                    stamp[w] += 1
+                    position[w] += 1
+                    pending.append(w)
+                    self._hold(s, c, i)
+                    break
+                heapq.heappush(rejected[c], (*k, version[s], i))
+                i += 1
+            else:
+                position[s] = len(choices)
+
+    def _vacate(self, c):
+        # Fills a seat freed at college c with the best student it rejected
+        # who still prefers it to where they are, and so on down the chain
+        position, assigned, version, load = self._position, self._assigned, self._version, self._load
+        while c >= 0:
+            heap = self._rejected[c]
+            while heap:
+                _, _, t, t_version, i = heap[0]
+                if t_version == version[t] and position[t] > i:
+                    break
+                heapq.heappop(heap)
+            else:
+                return
+            heapq.heappop(heap)
+            d = assigned[t]
+            self._hold(t, c, i)
+            load[c] += 1
+            if d >= 0:
+                load[d] -= 1
+            c = d
+
+    def _withdraw(self, s):
+        c = self._assigned[s]
+        self._changed.setdefault(s, c)
+        self._version[s] += 1
+        self._stamp[s] += 1
+        self._assigned[s] = -1
+        self._position[s] = len(self._preferences[s])
+        if c >= 0:
+            self._load[c] -= 1
+            self._vacate(c)
+
+    def _result(self, s):
+        c = self._assigned[s]
+        if c < 0:
+            return None
+        return self._college_ids[c]
+
+    def _changes(self):
+        # {student_id: college_id or None} for the students whose seat the
+        # last change moved, and starts a new change
+        changed, self._changed = self._changed, {}
+        return {
+            self._student_ids[s]: self._result(s)
+            for s, before in changed.items() if before != self._assigned[s]
+        }
+
+    # --- Public ---
+
+    def update(self, student_id, preferences, merit=None):
+        """
+        Adds a student, or replaces a student's choices (and merit, if
+        given), and re-stabilizes the assignment. Empty preferences withdraw
+        the student and pass their seat on. Returns {student_id: college_id
+        or None} for every student whose seat changed.
+        """
+        s = self._students.get(student_id)
+        if s is None:
+            s = self._register(student_id, preferences, merit)
+            self._changed[s] = -1
+        else:
+            self._withdraw(s)
+            self._preferences[s] = self._indexes(preferences)
+            if merit is not None:
+                self._key[s] = self._priority(student_id, merit, s)
+            self._position[s] = 0
+        self._propose(s)
+        return self._changes()
+
+    def assignment(self, student_id):
+        """
+        Returns {"student_id", "college_id", "college_name", "choice"} for a
+        student; choice is the 1-based position of the college in their
+        preferences, and college_id and choice are None if no seat was found.
+        """
+        s = self._students[student_id]
+        college_id = self._result(s)
+        return {
+            "student_id": student_id,
+            "college_id": college_id,
+            "college_name": self._names.get(college_id) if college_id is not None else None,
+            "choice": self._position[s] + 1 if college_id is not None else None,
+        }
+
+    def assignments(self):
+        return [self.assignment(student_id) for student_id in self._student_ids]
+
+    def summary(self):
+        """
+        Students placed, how far down their lists, and how full colleges are.
+        """
+        choices = {}
+        placed = 0
+        for s, c in enumerate(self._assigned):
+            if c >= 0:
+                placed += 1
+                choices[self._position[s] + 1] = choices.get(self._position[s] + 1, 0) + 1
+        limited = [c for c, capacity in enumerate(self._capacity) if capacity != math.inf]
+        return {
+            "students": len(self._student_ids),
+            "placed": placed,
+            "unplaced": len(self._student_ids) - placed,
+            # JSON object keys: "1" is first choice
+            "choice_counts": {str(choice): count for choice, count in sorted(choices.items())},
+            "colleges": len(self._college_ids),
+            "seats": sum(self._capacity[c] for c in limited),
+            "seats_filled": sum(self._load[c] for c in limited),
+            "full_colleges": sum(1 for c in limited if self._load[c] >= self._capacity[c]),
+        }
+
+    def blocking_pairs(self, limit=10):
+        """
+        Returns up to `limit` (student_id, college_id) pairs where the student
+        prefers the college to their seat and the college has room or holds
+        someone with lower priority. Always empty for a correct allocation;
+        for checking.
+        """
+        worst = [None] * len(self._college_ids)
+        for s, c in enumerate(self._assigned):
+            if c >= 0 and (worst[c] is None or self._key[s] > worst[c]):
+                worst[c] = self._key[s]
+        pairs = []
+        for s, choices in enumerate(self._preferences):
+            for c in choices[:self._position[s]]:
+                if self._load[c] < self._capacity[c] or (worst[c] is not None and self._key[s] < worst[c]):
+                    pairs.append((self._student_ids[s], self._college_ids[c]))
+                    if len(pairs) >= limit:
+                        return pairs
+        return pairs
+
+
+# --- Building allocations from the catalogue ---
+
+def college_seats(snapshot=None):
+    """
+    Returns ({college_id: seats or None}, {college_id: college_name}) for
+    every college in the snapshot. Colleges without a seats figure have no
+    limit.
+    """
+    snapshot = snapshot or _snapshots.current()
+    index, colleges = snapshot.index, snapshot.colleges
+    fields = getattr(colleges, "fields", ())
+    seats_column = colleges.column("seats") if "seats" in fields else None
+    capacities, names = {}, {}
+    for ref in index.refs():
+        college_id = index.college_id(ref)
+        if type(ref) is int:
+            capacities[college_id] = seats_column[ref] if seats_column is not None else None
+            names[college_id] = colleges.value("college_name", ref)
+        else:
+            capacities[college_id] = ref.get("seats")
+            names[college_id] = ref.get("college_name")
+    return capacities, names
+
+
+def student_preferences(students, max_choices=DEFAULT_CHOICES, rank_by="distance", snapshot=None):
+    """
+    Ranked college_ids for each student dict, the way recommend_colleges
+    would rank them: by distance_km, or from the student's latitude and
+    longitude when given (rank_by="travel_time" by estimated travel time).
+    Students with their own "preferences" list keep it. Students are
+    grouped by stream and subject, and each group's locations are ranked in
+    one vectorized pass.
+    """
+    snapshot = snapshot or _snapshots.current()
+    preferences = [None] * len(students)
+    located = {}
+    for i, student in enumerate(students):
+        if student.get("preferences") is not None:
+            preferences[i] = list(student["preferences"])
+            continue
+        stream = student["stream"]
+        subjects = match_subjects(stream, student["subject"], snapshot)
+        latitude, longitude = student.get("latitude"), student.get("longitude")
+        if latitude is None or longitude is None:
+            # Memoized per stream and subject
+            colleges = recommend_colleges(stream, subjects, max_colleges=max_choices, snapshot=snapshot)
+            preferences[i] = [college["college_id"] for college in colleges]
+        else:
+            located.setdefault((stream, subjects), []).append(i)
+
+    for (stream, subjects), members in located.items():
+        ranked = snapshot.geo.nearest_batch(
+            stream, subjects,
+            [students[i]["latitude"] for i in members], [students[i]["longitude"] for i in members],
+            max_choices, rank_by,
+        )
+        for i, row in zip(members, ranked.tolist()):
+            preferences[i] = [college_id for college_id in row if college_id >= 0]
+    return preferences
+
+
+def allocate_seats(students, max_choices=DEFAULT_CHOICES, rank_by="distance", seed=0, snapshot=None):
+    """
+    Allocates seats to a cohort of student dicts (student_id, stream,
+    subject, optional latitude/longitude, merit and preferences) and returns
+    the SeatAllocation; see student_preferences() for how choices are built.
+    """
+    snapshot = snapshot or _snapshots.current()
+    capacities, names = college_seats(snapshot)
+    preferences = student_preferences(students, max_choices, rank_by, snapshot)
+    return SeatAllocation.allocate(
+        capacities,
+        ((student["student_id"], choices, student.get("merit")) for student, choices in zip(students, preferences)),
+        names, seed,
+    )
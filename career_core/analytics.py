@@ -0,0 +1,325 @@
+"""
+Live cohort analytics: how the predictions served are spread across streams,
+subjects/careers and colleges, by school and by day.
+
+Every prediction updates a few aggregates in place (counter increments and
+one histogram bucket per score), so nothing is recomputed from logs.
+Aggregates are kept per (day, school) cell and rolled up per day, per school
+and overall as they are updated, so a dashboard query reads one aggregate no
+matter how many predictions went into it. Score distributions are
+fixed-width histograms; quantiles are interpolated within a bucket, so they
+are exact to within the bucket width (0.1 for category scores on the 0-5
+scale, 1 point for confidence percentages).
+
+The state is only counts, so it is saved as a compact JSON snapshot
+(periodically and on shutdown, see autosave()) and restored with load().
+Rollups are rebuilt from the cells on load.
+"""
+import heapq
+import json
+import os
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from .logic import QUIZ_CATEGORIES
+
+# Rollup key for "every day" / "every school"
+ALL = "*"
+# Schools that send no school id are counted under this one
+UNKNOWN_SCHOOL = "unknown"
+
+SNAPSHOT_FORMAT = 1
+
+# (low, high, bucket width) of the histograms
+SCORE_RANGE = (0.0, 5.0, 0.1)
+CONFIDENCE_RANGE = (0.0, 100.0, 1.0)
+
+QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+
+class LinearHistogram:
+    """
+    Fixed-width buckets over [low, high); values outside are clamped into the
+    first or last bucket.
+    """
+
+    __slots__ = ("low", "width", "counts", "total")
+
+    def __init__(self, low, high, width, counts=None, total=0.0):
+        self.low = low
+        self.width = width
+        self.counts = list(counts) if counts is not None else [0] * round((high - low) / width)
+        self.total = total
+
+    def observe(self, value):
+        i = int((value - self.low) / self.width)
+        self.counts[min(max(i, 0), len(self.counts) - 1)] += 1
+        self.total += value
+
+    def merge(self, other, sign=1):
+        for i, count in enumerate(other.counts):
+            self.counts[i] += sign * count
+        self.total += sign * other.total
+
+    def quantiles(self, qs=QUANTILES):
+        """
+        Returns {q: value} for each q in qs, interpolating linearly within the
+        bucket the q-th observation falls in. Empty histograms give {}.
+        """
+        n = sum(self.counts)
+        if not n:
+            return {}
+        results = {}
+        targets = iter(sorted(qs))
+        q = next(targets)
+        seen = 0
+        for i, count in enumerate(self.counts):
+            while q is not None and count and seen + count >= q * n:
+                fraction = (q * n - seen) / count
+                results[q] = round(self.low + (i + fraction) * self.width, 3)
+                q = next(targets, None)
+            seen += count
+        return results
+
+    def summary(self):
+        n = sum(self.counts)
+        return {
+            "count": n,
+            "mean": round(self.total / n, 3) if n else None,
+            "quantiles": {f"p{round(q * 100)}": v for q, v in self.quantiles().items()},
+            "histogram": {"low": self.low, "width": self.width, "counts": list(self.counts)},
+        }
+
+
+class Aggregate:
+    """
+    Everything counted for one cell or rollup.
+    """
+
+    __slots__ = ("students", "streams", "careers", "recommendations", "colleges", "scores", "confidence")
+
+    def __init__(self):
+        # Stream predictions served, and their outcomes
+        self.students = 0
+        self.streams = Counter()
+        # (stream, subject, career) -> times it was the predicted career
+        self.careers = Counter()
+        # College lists served, and how often each college was on one
+        self.recommendations = 0
+        self.colleges = Counter()
+        self.scores = {category: LinearHistogram(*SCORE_RANGE) for category in QUIZ_CATEGORIES}
+        self.confidence = LinearHistogram(*CONFIDENCE_RANGE)
+
+    def update(self, stream, scores, confidence, career, colleges):
+        if scores is not None:
+            self.students += 1
+            self.streams[stream] += 1
+            for category, value in scores.items():
+                histogram = self.scores.get(category)
+                if histogram is not None:
+                    histogram.observe(value)
+            if confidence is not None:
+                self.confidence.observe(confidence)
+        if career is not None:
+            self.careers[career] += 1
+        if colleges is not None:
+            self.recommendations += 1
+            self.colleges.update(colleges)
+
+    def merge(self, other, sign=1):
+        # sign=-1 takes a cell back out of a rollup
+        self.students += sign * other.students
+        self.recommendations += sign * other.recommendations
+        for mine, theirs in ((self.streams, other.streams), (self.careers, other.careers),
+                             (self.colleges, other.colleges)):
+            if sign > 0:
+                mine.update(theirs)
+            else:
+                mine.subtract(theirs)
+                for key in [key for key, count in mine.items() if count <= 0]:
+                    del mine[key]
+        for category, histogram in other.scores.items():
+            self.scores[category].merge(histogram, sign)
+        self.confidence.merge(other.confidence, sign)
+
+    def summary(self, top, college_names):
+        careers = heapq.nlargest(top, self.careers.items(), key=lambda item: (item[1], item[0]))
+        colleges = heapq.nlargest(top, self.colleges.items(), key=lambda item: (item[1], -item[0]))
+        return {
+            "students": self.students,
+            "streams": dict(self.streams.most_common()),
+            "careers": [
+                {"stream": stream, "subject": subject, "career": career, "count": count}
+                for (stream, subject, career), count in careers
+            ],
+            "college_recommendations": self.recommendations,
+            "colleges": [
+                {"college_id": college_id, "college_name": college_names.get(college_id), "count": count}
+                for college_id, count in colleges
+            ],
+            "scores": {category: histogram.summary() for category, histogram in self.scores.items()},
+            "confidence_percent": self.confidence.summary(),
+        }
+
+    def to_dict(self):
+        return {
+            "students": self.students,
+            "streams": dict(self.streams),
+            "careers": [[*key, count] for key, count in self.careers.items()],
+            "recommendations": self.recommendations,
+            "colleges": [[college_id, count] for college_id, count in self.colleges.items()],
+            "scores": {category: [h.counts, h.total] for category, h in self.scores.items()},
+            "confidence": [self.confidence.counts, self.confidence.total],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        aggregate = cls()
+        aggregate.students = data["students"]
+        aggregate.streams = Counter(data["streams"])
+        aggregate.careers = Counter({tuple(item[:3]): item[3] for item in data["careers"]})
+        aggregate.recommendations = data["recommendations"]
+        aggregate.colleges = Counter({college_id: count for college_id, count in data["colleges"]})
+        for category, (counts, total) in data["scores"].items():
+            if category in aggregate.scores:
+                aggregate.scores[category] = LinearHistogram(*SCORE_RANGE, counts, total)
+        aggregate.confidence = LinearHistogram(*CONFIDENCE_RANGE, *data["confidence"])
+        return aggregate
+
+
+def _today(clock):
+    return datetime.fromtimestamp(clock(), timezone.utc).date().isoformat()
+
+
+class CohortAnalytics:
+    """
+    Thread-safe in-process aggregates of the predictions served. Days are UTC
+    dates; cells older than retention_days are dropped (and taken back out of
+    the rollups) when a new day starts.
+    """
+
+    def __init__(self, retention_days=90, clock=time.time):
+        self.retention_days = retention_days
+        self._clock = clock
+        # (day, school) -> Aggregate, including the rollups (day, ALL),
+        # (ALL, school) and (ALL, ALL)
+        self._aggregates = {}
+        self._college_names = {}
+        self._day = None
+        self._changed = False
+        self._lock = threading.Lock()
+
+    def record(self, school=None, stream=None, scores=None, confidence=None,
+               subject=None, career=None, colleges=None):
+        """
+        Counts what one response served to a student in `stream`: a stream
+        prediction (given its category scores, and optionally the confidence
+        percent), a subject/career, and/or a list of college dicts.
+        """
+        school = school or UNKNOWN_SCHOOL
+        picked = (stream, subject, career) if career is not None else None
+        college_ids = None
+        if colleges is not None:
+            college_ids = [int(college["college_id"]) for college in colleges]
+        day = _today(self._clock)
+        with self._lock:
+            if day != self._day:
+                self._day = day
+                self._expire()
+            for key in ((day, school), (day, ALL), (ALL, school), (ALL, ALL)):
+                aggregate = self._aggregates.get(key)
+                if aggregate is None:
+                    aggregate = self._aggregates[key] = Aggregate()
+                aggregate.update(stream, scores, confidence, picked, college_ids)
+            for college_id, college in zip(college_ids or (), colleges or ()):
+                self._college_names.setdefault(college_id, college.get("college_name"))
+            self._changed = True
+
+    def _expire(self):
+        # Drop the cells of days past retention, and take them back out of
+        # the school and overall rollups. Call with the lock held.
+        cutoff = (datetime.fromisoformat(self._day) - timedelta(days=self.retention_days)).date().isoformat()
+        for day, school in [key for key in self._aggregates if key[0] != ALL and key[0] < cutoff]:
+            aggregate = self._aggregates.pop((day, school))
+            if school != ALL:
+                self._aggregates[(ALL, school)].merge(aggregate, -1)
+                self._aggregates[(ALL, ALL)].merge(aggregate, -1)
+
+    def summary(self, day=None, school=None, top=10):
+        """
+        Returns the aggregates for one day and/or school (None for all of
+        them): stream counts, the top careers and colleges, and the
+        distribution of every category score and of the stream confidence.
+        """
+        key = (day or ALL, school or ALL)
+        with self._lock:
+            aggregate = self._aggregates.get(key) or Aggregate()
+            result = aggregate.summary(top, self._college_names)
+        return {"day": day, "school": school, **result}
+
+    def to_dict(self):
+        with self._lock:
+            cells = [
+                [day, school, aggregate.to_dict()]
+                for (day, school), aggregate in self._aggregates.items()
+                if day != ALL and school != ALL
+            ]
+            names = [[college_id, name] for college_id, name in self._college_names.items()]
+            self._changed = False
+        return {"format": SNAPSHOT_FORMAT, "cells": cells, "college_names": names}
+
+    def save(self, path):
+        """
+        Writes a snapshot of the aggregates, replacing the file atomically.
+        """
+        data = json.dumps(self.to_dict(), separators=(",", ":"))
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def load(self, path):
+        """
+        Restores the aggregates from a snapshot written by save(), replacing
+        the current ones. A missing file leaves them empty; returns whether
+        one was loaded.
+        """
+        if not os.path.exists(path):
+            return False
+        with open(path) as f:
+            data = json.load(f)
+        if data.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"Unsupported analytics snapshot format in {path}")
+
+        aggregates = {}
+        for day, school, cell in data["cells"]:
+            aggregate = Aggregate.from_dict(cell)
+            aggregates[(day, school)] = aggregate
+            for key in ((day, ALL), (ALL, school), (ALL, ALL)):
+                rollup = aggregates.get(key)
+                if rollup is None:
+                    rollup = aggregates[key] = Aggregate()
+                rollup.merge(aggregate)
+        with self._lock:
+            self._aggregates = aggregates
+            self._college_names = {college_id: name for college_id, name in data["college_names"]}
+            self._day = None
+            self._changed = False
+        return True
+
+    def autosave(self, path, interval=60.0):
+        """
+        Saves a snapshot every `interval` seconds in the background, whenever
+        something was recorded since the last one. Returns the thread.
+        """
+        def run():
+            while True:
+                time.sleep(interval)
+                if self._changed:
+                    self.save(path)
+
+        thread = threading.Thread(target=run, name="analytics-snapshots", daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,61 @@
+import numpy as np
+
+from .logic import QUIZ_CATEGORIES as CATEGORIES, QUESTION_COUNTS, QUESTION_KEY_SLOTS
+from .streams import MARKS_COLUMNS, get_scorer
+
+# Matrix layout: Q1..Q24 (in QUIZ_QUESTIONS category order), then the marks
+NUM_QUESTIONS = sum(QUESTION_COUNTS)
+QUESTION_COLUMNS = tuple(QUESTION_KEY_SLOTS)
+COLUMNS = QUESTION_COLUMNS + MARKS_COLUMNS
+
+
+def _as_matrix(data):
+    """
+    Accepts a 2-D array with the columns in COLUMNS order, or a DataFrame
+    that has those columns by name.
+    """
+    if hasattr(data, "columns"):
+        data = data[list(COLUMNS)].to_numpy()
+    matrix = np.asarray(data)
+    if matrix.ndim != 2 or matrix.shape[1] != len(COLUMNS):
+        raise ValueError(f"Expected a (n, {len(COLUMNS)}) matrix of {', '.join(COLUMNS)}")
+    return matrix
+
+
+def batch_quiz_scores(data):
+    """
+    Vectorized calculate_quiz_scores for many students at once.
+    Returns an (n, 8) float array with one column per category in CATEGORIES.
+    """
+    matrix = _as_matrix(data)
+    scores = np.empty((matrix.shape[0], len(CATEGORIES)), dtype=np.float64)
+
+    start = 0
+    for slot, count in enumerate(QUESTION_COUNTS):
+        # Add columns left to right so the result matches the scalar sum
+        # bit for bit, then divide once like calculate_quiz_scores does.
+        total = matrix[:, start]
+        for col in range(start + 1, start + count):
+            total = total + matrix[:, col]
+        scores[:, slot] = total / count
+        start += count
+    return scores
+
+
+def score_batch(data, scorer=None, return_probabilities=False):
+    """
+    Scores a whole cohort in one pass.
+    data: (n, 27) matrix or DataFrame with columns Q1..Q24 followed by the
+    three marks columns (see COLUMNS).
+    scorer: stream scorer (see streams.py); the active one by default.
+    Returns (scores, streams): an (n, 8) array of category averages in
+    CATEGORIES order and an (n,) array of stream labels, plus an (n, 4)
+    array of probabilities in streams.STREAMS order if return_probabilities.
+    """
+    matrix = _as_matrix(data)
+    scores = batch_quiz_scores(matrix)
+    marks = matrix[:, NUM_QUESTIONS:].astype(np.float64)
+    streams, probabilities = (scorer or get_scorer()).predict(np.hstack([scores, marks]))
+    if return_probabilities:
+        return scores, streams, probabilities
+    return scores, streams
@@ -0,0 +1,116 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+class StaticResponseCache:
+    """
+    Caches JSON responses for data that only changes when the catalogue is
+    reloaded. Each entry is serialized to bytes once, together with a strong
+    ETag derived from those bytes.
+    Entries are tagged with the data version they were built from and are
+    rebuilt automatically once version_fn() reports a newer version.
+    """
+
+    def __init__(self, version_fn):
+        self._version_fn = version_fn
+        # key -> (version, body, etag)
+        self._entries = {}
+
+    def get(self, key, build):
+        """
+        Returns (body, etag) for key, calling build() to produce the payload
+        only when there is no entry for the current data version.
+        """
+        version = self._version_fn()
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != version:
+            body = json.dumps(build(), separators=(",", ":")).encode()
+            etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+            entry = (version, body, etag)
+            self._entries[key] = entry
+        return entry[1], entry[2]
+
+    def clear(self):
+        self._entries.clear()
+
+
+def etag_matches(if_none_match, etag):
+    """
+    Checks an If-None-Match header value against a strong ETag.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+
+
+class LRUCache:
+    """
+    Bounded, thread-safe LRU cache with an optional TTL (in seconds).
+    If version_fn is given, the whole cache is flushed as soon as it reports
+    a different version, so cached results never outlive the data they were
+    computed from.
+    Keeps hit, miss and eviction counters for monitoring.
+    """
+
+    def __init__(self, maxsize=4096, ttl=None, version_fn=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._version_fn = version_fn
+        # Read on first use; the cache starts empty, so nothing to flush yet
+        self._version = None
+        # key -> (expires_at, value), oldest first
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _check_version(self):
+        if self._version_fn is not None:
+            version = self._version_fn()
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+
+    def get(self, key, default=None):
+        with self._lock:
+            self._check_version()
+            entry = self._entries.get(key)
+            if entry is not None and (entry[0] is None or entry[0] > time.monotonic()):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                # Expired
+                del self._entries[key]
+                self.evictions += 1
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._check_version()
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,106 @@
+"""
+Ranked subject/career suggestions.
+
+Every (stream, interest) -> (subject, career) entry of the mapping is a
+candidate. A CareerModel precomputes a candidate x interest weight matrix
+(each candidate weighs its own interest; richer mappings only need different
+weights), so scoring a student against every stream is one matrix-vector
+product, and a whole cohort is one matrix product.
+
+A candidate's score is its share of the stream's total interest, so the
+scores within a stream sum to 1. Ties keep the mapping order, which makes
+the top candidate the same one a plain max() over the interests picks.
+"""
+import numpy as np
+
+
+class CareerModel:
+    """
+    Candidate scorer built once per subject/career mapping.
+    """
+
+    def __init__(self, subject_careers):
+        self.streams = tuple(subject_careers)
+        # Candidates in mapping order: (stream, interest, subject, career)
+        self.candidates = tuple(
+            (stream, interest, subject, career)
+            for stream, interests in subject_careers.items()
+            for interest, (subject, career) in interests.items()
+        )
+        self.interests = tuple(dict.fromkeys(c[1] for c in self.candidates))
+        columns = {interest: i for i, interest in enumerate(self.interests)}
+
+        self._weights = np.zeros((len(self.candidates), len(self.interests)))
+        for row, (_, interest, _, _) in enumerate(self.candidates):
+            self._weights[row, columns[interest]] = 1.0
+
+        # Candidate rows of each stream, and the candidate -> stream one-hot
+        # matrix used to total interest per stream
+        self._rows = {stream: [] for stream in self.streams}
+        for row, candidate in enumerate(self.candidates):
+            self._rows[candidate[0]].append(row)
+        self._rows = {stream: np.array(rows) for stream, rows in self._rows.items()}
+        self._groups = np.zeros((len(self.candidates), len(self.streams)))
+        self._stream_of = np.empty(len(self.candidates), dtype=np.int64)
+        for slot, stream in enumerate(self.streams):
+            self._groups[self._rows[stream], slot] = 1.0
+            self._stream_of[self._rows[stream]] = slot
+
+    def vector(self, interest_scores):
+        """
+        Interest scores dict -> vector over self.interests (missing keys are 0).
+        """
+        return np.array([float(interest_scores.get(k, 0)) for k in self.interests])
+
+    def score_batch(self, matrix):
+        """
+        Scores an (n students x len(interests)) matrix against every candidate
+        of every stream. Returns an (n x len(candidates)) matrix of shares.
+        Negative interest scores count as 0, so shares stay in 0..1.
+        """
+        raw = np.maximum(np.asarray(matrix, dtype=np.float64), 0.0) @ self._weights.T
+        totals = (raw @ self._groups)[:, self._stream_of]
+        sizes = self._groups.sum(axis=0)[self._stream_of]
+        # No interest at all in a stream: every candidate gets an equal share
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(totals > 0, raw / totals, 1.0 / sizes)
+
+    def score(self, interest_scores):
+        return self.score_batch(self.vector(interest_scores)[None, :])[0]
+
+    def rank(self, scores, stream, top_n=None):
+        """
+        Returns [(candidate index, score)] for one stream, best first, from a
+        row of score_batch().
+        """
+        rows = self._rows.get(stream)
+        if rows is None or not len(rows):
+            return []
+        # Stable sort, so ties keep mapping order
+        order = rows[np.argsort(-scores[rows], kind="stable")]
+        if top_n is not None:
+            order = order[:top_n]
+        return [(int(i), float(scores[i])) for i in order]
+
+    def best_batch(self, matrix, streams):
+        """
+        Returns the best candidate index (or None) for each student, given
+        each student's stream, from one pass over the whole matrix.
+        """
+        scores = self.score_batch(matrix)
+        best = [None] * len(streams)
+        for stream, rows in self._rows.items():
+            students = [i for i, s in enumerate(streams) if s == stream]
+            if students and len(rows):
+                # argmax returns the first maximum, i.e. mapping order
+                picks = rows[np.argmax(scores[np.ix_(students, rows)], axis=1)]
+                for student, pick in zip(students, picks.tolist()):
+                    best[student] = pick
+        return best
+
+    def suggestion(self, index, score):
+        stream, interest, subject, career = self.candidates[index]
+        return {
+            "stream": stream, "interest": interest, "subject": subject,
+            "career": career, "score": round(score, 4),
+        }
@@ -0,0 +1,309 @@
+"""
+Columnar, memory-mapped storage for the college catalogue.
+
+The catalogue is maintained as JSON (colleges.json, one college per line) and
+compiled into a compact binary file:
+- numeric and boolean fields are stored as packed arrays, one per column
+- string fields are stored as ids into a shared, deduplicated string table
+- list fields (subjects, facilities, ...) are stored as bitsets over a
+  per-column vocabulary, for membership tests, plus each row's vocabulary
+  indexes in source order, so rows read back exactly as written
+The binary file is opened with mmap, so every worker process that loads it
+shares the same pages through the OS page cache.
+
+Run `python -m career_core.catalogue colleges.json colleges.bin` to compile by
+hand; load_catalogue() also recompiles automatically when the JSON is newer.
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+MAGIC = b"CGCAT002"
+_HEADER = struct.Struct("<8sI")
+_ALIGN = 8
+
+DEFAULT_SOURCE = os.path.join(os.path.dirname(__file__), "colleges.json")
+DEFAULT_SUBJECT_CAREERS = os.path.join(os.path.dirname(__file__), "subject_careers.json")
+
+
+def _column_kind(name, values):
+    if all(isinstance(v, bool) for v in values):
+        return "bool"
+    if all(isinstance(v, int) and not isinstance(v, bool) for v in values):
+        return "int"
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+        return "float"
+    if all(isinstance(v, str) for v in values):
+        return "str"
+    if all(isinstance(v, list) and all(isinstance(x, str) for x in v) for v in values):
+        return "set"
+    raise ValueError(f"Unsupported or mixed values in column {name!r}")
+
+
+def compile_catalogue(colleges, out_path):
+    """
+    Compiles a list of college dicts into the binary columnar format.
+    The file is written next to out_path and renamed into place, so readers
+    never see a partial file.
+    """
+    colleges = list(colleges)
+    names = list(colleges[0]) if colleges else []
+    for college in colleges:
+        if list(college) != names:
+            raise ValueError(f"College {college.get('college_id')} does not match the catalogue columns")
+
+    strings = {}
+    sections = []
+    columns = []
+    # (column, key, data) sections laid out after the columns' own
+    extra = []
+
+    def string_id(value):
+        return strings.setdefault(value, len(strings))
+
+    for name in names:
+        values = [college[name] for college in colleges]
+        kind = _column_kind(name, values)
+        column = {"name": name, "kind": kind}
+        if kind == "bool":
+            data = array("B", values)
+        elif kind == "int":
+            data = array("q", values)
+        elif kind == "float":
+            data = array("d", values)
+        elif kind == "str":
+            data = array("I", [string_id(v) for v in values])
+        else:
+            vocab = list(dict.fromkeys(x for v in values for x in v))
+            words = max(1, (len(vocab) + 63) // 64)
+            positions = {term: i for i, term in enumerate(vocab)}
+            data = array("Q", bytes(8 * words * len(values)))
+            for row, v in enumerate(values):
+                for term in v:
+                    bit = positions[term]
+                    data[row * words + bit // 64] |= 1 << (bit % 64)
+            column["vocab"] = vocab
+            column["words"] = words
+            # Row r's terms are order[order_offsets[r]:order_offsets[r + 1]]
+            order_offsets = array("Q", [0])
+            for v in values:
+                order_offsets.append(order_offsets[-1] + len(v))
+            order = array("I", [positions[term] for v in values for term in v])
+            extra.append((column, "order_offsets", order_offsets))
+            extra.append((column, "order", order))
+        columns.append(column)
+        sections.append(data.tobytes())
+    sections.extend(data.tobytes() for _, _, data in extra)
+
+    blob = b"".join(s.encode() for s in strings)
+    offsets = array("Q", [0])
+    for s in strings:
+        offsets.append(offsets[-1] + len(s.encode()))
+    sections.append(offsets.tobytes())
+    sections.append(blob)
+
+    # Lay the sections out after the header, each aligned to 8 bytes
+    def layout(header_size):
+        pos = _HEADER.size + header_size
+        placed = []
+        for section in sections:
+            pos += -pos % _ALIGN
+            placed.append((pos, len(section)))
+            pos += len(section)
+        return placed
+
+    header = {}
+    placed = layout(0)
+    while True:
+        for column, (offset, size) in zip(columns, placed):
+            column["offset"], column["nbytes"] = offset, size
+        for (column, key, _), section in zip(extra, placed[len(columns):]):
+            column[key] = section
+        header = {
+            "rows": len(colleges),
+            "columns": columns,
+            "strings": {
+                "count": len(strings),
+                "offsets": placed[-2],
+                "blob": placed[-1],
+            },
+        }
+        encoded = json.dumps(header).encode()
+        new_placed = layout(len(encoded))
+        if new_placed == placed:
+            break
+        placed = new_placed
+
+    tmp_path = f"{out_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(encoded)))
+        f.write(encoded)
+        for (offset, _), section in zip(placed, sections):
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(section)
+    os.replace(tmp_path, out_path)
+
+
+class Catalogue:
+    """
+    Read-only view over a compiled catalogue file.
+    Behaves like a sequence of college dicts (len, indexing, iteration), but
+    rows are only materialized into dicts when they are accessed. Columns can
+    also be read directly with column(), string() and has_term().
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, header_size = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a compiled college catalogue")
+        header = json.loads(self._mm[_HEADER.size:_HEADER.size + header_size])
+
+        self._rows = header["rows"]
+        self._columns = {c["name"]: c for c in header["columns"]}
+        self.fields = tuple(self._columns)
+
+        view = memoryview(self._mm)
+        formats = {"bool": "B", "int": "q", "float": "d", "str": "I", "set": "Q"}
+        self._data = {}
+        for name, column in self._columns.items():
+            section = view[column["offset"]:column["offset"] + column["nbytes"]]
+            self._data[name] = section.cast(formats[column["kind"]])
+            if column["kind"] == "set":
+                column["positions"] = {t: i for i, t in enumerate(column["vocab"])}
+                for key, fmt in (("order_offsets", "Q"), ("order", "I")):
+                    offset, size = column[key]
+                    self._data[name, key] = view[offset:offset + size].cast(fmt)
+
+        table = header["strings"]
+        offset, size = table["offsets"]
+        self._string_offsets = view[offset:offset + size].cast("Q")
+        offset, size = table["blob"]
+        self._string_blob = view[offset:offset + size]
+        # Decoded strings, filled lazily and interned
+        self._strings = [None] * table["count"]
+
+    def __len__(self):
+        return self._rows
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[i] for i in range(*row.indices(self._rows))]
+        if row < 0:
+            row += self._rows
+        if not 0 <= row < self._rows:
+            raise IndexError("catalogue row out of range")
+        return {name: self.value(name, row) for name in self.fields}
+
+    def __iter__(self):
+        for row in range(self._rows):
+            yield self[row]
+
+    def string(self, string_id):
+        value = self._strings[string_id]
+        if value is None:
+            start = self._string_offsets[string_id]
+            end = self._string_offsets[string_id + 1]
+            value = sys.intern(bytes(self._string_blob[start:end]).decode())
+            self._strings[string_id] = value
+        return value
+
+    def column(self, name):
+        """
+        Returns the raw column as a memoryview: numbers for numeric columns,
+        string ids for string columns, bitset words for list columns.
+        """
+        return self._data[name]
+
+    def kind(self, name):
+        """
+        Returns the storage kind of a column: bool, int, float, str or set.
+        """
+        return self._columns[name]["kind"]
+
+    def vocab(self, name):
+        return self._columns[name]["vocab"]
+
+    def terms(self, name, row):
+        """
+        Returns the list stored in a list column for one row, in source order.
+        """
+        vocab = self._columns[name]["vocab"]
+        offsets = self._data[name, "order_offsets"]
+        order = self._data[name, "order"]
+        return [vocab[i] for i in order[offsets[row]:offsets[row + 1]]]
+
+    def has_term(self, name, row, term):
+        column = self._columns[name]
+        bit = column["positions"].get(term)
+        if bit is None:
+            return False
+        word = self._data[name][row * column["words"] + bit // 64]
+        return bool(word >> (bit % 64) & 1)
+
+    def value(self, name, row):
+        kind = self._columns[name]["kind"]
+        if kind == "str":
+            return self.string(self._data[name][row])
+        if kind == "set":
+            return self.terms(name, row)
+        if kind == "bool":
+            return bool(self._data[name][row])
+        return self._data[name][row]
+
+
+def _current_format(path):
+    # False for a file compiled by an older version of this module
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def load_catalogue(source=None, compiled=None):
+    """
+    Loads the catalogue from source JSON (default: colleges.json next to this
+    module, or $COLLEGE_DB_PATH), compiling it to a binary file first when
+    the compiled copy is missing or older than the source.
+    """
+    source = source or os.environ.get("COLLEGE_DB_PATH") or DEFAULT_SOURCE
+    if compiled is None:
+        compiled = os.path.splitext(source)[0] + ".bin"
+        # e.g. an installed package in a read-only site-packages
+        if not os.access(os.path.dirname(compiled) or ".", os.W_OK):
+            compiled = os.path.join(tempfile.gettempdir(), "career_core-" + os.path.basename(compiled))
+
+    if (
+        not os.path.exists(compiled)
+        or os.path.getmtime(compiled) < os.path.getmtime(source)
+        or not _current_format(compiled)
+    ):
+        with open(source, encoding="utf-8") as f:
+            compile_catalogue(json.load(f), compiled)
+    return Catalogue(compiled)
+
+
+def load_subject_careers(path=None):
+    """
+    Loads the stream -> interest -> (subject, career) mapping from JSON
+    (default: subject_careers.json next to this module, or $SUBJECT_CAREERS_PATH).
+    """
+    path = path or os.environ.get("SUBJECT_CAREERS_PATH") or DEFAULT_SUBJECT_CAREERS
+    with open(path, encoding="utf-8") as f:
+        mapping = json.load(f)
+    return {
+        stream: {interest: tuple(pair) for interest, pair in interests.items()}
+        for stream, interests in mapping.items()
+    }
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("usage: python -m career_core.catalogue <colleges.json> <colleges.bin>")
+    with open(sys.argv[1], encoding="utf-8") as f:
+        compile_catalogue(json.load(f), sys.argv[2])
@@ -0,0 +1,306 @@
+"""
+Nearest-college search from a student's location.
+
+Coordinates are projected onto the unit sphere, where straight-line (chord)
+distance orders points exactly like great-circle distance. That lets a plain
+3-d KD-tree answer k-nearest queries in O(log n) on average, fully offline.
+Travel time is distance times a per-college rate (minutes per km), so the
+same tree ranks by it exactly, using the rate range kept for each subtree.
+"""
+import heapq
+import math
+import threading
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Offline travel-time estimate: road distance is longer than the straight
+# line, and the default speed is used for colleges without their own
+# distance_km / travel_time_min figures.
+ROAD_FACTOR = 1.3
+DEFAULT_SPEED_KMPH = 30.0
+
+
+def to_xyz(latitude, longitude):
+    lat = math.radians(latitude)
+    lon = math.radians(longitude)
+    return (math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat))
+
+
+def chord_to_km(chord):
+    # Chord length on the unit sphere -> great-circle distance in km
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+
+def _dots_to_km(dots):
+    # Dot products of unit vectors -> great-circle distances in km
+    chords = np.sqrt(np.clip(2.0 - 2.0 * dots, 0.0, 4.0))
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(1.0, chords / 2))
+
+
+class KDTree:
+    """
+    Static 3-d KD-tree over unit-sphere points, stored implicitly: the points
+    list is reordered so that the node for any range [lo, hi) sits at its
+    midpoint, split on axis depth % 3. Every node also keeps the bounding box
+    of its subtree (and the range of the items' rates), so whole subtrees can
+    be skipped by a lower or upper bound on their distance.
+    """
+
+    def __init__(self, points, items, ids=None, rates=None):
+        ids = list(range(len(points))) if ids is None else ids
+        rates = [1.0] * len(points) if rates is None else rates
+        order = list(range(len(points)))
+        self._build(points, order)
+        self._points = [points[i] for i in order]
+        self._items = [items[i] for i in order]
+        self._ids = [ids[i] for i in order]
+        self._rates = [rates[i] for i in order]
+        self._boxes = self._bound()
+
+    def __len__(self):
+        return len(self._points)
+
+    def _build(self, points, order):
+        # Iterative median partition (sorting each range is fine at build time)
+        stack = [(0, len(order), 0)]
+        while stack:
+            lo, hi, depth = stack.pop()
+            if hi - lo <= 1:
+                continue
+            axis = depth % 3
+            order[lo:hi] = sorted(order[lo:hi], key=lambda i: points[i][axis])
+            mid = (lo + hi) // 2
+            stack.append((lo, mid, depth + 1))
+            stack.append((mid + 1, hi, depth + 1))
+
+    def _bound(self):
+        # node (range midpoint) -> [min x, min y, min z, min rate,
+        #                           max x, max y, max z, max rate]
+        # of its subtree, one tree level at a time: the ranges of a level are
+        # disjoint and ascending, so reduceat gets every range's min/max at once
+        n = len(self._points)
+        if not n:
+            return []
+        values = np.zeros((n + 1, 4))
+        values[:n, :3] = self._points
+        values[:n, 3] = self._rates
+        lows = np.empty((n, 4))
+        highs = np.empty((n, 4))
+        los, his = np.array([0]), np.array([n])
+        while len(los):
+            edges = np.column_stack((los, his)).ravel()
+            mids = (los + his) // 2
+            lows[mids] = np.minimum.reduceat(values, edges)[::2]
+            highs[mids] = np.maximum.reduceat(values, edges)[::2]
+            los = np.column_stack((los, mids + 1)).ravel()
+            his = np.column_stack((mids, his)).ravel()
+            keep = los < his
+            los, his = los[keep], his[keep]
+        return np.hstack((lows, highs)).tolist()
+
+    def nearest(self, point, k, accept=None, after=None, weighted=False):
+        """
+        Returns up to k (key, km, item) triples in (key, id) order, where km
+        is the great-circle distance from point and key is km, or km times
+        the item's rate when weighted. accept(item) can exclude items without
+        widening k; after=(key, id) skips everything up to and including that
+        position, so pages can be fetched one after another.
+
+        Best-first search: nodes come off a heap by the lowest key their
+        subtree could have, items by their own key, so items are produced in
+        order and the search stops after the k-th. Subtrees that lie entirely
+        before `after` are never entered.
+        """
+        if k <= 0 or not self._points:
+            return []
+        px, py, pz = point
+        points, items, ids, rates, boxes = self._points, self._items, self._ids, self._rates, self._boxes
+
+        def bounds(lo, hi):
+            # Lowest and highest key within the subtree [lo, hi)
+            x0, y0, z0, r0, x1, y1, z1, r1 = boxes[(lo + hi) // 2]
+            dx = max(x0 - px, 0.0, px - x1)
+            dy = max(y0 - py, 0.0, py - y1)
+            dz = max(z0 - pz, 0.0, pz - z1)
+            low = chord_to_km(math.sqrt(dx * dx + dy * dy + dz * dz))
+            dx = max(abs(px - x0), abs(px - x1))
+            dy = max(abs(py - y0), abs(py - y1))
+            dz = max(abs(pz - z0), abs(pz - z1))
+            high = chord_to_km(math.sqrt(dx * dx + dy * dy + dz * dz))
+            return (low * r0, high * r1) if weighted else (low, high)
+
+        def push(lo, hi):
+            if lo < hi:
+                low, high = bounds(lo, hi)
+                if after is None or high >= after[0]:
+                    # Nodes sort before items at the same key: they may hold
+                    # an item with that key and a lower id
+                    heapq.heappush(heap, (low, 0, lo, hi))
+
+        heap = []
+        results = []
+        push(0, len(points))
+        while heap and len(results) < k:
+            entry = heapq.heappop(heap)
+            if entry[1]:
+                # Item: (key, 1, id, position, km)
+                results.append((entry[0], entry[4], items[entry[3]]))
+                continue
+            _, _, lo, hi = entry
+            mid = (lo + hi) // 2
+            x, y, z = points[mid]
+            dx, dy, dz = x - px, y - py, z - pz
+            km = chord_to_km(math.sqrt(dx * dx + dy * dy + dz * dz))
+            key = km * rates[mid] if weighted else km
+            if (after is None or (key, ids[mid]) > after) and (accept is None or accept(items[mid])):
+                heapq.heappush(heap, (key, 1, ids[mid], mid, km))
+            push(lo, mid)
+            push(mid + 1, hi)
+        return results
+
+
+class GeoIndex:
+    """
+    Per-(stream, subject) KD-trees over a CollegeIndex, built lazily the first
+    time a pair is queried and kept for the lifetime of the snapshot.
+    """
+
+    def __init__(self, college_index, coordinates, travel_rate):
+        # coordinates(ref) -> (latitude, longitude) or None
+        # travel_rate(ref) -> estimated minutes per straight-line km
+        self._college_index = college_index
+        self._coordinates = coordinates
+        self._travel_rate = travel_rate
+        self._trees = {}
+        self._batch_columns = {}
+        self._lock = threading.Lock()
+
+    def _tree(self, stream, subject):
+        pair = (stream, subject)
+        tree = self._trees.get(pair)
+        if tree is None:
+            with self._lock:
+                tree = self._trees.get(pair)
+                if tree is None:
+                    points, refs, ids, rates = [], [], [], []
+                    for ref in self._college_index.postings(stream, subject):
+                        coords = self._coordinates(ref)
+                        if coords is not None:
+                            points.append(to_xyz(*coords))
+                            refs.append(ref)
+                            ids.append(self._college_index.college_id(ref))
+                            rates.append(self._travel_rate(ref))
+                    tree = KDTree(points, refs, ids, rates)
+                    self._trees[pair] = tree
+        return tree
+
+    def build_all(self):
+        """
+        Builds the trees for every (stream, subject) pair up front.
+        """
+        for stream, subject in self._college_index.pairs():
+            self._tree(stream, subject)
+
+    def page(self, stream, subjects, latitude, longitude, k, rank_by="distance", accept=None, after=None):
+        """
+        Returns up to k (key, college) pairs for the colleges offering any of
+        the subjects, nearest (or quickest to reach, with
+        rank_by="travel_time") first. key is (km or minutes, college_id);
+        after=key continues from that position. The college dicts carry
+        distance_km and travel_time_min recomputed for the location.
+        accept(ref) can restrict the candidates.
+        """
+        point = to_xyz(latitude, longitude)
+        weighted = rank_by == "travel_time"
+        after = None if after is None else tuple(after)
+        # Each tree yields its own first k; the merged first k are among them
+        found = {}
+        for subject in subjects:
+            tree = self._tree(stream, subject)
+            for value, km, ref in tree.nearest(point, k, accept, after, weighted):
+                key = (value, self._college_index.college_id(ref))
+                found.setdefault(key, (km, ref))
+
+        results = []
+        for key in sorted(found)[:k]:
+            km, ref = found[key]
+            college = dict(self._college_index.materialize(ref))
+            college["travel_time_min"] = round(km * self._travel_rate(ref))
+            college["distance_km"] = round(km, 1)
+            results.append((key, college))
+        return results
+
+    def _columns(self, stream, subjects):
+        # (college_ids, unit vectors, rates) of the colleges offering any of
+        # the subjects, as arrays; a college in several trees appears once
+        key = (stream, subjects)
+        columns = self._batch_columns.get(key)
+        if columns is None:
+            seen = {}
+            for subject in subjects:
+                tree = self._tree(stream, subject)
+                for college_id, point, rate in zip(tree._ids, tree._points, tree._rates):
+                    seen.setdefault(college_id, (point, rate))
+            columns = (
+                np.fromiter(seen, dtype=np.int64, count=len(seen)),
+                np.array([point for point, _ in seen.values()], dtype=np.float64).reshape(-1, 3),
+                np.array([rate for _, rate in seen.values()], dtype=np.float64),
+            )
+            self._batch_columns[key] = columns
+        return columns
+
+    def nearest_batch(self, stream, subjects, latitudes, longitudes, k, rank_by="distance"):
+        """
+        page() for many locations at once, vectorized: returns an (m, k)
+        array of the college_ids nearest to (or quickest to reach from) each
+        of the m locations, in page() order, padded with -1 when fewer than k
+        colleges offer the subjects. For cohort-sized work, where a tree
+        search per student would dominate.
+        """
+        ids, points, rates = self._columns(stream, tuple(subjects))
+        latitudes = np.radians(np.asarray(latitudes, dtype=np.float64))
+        longitudes = np.radians(np.asarray(longitudes, dtype=np.float64))
+        m, n = len(latitudes), len(ids)
+        result = np.full((m, k), -1, dtype=np.int64)
+        if not n or not m or k <= 0:
+            return result
+        origins = np.column_stack((
+            np.cos(latitudes) * np.cos(longitudes), np.cos(latitudes) * np.sin(longitudes), np.sin(latitudes)
+        ))
+        take = min(k, n)
+        # A few MB of distances at a time
+        step = max(1, (1 << 19) // n)
+        for start in range(0, m, step):
+            dots = origins[start:start + step] @ points.T
+            if rank_by == "travel_time":
+                values = _dots_to_km(dots) * rates
+            else:
+                # Nearer is a larger dot product; km only for the chosen few
+                values = -dots
+            if take < n:
+                nearest = np.argpartition(values, take - 1, axis=1)[:, :take]
+            else:
+                nearest = np.broadcast_to(np.arange(n), values.shape)
+            rows = np.arange(len(values))[:, None]
+            if rank_by == "travel_time":
+                keys = values[rows, nearest]
+            else:
+                keys = _dots_to_km(dots[rows, nearest])
+            order = np.lexsort((ids[nearest], keys), axis=1)
+            result[start:start + len(values), :take] = ids[nearest[rows, order]]
+        return result
+
+
+def travel_rate(distance_km, travel_time_min):
+    """
+    Estimated minutes per straight-line km: road distance is longer than the
+    straight line, at the speed implied by a college's stored distance_km /
+    travel_time_min when it has them.
+    """
+    if distance_km and travel_time_min:
+        minutes_per_km = travel_time_min / distance_km
+    else:
+        minutes_per_km = 60.0 / DEFAULT_SPEED_KMPH
+    return ROAD_FACTOR * minutes_per_km
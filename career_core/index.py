@@ -0,0 +1,211 @@
+import heapq
+from bisect import bisect_left, bisect_right
+
+
+class CollegeIndex:
+    """
+    Inverted index over the college catalogue keyed on (stream, subject).
+    Each posting list is kept sorted by (distance_km, college_id), so the
+    nearest colleges for a stream/subject pair are just a slice of the list
+    instead of a full scan, and any later page starts at a binary search.
+
+    Postings hold either a college dict or, for colleges that live in a
+    Catalogue, just the row number; rows are turned into dicts by resolve()
+    only when they are returned.
+    """
+
+    def __init__(self, colleges=(), resolve=None):
+        # (stream, subject) -> sorted list of (distance_km, college_id) keys
+        self._keys = {}
+        # (stream, subject) -> college refs, in the same order as self._keys
+        self._postings = {}
+        # college_id -> (ref, stream, subjects, distance_km), used for
+        # removal; just the row number for colleges loaded from a Catalogue
+        self._entries = {}
+        self._resolve = resolve
+        self._catalogue = None
+
+        self._bulk_load(
+            (c["college_id"], c["stream"], c["subjects"], c["distance_km"], c)
+            for c in colleges
+        )
+
+    @classmethod
+    def from_catalogue(cls, catalogue):
+        """
+        Builds the index straight from a Catalogue's columns, without
+        materializing any college dicts. Postings hold row numbers.
+        """
+        index = cls(resolve=catalogue.__getitem__)
+        ids = catalogue.column("college_id")
+        streams = catalogue.column("stream")
+        distances = catalogue.column("distance_km")
+
+        pending = {}
+        for row in range(len(catalogue)):
+            stream = catalogue.string(streams[row])
+            for subject in catalogue.terms("subjects", row):
+                pending.setdefault((stream, subject), []).append(row)
+            if ids[row] in index._entries:
+                raise ValueError(f"Duplicate college_id {ids[row]}")
+            # Catalogue rows are described lazily by _entry()
+            index._entries[ids[row]] = row
+
+        for pair, rows in pending.items():
+            keys = sorted(zip((distances[row] for row in rows), (ids[row] for row in rows), rows))
+            index._keys[pair] = [(distance, college_id) for distance, college_id, _ in keys]
+            index._postings[pair] = [row for _, _, row in keys]
+
+        index._catalogue = catalogue
+        return index
+
+    def __len__(self):
+        return len(self._entries)
+
+    def copy(self):
+        """
+        Returns an independent index that shares posting lists with this one
+        until either side changes them.
+        """
+        index = CollegeIndex(resolve=self._resolve)
+        index._keys = dict(self._keys)
+        index._postings = dict(self._postings)
+        index._entries = dict(self._entries)
+        index._catalogue = self._catalogue
+        return index
+
+    def _bulk_load(self, entries):
+        # Append everything, then sort each posting list once
+        pending = {}
+        for college_id, stream, subjects, distance, ref in entries:
+            if college_id in self._entries:
+                raise ValueError(f"Duplicate college_id {college_id}")
+            self._entries[college_id] = (ref, stream, subjects, distance)
+            for subject in set(subjects):
+                pending.setdefault((stream, subject), []).append(((distance, college_id), ref))
+
+        for pair, items in pending.items():
+            items.sort(key=lambda item: item[0])
+            self._keys[pair] = [key for key, _ in items]
+            self._postings[pair] = [ref for _, ref in items]
+
+    def _entry(self, college_id):
+        # (ref, stream, subjects, distance_km) for an indexed college
+        entry = self._entries.get(college_id)
+        if type(entry) is int:
+            row = entry
+            catalogue = self._catalogue
+            entry = (
+                row,
+                catalogue.value("stream", row),
+                catalogue.terms("subjects", row),
+                catalogue.column("distance_km")[row],
+            )
+        return entry
+
+    def materialize(self, ref):
+        """
+        Turns a posting ref (catalogue row or college dict) into a college dict.
+        """
+        return self._resolve(ref) if type(ref) is int else ref
+
+    def college_id(self, ref):
+        """
+        Returns the college_id of a posting ref without materializing it.
+        """
+        return self._catalogue.column("college_id")[ref] if type(ref) is int else ref["college_id"]
+
+    def refs(self):
+        """
+        Returns the refs of every indexed college: catalogue rows first, in
+        row order, then added college dicts.
+        """
+        rows = sorted(e for e in self._entries.values() if type(e) is int)
+        return rows + [e[0] for e in self._entries.values() if type(e) is not int]
+
+    def pairs(self):
+        """
+        Returns every (stream, subject) pair with at least one college.
+        """
+        return list(self._postings)
+
+    def postings(self, stream, subject):
+        """
+        Returns the raw refs for a stream/subject pair, nearest first.
+        Treat the list as read-only.
+        """
+        return self._postings.get((stream, subject), [])
+
+    def add(self, college):
+        """
+        Adds a college dict to every (stream, subject) posting list it belongs
+        to. A college that is already indexed under the same id is replaced.
+        """
+        if college["college_id"] in self._entries:
+            self.remove(college["college_id"])
+
+        stream, subjects, distance = college["stream"], college["subjects"], college["distance_km"]
+        self._entries[college["college_id"]] = (college, stream, subjects, distance)
+
+        # Posting lists are replaced rather than modified in place, so copies
+        # made with copy() are never affected
+        sort_key = (distance, college["college_id"])
+        for subject in set(subjects):
+            pair = (stream, subject)
+            keys = self._keys.get(pair, [])
+            postings = self._postings.get(pair, [])
+            pos = bisect_left(keys, sort_key)
+            self._keys[pair] = keys[:pos] + [sort_key] + keys[pos:]
+            self._postings[pair] = postings[:pos] + [college] + postings[pos:]
+
+    def remove(self, college_id):
+        """
+        Removes a college from the index. Returns the removed college, or None
+        if it was not indexed.
+        """
+        entry = self._entry(college_id)
+        if entry is None:
+            return None
+        del self._entries[college_id]
+
+        ref, stream, subjects, distance = entry
+        sort_key = (distance, college_id)
+        for subject in set(subjects):
+            pair = (stream, subject)
+            keys = self._keys[pair]
+            pos = bisect_left(keys, sort_key)
+            if len(keys) == 1:
+                del self._keys[pair]
+                del self._postings[pair]
+            else:
+                self._keys[pair] = keys[:pos] + keys[pos + 1:]
+                self._postings[pair] = self._postings[pair][:pos] + self._postings[pair][pos + 1:]
+        return self.materialize(ref)
+
+    def page(self, stream, subjects, k, after=None):
+        """
+        Returns up to k (key, college) pairs for the colleges offering any of
+        the subjects in the stream, in (distance_km, college_id) key order,
+        each college once. after=(distance_km, college_id) starts the page
+        right behind that key, found by binary search, so a page costs the
+        same however deep it is.
+        """
+        def tail(subject):
+            keys = self._keys.get((stream, subject), [])
+            postings = self._postings.get((stream, subject), [])
+            start = 0 if after is None else bisect_right(keys, tuple(after))
+            return ((keys[i], postings[i]) for i in range(start, len(keys)))
+
+        lists = [tail(subject) for subject in subjects]
+        # Keys are unique per college, so a college listed under two of the
+        # subjects comes out of the merge twice in a row
+        results = []
+        last = None
+        for key, ref in heapq.merge(*lists, key=lambda item: item[0]):
+            if key == last:
+                continue
+            last = key
+            results.append((key, self.materialize(ref)))
+            if len(results) == k:
+                break
+        return results
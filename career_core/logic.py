@@ -0,0 +1,363 @@
+import time
+
+from .data import QUIZ_QUESTIONS
+from .caching import LRUCache
+from . import snapshot as _snapshots
+from .metrics import phase
+from .pagination import decode_cursor, encode_cursor
+
+# Category slots follow QUIZ_QUESTIONS order
+QUIZ_CATEGORIES = tuple(QUIZ_QUESTIONS)
+QUESTION_COUNTS = tuple(len(QUIZ_QUESTIONS[cat]) for cat in QUIZ_CATEGORIES)
+
+# Accepted response keys mapped to their (category slot, question index),
+# built once so scoring never has to parse key strings.
+# "scientific_interest_score_0" style keys, as sent to /predict-stream
+RESPONSE_KEY_SLOTS = {}
+# "Q1".."Q24" style keys, as sent to /stage1 (Q1-3 analytical, Q4-6 numerical, ...)
+QUESTION_KEY_SLOTS = {}
+for _slot, _cat in enumerate(QUIZ_CATEGORIES):
+    for _i in range(QUESTION_COUNTS[_slot]):
+        RESPONSE_KEY_SLOTS[f"{_cat}_{_i}"] = (_slot, _i)
+        QUESTION_KEY_SLOTS[f"Q{len(QUESTION_KEY_SLOTS) + 1}"] = (_slot, _i)
+
+# The catalogue and its indexes are built on first use (or by warmup()) and
+# then replaced as a whole by reloads (see snapshot.py). add_college /
+# remove_college publish incrementally updated snapshots.
+
+def get_scorer():
+    """
+    Returns the active stream scorer (see streams.py).
+    """
+    # Imported here so loading the package doesn't pull in numpy
+    from .streams import get_scorer
+    return get_scorer()
+
+def warmup():
+    """
+    Loads the data files and builds every index (the snapshot's inverted
+    index, the query engine and the KD-trees for all stream/subject pairs)
+    so the first requests don't pay for it. Call it once before serving.
+    Returns the seconds spent on each step.
+    """
+    start = time.perf_counter()
+    snapshot = _snapshots.current()
+    loaded = time.perf_counter()
+    snapshot.query_engine()
+    snapshot.career_model()
+    snapshot.search()
+    get_scorer()
+    engine_built = time.perf_counter()
+    snapshot.geo.build_all()
+    done = time.perf_counter()
+    return {
+        "snapshot": round(loaded - start, 4),
+        "query_engine": round(engine_built - loaded, 4),
+        "geo": round(done - engine_built, 4),
+        "total": round(done - start, 4),
+    }
+
+def current_snapshot():
+    """
+    Returns the current CatalogueSnapshot. Request handlers should read it
+    once and pass it down, so the whole request sees one catalogue version.
+    """
+    return _snapshots.current()
+
+def data_version():
+    """
+    Returns a counter that changes whenever the catalogue data changes.
+    """
+    return _snapshots.current().version
+
+# Memoized recommendation results. Inputs are small discrete values (quiz
+# answers 1-5, a handful of streams and subjects), so a classroom taking the
+# test together produces many identical requests.
+RECOMMENDATION_CACHE_SIZE = 4096
+RECOMMENDATION_CACHE_TTL = 3600
+_recommendation_cache = LRUCache(
+    maxsize=RECOMMENDATION_CACHE_SIZE,
+    ttl=RECOMMENDATION_CACHE_TTL,
+    version_fn=data_version,
+)
+_MISSING = object()
+
+def _memoized(key, compute):
+    result = _recommendation_cache.get(key, _MISSING)
+    if result is _MISSING:
+        result = compute()
+        _recommendation_cache.put(key, result)
+    return result
+
+def recommendation_cache_stats():
+    """
+    Returns size, hit, miss and eviction counters of the recommendation cache.
+    """
+    return _recommendation_cache.stats()
+
+def recommend_stream(user_data):
+    """
+    Recommends a stream based on user interests and marks.
+    User data should contain:
+    - scientific_interest_score (1-5)
+    - maths_marks_percent (0-100)
+    - creativity_score (1-5)
+    - social_science_marks_percent (0-100)
+    - business_interest_score (1-5)
+    - commerce_marks_percent (0-100)
+    """
+    return stream_probabilities(user_data)[0]
+
+def stream_probabilities(user_data):
+    """
+    Like recommend_stream, but returns (stream, {stream: probability}) from
+    the active stream scorer (see streams.py). User data may carry all eight
+    category scores; scorers other than the rules can use them.
+    """
+    from .streams import FEATURES, STREAMS
+    scorer = get_scorer()
+    inputs = tuple(float(user_data.get(f, 0)) for f in FEATURES)
+
+    def compute():
+        labels, probabilities = scorer.predict([inputs])
+        return labels[0], dict(zip(STREAMS, probabilities[0].tolist()))
+
+    stream, probabilities = _memoized(("stream", scorer) + inputs, compute)
+    return stream, dict(probabilities)
+
+def recommend_subject_career(stream, interest_scores, snapshot=None):
+    """
+    Recommends subject and career based on the stream and granular interest scores.
+    interest_scores: dict mapping specific interest keys (e.g. 'math_interest') to scores (1-5).
+    """
+    ranked = rank_subject_careers(stream, interest_scores, top_n=1, snapshot=snapshot)
+    if not ranked:
+        return None, None
+    return ranked[0]["subject"], ranked[0]["career"]
+
+def rank_subject_careers(stream, interest_scores, top_n=None, snapshot=None):
+    """
+    Returns the stream's subject/career candidates, best first, as dicts with
+    stream, interest, subject, career and score. Scores are each candidate's
+    share of the student's interest in the stream (they sum to 1); ties keep
+    the mapping order.
+    """
+    snapshot = snapshot or _snapshots.current()
+    subject_careers = snapshot.subject_careers
+    if stream not in subject_careers:
+        return []
+
+    # Only the scores relevant to the stream matter, in a fixed order
+    relevant_interests = tuple(subject_careers[stream])
+    stream_scores = tuple(interest_scores.get(k, 0) for k in relevant_interests)
+
+    def compute():
+        model = snapshot.career_model()
+        scores = model.score(dict(zip(relevant_interests, stream_scores)))
+        return [model.suggestion(i, score) for i, score in model.rank(scores, stream, top_n)]
+
+    ranked = _memoized(("careers", snapshot.version, stream, stream_scores, top_n), compute)
+    # Copy so callers can't modify the cached dicts
+    return [dict(s) for s in ranked]
+
+def suggest_careers(interest_scores, streams=None, top_n=3, snapshot=None):
+    """
+    Returns {stream: ranked suggestions} (see rank_subject_careers) for the
+    given streams, or all of them, scored in a single pass.
+    """
+    snapshot = snapshot or _snapshots.current()
+    model = snapshot.career_model()
+    scores = model.score(interest_scores)
+    return {
+        stream: [model.suggestion(i, score) for i, score in model.rank(scores, stream, top_n)]
+        for stream in (streams or model.streams)
+        if stream in snapshot.subject_careers
+    }
+
+def recommend_colleges(stream, subject, max_colleges=5, snapshot=None,
+                       location=None, rank_by="distance"):
+    """
+    Recommends colleges based on stream and subject match.
+    Sorted by distance: the stored (simulated) distance_km by default, or the
+    real distance from location=(latitude, longitude) when given.
+    rank_by="travel_time" ranks by estimated travel time from location instead.
+    subject may also be a tuple of spellings of one subject (see
+    match_subjects); colleges offering any of them are merged.
+    """
+    snapshot = snapshot or _snapshots.current()
+    return [c for _, c in _ranked_colleges(snapshot, stream, subject, max_colleges, location=location, rank_by=rank_by)]
+
+def query_colleges(stream, subject, equals=None, contains=None, ranges=None,
+                   weights=None, max_colleges=5, snapshot=None, location=None,
+                   rank_by="distance"):
+    """
+    Recommends colleges for a stream and subject that also pass the given
+    filters (see QueryEngine.matching), ranked by the weighted expression
+    (see QueryEngine.page). With a location, the filtered colleges are
+    ranked by distance or travel time from it instead.
+    """
+    snapshot = snapshot or _snapshots.current()
+    return [
+        c for _, c in _ranked_colleges(
+            snapshot, stream, subject, max_colleges, query=(equals, contains, ranges),
+            weights=weights, location=location, rank_by=rank_by,
+        )
+    ]
+
+def college_page(stream, subject, page_size=10, cursor=None, query=None, weights=None,
+                 location=None, rank_by="distance", snapshot=None):
+    """
+    One page of recommended colleges, ranked like recommend_colleges (or
+    query_colleges when query=(equals, contains, ranges) or weights are
+    given). Returns (colleges, next_cursor); pass next_cursor back for the
+    following page, None means this was the last one. Raises ValueError for a
+    cursor that doesn't belong to this ranking (see pagination.py).
+    """
+    snapshot = snapshot or _snapshots.current()
+    filtered = query is not None or weights is not None
+    if location is not None:
+        order = rank_by
+    else:
+        order = "score" if filtered else "distance_km"
+    ranking = [order, stream, subject, query, weights, location]
+    after = None if cursor is None else decode_cursor(cursor, ranking)
+
+    # One extra college tells whether there is a next page
+    ranked = _ranked_colleges(
+        snapshot, stream, subject, page_size + 1, after,
+        query=query, weights=weights, location=location, rank_by=rank_by,
+    )
+    next_cursor = encode_cursor(ranking, ranked[page_size - 1][0]) if len(ranked) > page_size else None
+    return [c for _, c in ranked[:page_size]], next_cursor
+
+def _ranked_colleges(snapshot, stream, subject, k, after=None, query=None, weights=None,
+                     location=None, rank_by="distance"):
+    # Up to k (key, college) pairs in ranking order, starting after the key
+    # `after`. Every path reads a structure that is already in rank order
+    # (sorted posting lists, KD-trees searched best-first), or filters first
+    # and ranks only the survivors.
+    if query is not None or weights is not None:
+        engine = snapshot.query_engine()
+        equals, contains, ranges = query or (None, None, None)
+        equals = dict(equals or {}, stream=[stream])
+        contains = dict(contains or {})
+        contains["subjects"] = list(contains.get("subjects", [])) + [subject]
+
+        if location is None:
+            with phase("filter_rank"):
+                return engine.page(equals, contains, ranges, weights, k, after)
+
+        with phase("filter"):
+            allowed = engine.matching_refs(equals, contains, ranges)
+        latitude, longitude = location
+        with phase("rank"):
+            return snapshot.geo.page(
+                stream, (subject,), latitude, longitude, k, rank_by,
+                accept=lambda ref: (ref if type(ref) is int else id(ref)) in allowed, after=after,
+            )
+
+    subjects = (subject,) if isinstance(subject, str) else tuple(subject)
+    if location is not None:
+        # Per-student results; a spatial index query, not worth memoizing
+        latitude, longitude = location
+        with phase("rank"):
+            return snapshot.geo.page(stream, subjects, latitude, longitude, k, rank_by, after=after)
+
+    # Posting lists are pre-sorted by (distance, college_id), so a page is a
+    # slice (or a merge of a few slices) starting at a binary search
+    ranked = _memoized(
+        ("colleges", snapshot.version, stream, subjects, k, after),
+        lambda: snapshot.index.page(stream, subjects, k, after),
+    )
+    # Copies, so callers can't modify the cached page
+    return [(key, dict(college)) for key, college in ranked]
+
+def match_subjects(stream, subject, snapshot=None):
+    """
+    Normalizes a subject to the catalogue's own spellings of it within the
+    stream, e.g. "ITI - Electrician/Mechanic" -> ("ITI - Electrician/Mechanic",
+    "ITI Electrician"), using trigram similarity (see search.py). Returns
+    (subject,) when nothing in the catalogue is close.
+    """
+    snapshot = snapshot or _snapshots.current()
+    return _memoized(
+        ("subjects", snapshot.version, stream, subject),
+        lambda: snapshot.search().subject_variants(stream, subject),
+    )
+
+def search_catalogue(query, fields=("college_name", "city", "subjects"), k=10, stream=None, snapshot=None):
+    """
+    Typo-tolerant search. Returns {"colleges": [...], "cities": [...],
+    "subjects": [...]} for the requested fields, best matches first.
+    """
+    search = (snapshot or _snapshots.current()).search()
+    results = {}
+    if "college_name" in fields:
+        results["colleges"] = search.colleges(query, k, stream)
+    if "city" in fields:
+        results["cities"] = search.cities(query, k)
+    if "subjects" in fields:
+        results["subjects"] = search.subjects(query, k, stream)
+    return results
+
+def add_college(college):
+    """
+    Adds (or replaces, by college_id) a college by publishing a new snapshot
+    with an incrementally updated index. The catalogue file is left untouched.
+    """
+    _snapshots.update(lambda snapshot: (snapshot.with_college(college), None))
+
+def remove_college(college_id):
+    """
+    Removes a college by publishing a new snapshot without it.
+    Returns the removed college, or None if it was not found.
+    """
+    return _snapshots.update(lambda snapshot: snapshot.without_college(college_id))
+
+def _averages(sums, counts):
+    return {
+        QUIZ_CATEGORIES[slot]: sums[slot] / counts[slot]
+        for slot in range(len(QUIZ_CATEGORIES))
+        if counts[slot]
+    }
+
+def calculate_quiz_scores(responses):
+    """
+    Calculates the aggregate scores for each category based on quiz responses.
+    responses: dict mapping 'category_index' to the user's rating (1-5).
+    Example: {'scientific_interest_score_0': 5, 'scientific_interest_score_1': 4, ...}
+    Returns: dict with averaged scores, e.g., {'scientific_interest_score': 4.5, ...}
+    Only categories that were answered are included.
+    Raises ValueError for keys that are not in RESPONSE_KEY_SLOTS.
+    """
+    sums = [0] * len(QUIZ_CATEGORIES)
+    counts = [0] * len(QUIZ_CATEGORIES)
+
+    for key, value in responses.items():
+        try:
+            slot, _ = RESPONSE_KEY_SLOTS[key]
+        except KeyError:
+            raise ValueError(f"Unknown quiz response key: {key}") from None
+        sums[slot] += value
+        counts[slot] += 1
+
+    return _averages(sums, counts)
+
+def calculate_stage1_scores(data):
+    """
+    Calculates the category scores from a flat Q1..Q24 payload (the /stage1 format).
+    Unanswered questions count as 0, and other keys (marks etc.) are ignored.
+    """
+    return calculate_answer_scores([float(data.get(key, 0)) for key in QUESTION_KEY_SLOTS])
+
+def calculate_answer_scores(answers):
+    """
+    Calculates the category scores from Q1..Q24 answers given as a sequence
+    in QUESTION_KEY_SLOTS order.
+    """
+    sums = [0] * len(QUIZ_CATEGORIES)
+
+    for (slot, _), value in zip(QUESTION_KEY_SLOTS.values(), answers):
+        sums[slot] += value
+
+    return _averages(sums, QUESTION_COUNTS)
@@ -0,0 +1,279 @@
+"""
+Request instrumentation: latency histograms per route and per phase, exposed
+in the Prometheus text format, plus an opt-in sampling profiler.
+
+MetricsMiddleware times every request. Inside a handler, wrap the expensive
+steps in `with phase("decode"):` etc. to get a per-phase breakdown for that
+route. The profiler costs nothing until it is armed for N requests; it then
+samples thread stacks and produces folded stacks ("a;b;c count" lines) that
+flamegraph.pl / speedscope read directly.
+"""
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Seconds; roughly log-spaced around the sub-millisecond handlers we have
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram (cumulative on export, like Prometheus).
+    """
+
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        # One slot per bucket plus +Inf
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class HistogramFamily:
+    """
+    Histograms keyed by label values, e.g. (route, method, status).
+    """
+
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        with self._lock:
+            histogram = self._histograms.get(labels)
+            if histogram is None:
+                histogram = self._histograms[labels] = Histogram()
+            histogram.observe(value)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted(self._histograms.items())
+            for labels, histogram in items:
+                label_text = ",".join(
+                    f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, labels)
+                )
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f'{self.name}_bucket{{{label_text},le="{bound}"}} {cumulative}')
+                lines.append(f'{self.name}_bucket{{{label_text},le="+Inf"}} {histogram.count}')
+                lines.append(f"{self.name}_sum{{{label_text}}} {histogram.total}")
+                lines.append(f"{self.name}_count{{{label_text}}} {histogram.count}")
+        return lines
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REQUEST_LATENCY = HistogramFamily(
+    "http_request_duration_seconds", "Request latency by route.", ("route", "method", "status")
+)
+PHASE_LATENCY = HistogramFamily(
+    "http_request_phase_duration_seconds", "Time spent in each phase of a request.", ("route", "phase")
+)
+
+# Extra metric sources: callables returning Prometheus text lines
+_collectors = []
+
+
+def register_collector(collect):
+    _collectors.append(collect)
+
+
+def render_prometheus():
+    lines = REQUEST_LATENCY.render() + PHASE_LATENCY.render()
+    for collect in _collectors:
+        lines.extend(collect())
+    return "\n".join(lines) + "\n"
+
+
+# --- Phases ---
+
+# Phase timings of the current request: list of (phase, seconds)
+_request_phases = ContextVar("request_phases", default=None)
+
+
+@contextmanager
+def phase(name):
+    """
+    Times a block as one phase of the current request. Outside a request
+    (e.g. in scripts) it only costs a context variable lookup.
+    """
+    phases = _request_phases.get()
+    if phases is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        phases.append((name, time.perf_counter() - start))
+
+
+@contextmanager
+def recording_phases():
+    """
+    Collects the phases recorded inside the block into a fresh list, e.g. on
+    a worker that hands them back to the request with add_phases().
+    """
+    phases = []
+    token = _request_phases.set(phases)
+    try:
+        yield phases
+    finally:
+        _request_phases.reset(token)
+
+
+def add_phases(phases):
+    """
+    Adds (phase, seconds) pairs measured elsewhere to the current request.
+    """
+    current = _request_phases.get()
+    if current is not None:
+        current.extend(phases)
+
+
+# --- Sampling profiler ---
+
+class SamplingProfiler:
+    """
+    Samples the stacks of all other threads every `interval` seconds while
+    armed requests are in flight, and aggregates them into folded stacks.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._remaining = 0
+        self._active = 0
+        self._interval = 0.005
+        self._stacks = Counter()
+        self._thread = None
+        self.samples = 0
+
+    @property
+    def armed(self):
+        # Plain attribute read; this is all a request pays when profiling is off
+        return self._remaining > 0
+
+    def arm(self, requests, interval=0.005):
+        """
+        Profiles the next `requests` requests, discarding earlier samples.
+        """
+        with self._lock:
+            self._remaining = requests
+            self._interval = interval
+            self._stacks = Counter()
+            self.samples = 0
+
+    def request_started(self):
+        """
+        Returns True if this request is being profiled; the caller must then
+        call request_finished().
+        """
+        with self._lock:
+            if self._remaining <= 0:
+                return False
+            self._remaining -= 1
+            self._active += 1
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+                self._thread.start()
+            return True
+
+    def request_finished(self):
+        with self._lock:
+            self._active -= 1
+
+    def _run(self):
+        me = threading.get_ident()
+        while True:
+            with self._lock:
+                if self._active <= 0:
+                    self._thread = None
+                    return
+                interval = self._interval
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_filename.rsplit('/', 1)[-1]}:{code.co_name}")
+                    frame = frame.f_back
+                if stack:
+                    with self._lock:
+                        self._stacks[";".join(reversed(stack))] += 1
+                        self.samples += 1
+            time.sleep(interval)
+
+    def folded(self):
+        """
+        Returns the collected samples as folded stacks, one "stack count" per line.
+        """
+        with self._lock:
+            return "".join(f"{stack} {count}\n" for stack, count in self._stacks.most_common())
+
+    def status(self):
+        return {"armed_requests": self._remaining, "active": self._active, "samples": self.samples}
+
+
+profiler = SamplingProfiler()
+
+
+# --- Middleware ---
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request latency per route template and the
+    phases recorded with phase() during the request.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        phases = []
+        token = _request_phases.set(phases)
+        profiling = profiler.armed and profiler.request_started()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _request_phases.reset(token)
+            if profiling:
+                profiler.request_finished()
+            route = scope.get("route")
+            route = getattr(route, "path", None) or "unmatched"
+            REQUEST_LATENCY.observe((route, scope["method"], str(status["code"])), elapsed)
+            for name, seconds in phases:
+                PHASE_LATENCY.observe((route, name), seconds)
@@ -0,0 +1,45 @@
+"""
+Opaque keyset cursors for paged college recommendations.
+
+Every ranking of colleges orders them by a key, (sort value, college_id),
+that is unique per college. The cursor handed out with a page is the key of
+its last college plus a checksum of the ranking it came from; the next page
+is whatever ranks after that key. The server keeps nothing between pages,
+and a cursor survives catalogue reloads: colleges added or removed in the
+meantime simply appear or disappear at their place in the order.
+"""
+import base64
+import json
+import zlib
+
+
+def _checksum(ranking):
+    return zlib.crc32(json.dumps(ranking, sort_keys=True, default=str).encode())
+
+
+def encode_cursor(ranking, key):
+    """
+    Returns the cursor for the page ending at key, for a ranking described
+    by any JSON-able value (e.g. the rank order, filters and location).
+    """
+    value, college_id = key
+    raw = json.dumps([_checksum(ranking), value, int(college_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, ranking):
+    """
+    Returns the (sort value, college_id) key a cursor points at. Raises
+    ValueError for a malformed cursor or one from a different ranking.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        checksum, value, college_id = json.loads(raw)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor") from None
+    if (
+        type(value) not in (int, float) or type(college_id) is not int
+        or checksum != _checksum(ranking)
+    ):
+        raise ValueError("Cursor does not belong to this query")
+    return (value, college_id)
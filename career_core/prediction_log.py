@@ -0,0 +1,222 @@
+"""
+Append-only log of the predictions served, for audit and replay.
+
+Request handlers call log.append(endpoint, inputs, output, snapshot), which
+only puts a tuple on a bounded in-memory queue: no serialization and no I/O
+on the request path. A background writer thread takes whatever has queued
+up (up to batch_size entries, waiting at most flush_interval seconds after
+the first one), serializes it and writes it to SQLite in WAL mode in one
+transaction (group commit). If the queue is full, appends are dropped and
+counted rather than slowing requests down.
+
+durability trades commit latency for what survives a crash:
+- off: no fsync at all; an OS crash or power loss can lose recent commits
+  (or, rarely, corrupt the file)
+- normal (default): WAL with synchronous=NORMAL; commits survive the process
+  dying, the last few may be lost on power loss
+- full: synchronous=FULL, fsync on every group commit
+In every mode, entries still queued when the process is killed are lost;
+close() writes them out on a clean shutdown.
+
+Each row holds the endpoint, the inputs and output as JSON, and the
+catalogue snapshot (version and build time) that was current. read() streams
+them back; backend/replay_log.py re-runs them against the current logic.
+"""
+import json
+import queue
+import sqlite3
+import threading
+import time
+
+from . import metrics
+
+DURABILITY = {"off": "OFF", "normal": "NORMAL", "full": "FULL"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    id INTEGER PRIMARY KEY,
+    logged_at REAL NOT NULL,
+    endpoint TEXT NOT NULL,
+    catalogue_version INTEGER,
+    catalogue_built_at TEXT,
+    input TEXT NOT NULL,
+    output TEXT NOT NULL
+)
+"""
+_INSERT = (
+    "INSERT INTO predictions (logged_at, endpoint, catalogue_version, catalogue_built_at, input, output)"
+    " VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+# One encoder for every entry; json.dumps() would build a new one per call
+_encode = json.JSONEncoder(separators=(",", ":"), default=str).encode
+
+COMMIT_TIME = metrics.HistogramFamily(
+    "prediction_log_commit_seconds", "Time spent writing and committing one group of log entries.", ("durability",)
+)
+
+
+def _connect(path, durability):
+    connection = sqlite3.connect(path, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute(f"PRAGMA synchronous={DURABILITY[durability]}")
+    connection.execute(_SCHEMA)
+    connection.commit()
+    return connection
+
+
+class PredictionLog:
+    """
+    Group-committing prediction log over one SQLite file. Call start() to
+    launch the writer and close() to flush and stop it.
+    """
+
+    def __init__(self, path, durability="normal", batch_size=512, flush_interval=0.05, queue_limit=10000):
+        if durability not in DURABILITY:
+            raise ValueError(f"durability must be one of {', '.join(DURABILITY)}, not {durability!r}")
+        self.path = path
+        self.durability = durability
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue_limit = queue_limit
+        self._queue = queue.Queue(maxsize=queue_limit)
+        self._connection = _connect(path, durability)
+        self._thread = None
+        self._lock = threading.Lock()
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.commits = 0
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="prediction-log", daemon=True)
+            self._thread.start()
+
+    def append(self, endpoint, inputs, output, snapshot=None):
+        """
+        Queues one entry. inputs and output must be JSON-able and must not be
+        modified afterwards (they are serialized later, on the writer).
+        Returns False if the queue was full and the entry was dropped.
+        """
+        entry = (
+            time.time(), endpoint,
+            snapshot.version if snapshot is not None else None,
+            snapshot.built_at.isoformat() if snapshot is not None else None,
+            inputs, output,
+        )
+        try:
+            self._queue.put_nowait(entry)
+            return True
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+
+    def _run(self):
+        while True:
+            entry = self._queue.get()
+            if entry is None:
+                self._queue.task_done()
+                return
+            group = [entry]
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+            while len(group) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is None:
+                    self._queue.task_done()
+                    stop = True
+                    break
+                group.append(entry)
+            self._write(group)
+            if stop:
+                return
+
+    def _write(self, group):
+        start = time.perf_counter()
+        try:
+            rows = [
+                (logged_at, endpoint, version, built_at, _encode(inputs), _encode(output))
+                for logged_at, endpoint, version, built_at, inputs, output in group
+            ]
+            with self._connection:
+                self._connection.executemany(_INSERT, rows)
+        except Exception:
+            # A bad entry or a full disk costs this group, not the server
+            with self._lock:
+                self.failed += len(group)
+        else:
+            with self._lock:
+                self.written += len(group)
+                self.commits += 1
+        finally:
+            for _ in group:
+                self._queue.task_done()
+        COMMIT_TIME.observe((self.durability,), time.perf_counter() - start)
+
+    def flush(self):
+        """
+        Blocks until everything appended so far has been written.
+        """
+        self._queue.join()
+
+    def close(self):
+        """
+        Writes out the queued entries and stops the writer.
+        """
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        self._connection.close()
+
+    def metrics(self):
+        """
+        Prometheus text lines for the log; pass to metrics.register_collector.
+        """
+        lines = [
+            "# TYPE prediction_log_queue_depth gauge",
+            f"prediction_log_queue_depth {self._queue.qsize()}",
+            "# TYPE prediction_log_queue_limit gauge",
+            f"prediction_log_queue_limit {self.queue_limit}",
+            "# TYPE prediction_log_commits_total counter",
+            f"prediction_log_commits_total {self.commits}",
+            "# TYPE prediction_log_entries_total counter",
+        ]
+        for outcome in ("written", "dropped", "failed"):
+            lines.append(f'prediction_log_entries_total{{outcome="{outcome}"}} {getattr(self, outcome)}')
+        return lines + COMMIT_TIME.render()
+
+
+def read(path, endpoints=None, after_id=0, chunk_size=5000):
+    """
+    Yields (id, endpoint, catalogue_version, catalogue_built_at, inputs,
+    output) for the logged predictions with id > after_id, oldest first,
+    optionally only for some endpoints. Reads in chunks, so memory stays flat
+    however large the log is; the log may be written to meanwhile.
+    """
+    connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        where = "id > ?"
+        params = [after_id]
+        if endpoints:
+            where += f" AND endpoint IN ({', '.join('?' * len(endpoints))})"
+            params += list(endpoints)
+        while True:
+            rows = connection.execute(
+                "SELECT id, endpoint, catalogue_version, catalogue_built_at, input, output"
+                f" FROM predictions WHERE {where} ORDER BY id LIMIT ?",
+                params + [chunk_size],
+            ).fetchall()
+            if not rows:
+                return
+            for row_id, endpoint, version, built_at, inputs, output in rows:
+                yield row_id, endpoint, version, built_at, json.loads(inputs), json.loads(output)
+            params[0] = rows[-1][0]
+    finally:
+        connection.close()
@@ -0,0 +1,223 @@
+"""
+Multi-criteria college queries: filter predicates plus a weighted ranking.
+
+A QueryEngine is built once per catalogue snapshot. It precomputes
+- a packed bitmap per value of every categorical field (and per term of the
+  list fields), so equality and membership filters are bitwise ANDs/ORs
+- a sorted copy of every numeric field, so range filters are two binary
+  searches
+- min/max of every numeric field, so ranking weights apply to values
+  normalized to 0..1
+A query ANDs the bitmaps together, scores only the surviving rows and
+selects the top k without sorting the rest.
+"""
+import numpy as np
+
+CATEGORICAL_FIELDS = (
+    "stream", "city", "hostel", "scholarship", "transport_available",
+    "gender_specific", "accreditation", "placement_opportunities",
+    "accommodation_type", "scholarship_eligibility", "entry_criteria",
+)
+NUMERIC_FIELDS = (
+    "distance_km", "travel_time_min", "tuition_fees", "rating",
+    "faculty_count", "average_package",
+)
+LIST_FIELDS = ("subjects", "facilities", "extra_curricular")
+
+# Used when a query gives no weights: nearest first, like recommend_colleges
+DEFAULT_WEIGHTS = {"distance_km": -1.0}
+
+
+class QueryEngine:
+    """
+    Filter/rank engine over every college in a CollegeIndex.
+    """
+
+    def __init__(self, college_index, catalogue=None):
+        self._college_index = college_index
+        self._refs = college_index.refs()
+        n = self._n = len(self._refs)
+        # Catalogue rows come first in refs(), followed by added dicts
+        rows = np.array([r for r in self._refs if type(r) is int], dtype=np.int64)
+        extra = [r for r in self._refs if type(r) is not int]
+
+        self._ids = self._numeric("college_id", catalogue, rows, extra)
+        self._all = np.packbits(np.ones(n, dtype=bool))
+
+        # value -> packed bitmap
+        self._bitmaps = {}
+        for field in CATEGORICAL_FIELDS:
+            values = self._objects(field, catalogue, rows, extra)
+            codes, inverse = np.unique(values.astype(str), return_inverse=True)
+            originals = {}
+            for v in values:
+                originals.setdefault(str(v), v)
+            self._bitmaps[field] = {
+                originals[code]: np.packbits(inverse == i)
+                for i, code in enumerate(codes)
+            }
+
+        for field in LIST_FIELDS:
+            self._bitmaps[field] = self._term_bitmaps(field, catalogue, rows, extra)
+
+        # Per numeric field: values, (sorted order, sorted values) and
+        # normalization bounds (min, span)
+        self._numbers = {}
+        self._sorted = {}
+        self._bounds = {}
+        for field in NUMERIC_FIELDS:
+            values = self._numeric(field, catalogue, rows, extra)
+            order = np.argsort(values, kind="stable")
+            self._numbers[field] = values
+            self._sorted[field] = (order, values[order])
+            if n:
+                low, high = float(values.min()), float(values.max())
+                self._bounds[field] = (low, (high - low) or 1.0)
+
+    def __len__(self):
+        return self._n
+
+    # --- Column extraction ---
+
+    def _numeric(self, field, catalogue, rows, extra):
+        parts = []
+        if len(rows):
+            parts.append(np.asarray(catalogue.column(field), dtype=np.float64)[rows])
+        parts.append(np.array([c[field] for c in extra], dtype=np.float64))
+        return np.concatenate(parts)
+
+    def _objects(self, field, catalogue, rows, extra):
+        values = []
+        if len(rows):
+            column = np.asarray(catalogue.column(field))[rows]
+            if catalogue.kind(field) == "str":
+                # Decode each distinct string id once
+                ids, inverse = np.unique(column, return_inverse=True)
+                strings = np.array([catalogue.string(i) for i in ids.tolist()], dtype=object)
+                values.append(strings[inverse])
+            else:
+                values.append(column.astype(bool).astype(object))
+        values.append(np.array([c[field] for c in extra], dtype=object))
+        return np.concatenate(values)
+
+    def _term_bitmaps(self, field, catalogue, rows, extra):
+        bitmaps = {}
+        n_rows = len(rows)
+        if n_rows:
+            vocab = catalogue.vocab(field)
+            words = np.asarray(catalogue.column(field), dtype=np.uint64)
+            words = words.reshape(len(catalogue), -1)[rows]
+            for bit, term in enumerate(vocab):
+                mask = np.zeros(self._n, dtype=bool)
+                mask[:n_rows] = (words[:, bit // 64] >> np.uint64(bit % 64)) & np.uint64(1) == 1
+                bitmaps[term] = mask
+        for i, college in enumerate(extra):
+            for term in college[field]:
+                mask = bitmaps.setdefault(term, np.zeros(self._n, dtype=bool))
+                mask[n_rows + i] = True
+        return {term: np.packbits(mask) for term, mask in bitmaps.items()}
+
+    # --- Querying ---
+
+    def _range_bitmap(self, field, low, high):
+        order, values = self._sorted[field]
+        start = 0 if low is None else np.searchsorted(values, low, side="left")
+        stop = len(values) if high is None else np.searchsorted(values, high, side="right")
+        mask = np.zeros(self._n, dtype=bool)
+        mask[order[start:stop]] = True
+        return np.packbits(mask)
+
+    def matching(self, equals=None, contains=None, ranges=None):
+        """
+        Returns the positions of rows that pass every filter.
+        equals: {field: [allowed values]} for categorical fields (any of)
+        contains: {field: [terms]} for list fields (all of)
+        ranges: {field: (min or None, max or None)} for numeric fields, inclusive
+        """
+        bitmap = self._all
+        empty = np.zeros_like(self._all)
+
+        for field, allowed in (equals or {}).items():
+            if field not in CATEGORICAL_FIELDS:
+                raise ValueError(f"Cannot filter on {field!r}")
+            values = self._bitmaps[field]
+            either = empty
+            for value in allowed:
+                either = either | values.get(value, empty)
+            bitmap = bitmap & either
+
+        for field, terms in (contains or {}).items():
+            if field not in LIST_FIELDS:
+                raise ValueError(f"Cannot filter on {field!r}")
+            for term in terms:
+                bitmap = bitmap & self._bitmaps[field].get(term, empty)
+
+        for field, (low, high) in (ranges or {}).items():
+            if field not in NUMERIC_FIELDS:
+                raise ValueError(f"Cannot filter on {field!r}")
+            bitmap = bitmap & self._range_bitmap(field, low, high)
+
+        return np.flatnonzero(np.unpackbits(bitmap, count=self._n))
+
+    def matching_refs(self, equals=None, contains=None, ranges=None):
+        """
+        Like matching(), but returns a set of catalogue rows, plus id() of
+        added college dicts, for membership tests against index postings.
+        """
+        refs = self._refs
+        return {
+            ref if type(ref) is int else id(ref)
+            for ref in (refs[i] for i in self.matching(equals, contains, ranges).tolist())
+        }
+
+    def page(self, equals=None, contains=None, ranges=None, weights=None, k=5, after=None):
+        """
+        Returns up to k (key, college) pairs for the colleges passing the
+        filters, ranked by sum(weight * normalized value) over the weighted
+        numeric fields, highest first; ties go to the lower college_id.
+        Negative weights prefer smaller values (e.g. distance, fees). key is
+        (-score, college_id); after=key leaves out everything ranked up to
+        and including that position, so the next page is one more pass over
+        the filtered rows rather than over all the earlier pages.
+        """
+        weights = weights or DEFAULT_WEIGHTS
+        for field in weights:
+            if field not in NUMERIC_FIELDS:
+                raise ValueError(f"Cannot rank on {field!r}")
+
+        positions = self.matching(equals, contains, ranges)
+        if not len(positions) or k <= 0:
+            return []
+
+        scores = np.zeros(len(positions))
+        for field, weight in weights.items():
+            low, span = self._bounds[field]
+            scores += weight * (self._numbers[field][positions] - low) / span
+
+        if after is not None:
+            # Keep what ranks after the cursor: a lower score, or the same
+            # score and a higher college_id
+            last_key, last_id = after
+            ids = self._ids[positions]
+            keep = (-scores > last_key) | ((-scores == last_key) & (ids > last_id))
+            positions, scores = positions[keep], scores[keep]
+            if not len(positions):
+                return []
+
+        # Partial selection of the best k, then order just those
+        if len(positions) > k:
+            best = np.argpartition(-scores, k - 1)[:k]
+            # Bring in every row tied with the k-th score so tie-breaking by
+            # college_id is exact
+            cutoff = scores[best].min()
+            best = np.flatnonzero(scores >= cutoff)
+        else:
+            best = np.arange(len(positions))
+        ranked = best[np.lexsort((self._ids[positions[best]], -scores[best]))][:k]
+
+        results = []
+        for i in ranked:
+            college = dict(self._college_index.materialize(self._refs[positions[i]]))
+            college["score"] = round(float(scores[i]), 6)
+            results.append(((-float(scores[i]), int(self._ids[positions[i]])), college))
+        return results
@@ -0,0 +1,270 @@
+"""
+Typo-tolerant search over college names, cities and subjects.
+
+Strings are normalized (lowercase, punctuation to spaces) and broken into
+trigrams the way PostgreSQL's pg_trgm does: each word padded with two spaces
+in front and one behind, so "ITI - Electrician" and "iti electrician" have
+the same trigrams. A TrigramIndex keeps, for every trigram, the sorted ids of
+the terms containing it (CSR arrays), so a query counts its shared trigrams
+with every term in one np.bincount over a handful of posting lists.
+
+Two scores come out of the counts:
+- similarity: shared / (query + term - shared) trigrams, symmetric (Jaccard);
+  used to decide whether two subject spellings are the same subject.
+- match: shared / query trigrams, how much of the query the term contains;
+  used to rank search results, so "degree college srinagr" finds
+  "Govt. Degree College, Srinagar".
+"""
+import re
+
+import numpy as np
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+# Search results must contain at least this share of the query's trigrams
+SEARCH_THRESHOLD = 0.5
+# Subject spellings at least this similar are treated as the same subject
+# ("ITI Electrician" vs "ITI - Electrician/Mechanic" is 0.64, "Political
+# Science" vs "Computer Science" 0.30)
+SUBJECT_THRESHOLD = 0.45
+# A subject the catalogue doesn't have at all (e.g. a typo, "Phsyics" vs
+# "Physics" is 0.33) maps to its closest spelling above this
+SUBJECT_FALLBACK_THRESHOLD = 0.3
+
+
+def words(text):
+    return _NON_WORD.sub(" ", str(text).lower()).split()
+
+
+def normalize(text):
+    return " ".join(words(text))
+
+
+def trigrams(text):
+    """
+    Returns the set of trigrams of a string (normalized first).
+    """
+    grams = set()
+    for word in words(text):
+        padded = "  " + word + " "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """
+    Trigram index over a list of strings (terms), built once.
+    """
+
+    def __init__(self, terms):
+        self.terms = list(terms)
+        # Names repeat the same few words ("Govt.", "College", city names), so
+        # trigrams are worked out once per distinct word, and each term's are
+        # the union of its words'
+        vocabulary = {}
+        word_ids = {}
+        word_grams = []
+        words_per_term = []
+        term_words = []
+        for term in self.terms:
+            term_split = words(term)
+            words_per_term.append(len(term_split))
+            for word in term_split:
+                w = word_ids.get(word)
+                if w is None:
+                    w = word_ids[word] = len(word_grams)
+                    word_grams.append([vocabulary.setdefault(g, len(vocabulary)) for g in trigrams(word)])
+                term_words.append(w)
+
+        # Expand (term, word) pairs into (trigram, term) pairs and drop
+        # duplicates; keys sort by trigram, then term
+        word_len = np.array([len(g) for g in word_grams], dtype=np.int64)
+        word_start = np.concatenate([[0], np.cumsum(word_len)[:-1]]) if len(word_grams) else word_len
+        flat = np.array([g for grams in word_grams for g in grams], dtype=np.int64)
+        term_words = np.array(term_words, dtype=np.int64)
+        lengths = word_len[term_words]
+        pair_terms = np.repeat(np.repeat(np.arange(len(self.terms)), words_per_term), lengths)
+        positions = np.repeat(word_start[term_words] - (np.cumsum(lengths) - lengths), lengths)
+        grams = flat[positions + np.arange(len(positions))]
+        keys = np.sort(grams * len(self.terms) + pair_terms)
+        keys = keys[np.concatenate([[True], keys[1:] != keys[:-1]])] if len(keys) else keys
+        gram_ids = keys // max(len(self.terms), 1)
+        term_ids = keys % max(len(self.terms), 1)
+
+        # CSR layout: postings of trigram g are term_ids[indptr[g]:indptr[g + 1]]
+        self._vocabulary = vocabulary
+        self._term_ids = term_ids.astype(np.int32)
+        self._indptr = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(gram_ids, minlength=len(vocabulary)), out=self._indptr[1:])
+        self._sizes = np.bincount(term_ids, minlength=len(self.terms)).astype(np.int32)
+
+    def __len__(self):
+        return len(self.terms)
+
+    def scores(self, query):
+        """
+        Returns (match, similarity) arrays over all terms for a query string.
+        """
+        grams = trigrams(query)
+        match = np.zeros(len(self.terms))
+        if not grams or not self.terms:
+            return match, match
+        ids = [self._vocabulary[g] for g in grams if g in self._vocabulary]
+        if ids:
+            hits = np.concatenate([self._term_ids[self._indptr[g]:self._indptr[g + 1]] for g in ids])
+            shared = np.bincount(hits, minlength=len(self.terms)).astype(np.float64)
+        else:
+            shared = match
+        match = shared / len(grams)
+        similarity = shared / (len(grams) + self._sizes - shared)
+        return match, similarity
+
+    def search(self, query, k=10, threshold=SEARCH_THRESHOLD, mask=None):
+        """
+        Returns up to k (term id, match, similarity) for the terms containing
+        at least `threshold` of the query's trigrams, best first (ties: the
+        more similar term, then term order). mask limits the candidates.
+        """
+        match, similarity = self.scores(query)
+        eligible = match >= threshold
+        if mask is not None:
+            eligible &= mask
+        candidates = np.flatnonzero(eligible)
+        if len(candidates) > k:
+            # Keep every term tied with the k-th best match, then sort fully
+            cutoff = np.partition(match[candidates], len(candidates) - k)[len(candidates) - k]
+            candidates = candidates[match[candidates] >= cutoff]
+        order = np.lexsort((candidates, -similarity[candidates], -match[candidates]))[:k]
+        return [
+            (int(i), round(float(match[i]), 4), round(float(similarity[i]), 4))
+            for i in candidates[order]
+        ]
+
+
+class CollegeSearch:
+    """
+    Name, city and subject search over one CollegeIndex (i.e. one snapshot).
+    """
+
+    def __init__(self, college_index, colleges):
+        self._college_index = college_index
+        refs = college_index.refs()
+        names, cities, streams = self._columns(refs, colleges)
+
+        # One name term per distinct name; term -> refs in catalogue order
+        name_terms, name_of = np.unique(np.array(names, dtype=object), return_inverse=True)
+        order = np.argsort(name_of, kind="stable")
+        self._names = TrigramIndex(name_terms.tolist())
+        self._name_refs = np.array(refs, dtype=object)[order] if refs else np.array([], dtype=object)
+        self._name_streams = np.array(streams, dtype=object)[order] if refs else np.array([], dtype=object)
+        self._name_ptr = np.zeros(len(name_terms) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(name_of, minlength=len(name_terms)), out=self._name_ptr[1:])
+        self._name_of = name_of
+        self._streams = np.array(streams, dtype=object)
+
+        city_terms, city_counts = np.unique(np.array(cities, dtype=object), return_counts=True)
+        self._cities = TrigramIndex(city_terms.tolist())
+        self._city_counts = city_counts.tolist()
+
+        # Subjects with the streams that offer them
+        self._subject_streams = {}
+        for stream, subject in college_index.pairs():
+            self._subject_streams.setdefault(subject, []).append(stream)
+        self._subjects = TrigramIndex(sorted(self._subject_streams))
+        # stream -> bool mask over subject terms / name terms
+        self._stream_masks = {}
+        self._name_masks = {}
+
+    @staticmethod
+    def _columns(refs, colleges):
+        # (names, cities, streams) of every ref; catalogue rows straight from
+        # the string columns, without materializing dicts
+        names, cities, streams = [], [], []
+        fields = getattr(colleges, "fields", ())
+        rows = [ref for ref in refs if type(ref) is int] if "college_name" in fields else []
+        if rows:
+            def strings(name):
+                if name not in fields:
+                    return [""] * len(rows)
+                ids = colleges.column(name)
+                return [colleges.string(ids[row]) for row in rows]
+            names, cities, streams = strings("college_name"), strings("city"), strings("stream")
+        for ref in refs[len(rows):]:
+            college = colleges[ref] if type(ref) is int else ref
+            names.append(college.get("college_name", ""))
+            cities.append(college.get("city", ""))
+            streams.append(college["stream"])
+        return names, cities, streams
+
+    def _subject_mask(self, stream):
+        mask = self._stream_masks.get(stream)
+        if mask is None:
+            mask = np.array([stream in self._subject_streams[s] for s in self._subjects.terms], dtype=bool)
+            self._stream_masks[stream] = mask
+        return mask
+
+    def _name_mask(self, stream):
+        # Names carried by at least one college of the stream
+        mask = self._name_masks.get(stream)
+        if mask is None:
+            mask = np.zeros(len(self._names), dtype=bool)
+            mask[self._name_of[self._streams == stream]] = True
+            self._name_masks[stream] = mask
+        return mask
+
+    def colleges(self, query, k=10, stream=None):
+        """
+        Colleges whose name matches the query, best first, as college dicts
+        with a match_score.
+        """
+        results = []
+        # Every name found has at least one college (in the stream), so k
+        # names are enough
+        mask = None if stream is None else self._name_mask(stream)
+        for term, match, _ in self._names.search(query, k, mask=mask):
+            for pos in range(self._name_ptr[term], self._name_ptr[term + 1]):
+                if stream is not None and self._name_streams[pos] != stream:
+                    continue
+                college = dict(self._college_index.materialize(self._name_refs[pos]))
+                college["match_score"] = match
+                results.append(college)
+                if len(results) == k:
+                    return results
+        return results
+
+    def cities(self, query, k=10):
+        return [
+            {"city": self._cities.terms[term], "colleges": self._city_counts[term], "match_score": match}
+            for term, match, _ in self._cities.search(query, k)
+        ]
+
+    def subjects(self, query, k=10, stream=None):
+        mask = None if stream is None else self._subject_mask(stream)
+        return [
+            {
+                "subject": self._subjects.terms[term],
+                "streams": self._subject_streams[self._subjects.terms[term]],
+                "match_score": match,
+            }
+            for term, match, _ in self._subjects.search(query, k, mask=mask)
+        ]
+
+    def subject_variants(self, stream, subject, threshold=SUBJECT_THRESHOLD):
+        """
+        Returns the stream's catalogue subjects that are spellings of the given
+        subject: the exact subject first if the catalogue has it, then every
+        subject at least `threshold` similar, most similar first. Without an
+        exact or similar subject, the closest one above
+        SUBJECT_FALLBACK_THRESHOLD; failing that, (subject,).
+        """
+        exact = stream in self._subject_streams.get(subject, ())
+        _, similarity = self._subjects.scores(subject)
+        similarity = np.where(self._subject_mask(stream), similarity, 0.0)
+        candidates = np.flatnonzero(similarity >= threshold)
+        order = np.lexsort((candidates, -similarity[candidates]))
+        variants = [self._subjects.terms[i] for i in candidates[order]]
+        if exact:
+            variants = [subject] + [v for v in variants if v != subject]
+        elif not variants and len(similarity) and similarity.max() >= SUBJECT_FALLBACK_THRESHOLD:
+            variants = [self._subjects.terms[int(np.argmax(similarity))]]
+        return tuple(variants) or (subject,)
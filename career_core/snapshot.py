@@ -0,0 +1,293 @@
+"""
+Immutable catalogue snapshots with atomic swap.
+
+A CatalogueSnapshot bundles the college catalogue, its indexes and the
+subject/career mapping. Requests read current() once and use that snapshot to
+the end, so a reload that swaps in a new snapshot never changes data under an
+in-flight request. Snapshots are built off the request path (reload_async or
+the file watcher) and published with a single reference assignment.
+"""
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+from . import data
+from .catalogue import load_catalogue, load_subject_careers
+from .geo import GeoIndex, travel_rate
+from .index import CollegeIndex
+
+
+class CatalogueSnapshot:
+    """
+    One immutable version of the catalogue data and everything built from it.
+    """
+
+    __slots__ = (
+        "version", "base", "edits", "built_at", "build_seconds", "colleges", "index", "geo",
+        "subject_careers", "_query", "_query_lock", "_careers", "_search",
+    )
+
+    def __init__(self, version, colleges, index, subject_careers, build_seconds=0.0, base=None, edits=()):
+        self.version = version
+        # Version of the snapshot built from the data files that this one
+        # derives from, and the ("add", college) / ("remove", college_id)
+        # edits made since, oldest first
+        self.base = version if base is None else base
+        self.edits = edits
+        self.built_at = datetime.now(timezone.utc)
+        self.build_seconds = build_seconds
+        self.colleges = colleges
+        self.index = index
+        # KD-trees are built lazily per (stream, subject) on first use
+        self.geo = GeoIndex(index, self._coordinates, self._travel_rate)
+        self.subject_careers = subject_careers
+        self._query = None
+        self._query_lock = threading.Lock()
+        self._careers = None
+        self._search = None
+
+    def query_engine(self):
+        """
+        Returns the filter/rank QueryEngine for this snapshot, building it on
+        first use.
+        """
+        if self._query is None:
+            # Imported here so loading the package doesn't pull in numpy
+            from .query import QueryEngine
+            with self._query_lock:
+                if self._query is None:
+                    self._query = QueryEngine(self.index, self.colleges)
+        return self._query
+
+    def career_model(self):
+        """
+        Returns the CareerModel for this snapshot's subject/career mapping,
+        building it on first use.
+        """
+        if self._careers is None:
+            from .careers import CareerModel
+            # Cheap to build; a duplicate from a race is harmless
+            self._careers = CareerModel(self.subject_careers)
+        return self._careers
+
+    def search(self):
+        """
+        Returns the CollegeSearch (trigram indexes over names, cities and
+        subjects) for this snapshot, building it on first use.
+        """
+        if self._search is None:
+            from .search import CollegeSearch
+            with self._query_lock:
+                if self._search is None:
+                    self._search = CollegeSearch(self.index, self.colleges)
+        return self._search
+
+    def _coordinates(self, ref):
+        if type(ref) is int:
+            if "latitude" not in self.colleges.fields:
+                return None
+            return (self.colleges.column("latitude")[ref], self.colleges.column("longitude")[ref])
+        if ref.get("latitude") is None or ref.get("longitude") is None:
+            return None
+        return (ref["latitude"], ref["longitude"])
+
+    def _travel_rate(self, ref):
+        if type(ref) is int:
+            fields = self.colleges.fields
+            distance = self.colleges.column("distance_km")[ref] if "distance_km" in fields else None
+            minutes = self.colleges.column("travel_time_min")[ref] if "travel_time_min" in fields else None
+            return travel_rate(distance, minutes)
+        return travel_rate(ref.get("distance_km"), ref.get("travel_time_min"))
+
+    def with_college(self, college):
+        """
+        Returns a new snapshot with a college added (or replaced, by college_id).
+        """
+        index = self.index.copy()
+        index.add(college)
+        return CatalogueSnapshot(
+            _next_version(), self.colleges, index, self.subject_careers,
+            base=self.base, edits=self.edits + (("add", college),),
+        )
+
+    def without_college(self, college_id):
+        """
+        Returns (new snapshot, removed college); the snapshot is self if the
+        college was not found.
+        """
+        index = self.index.copy()
+        college = index.remove(college_id)
+        if college is None:
+            return self, None
+        snapshot = CatalogueSnapshot(
+            _next_version(), self.colleges, index, self.subject_careers,
+            base=self.base, edits=self.edits + (("remove", college_id),),
+        )
+        return snapshot, college
+
+    def with_edits(self, edits):
+        """
+        Returns a new snapshot with a sequence of edits (as in .edits) applied.
+        """
+        snapshot = self
+        for action, value in edits:
+            if action == "add":
+                snapshot = snapshot.with_college(value)
+            else:
+                snapshot, _ = snapshot.without_college(value)
+        return snapshot
+
+    def info(self):
+        return {
+            "version": self.version,
+            "built_at": self.built_at.isoformat(),
+            "build_seconds": round(self.build_seconds, 4),
+            "colleges": len(self.index),
+            "source": getattr(self.colleges, "path", None),
+        }
+
+
+_version_lock = threading.Lock()
+_last_version = 0
+
+def _next_version():
+    global _last_version
+    with _version_lock:
+        _last_version += 1
+        return _last_version
+
+
+def build_snapshot(source=None, subject_careers_path=None, colleges=None, subject_careers=None):
+    """
+    Loads the catalogue and subject/career mapping from disk (unless given)
+    and builds every index over them.
+    """
+    start = time.perf_counter()
+    if colleges is None:
+        colleges = load_catalogue(source)
+    if subject_careers is None:
+        subject_careers = load_subject_careers(subject_careers_path)
+    index = CollegeIndex.from_catalogue(colleges)
+    return CatalogueSnapshot(
+        _next_version(), colleges, index, subject_careers,
+        build_seconds=time.perf_counter() - start,
+    )
+
+
+# --- Current snapshot ---
+
+_current = None
+# Serializes writers (reloads and incremental edits); readers never lock
+_swap_lock = threading.Lock()
+_reload_thread = None
+_last_reload_error = None
+
+
+def _initial():
+    # Builds the first snapshot from the default data on first use; called
+    # with _swap_lock held
+    if _current is None:
+        publish(build_snapshot(colleges=data.COLLEGE_DB, subject_careers=data.QUIZ_TO_SUBJECT_CAREER))
+    return _current
+
+
+def current():
+    """
+    Returns the snapshot requests should use. Grab it once per request.
+    The first call loads the data files.
+    """
+    snapshot = _current
+    if snapshot is None:
+        with _swap_lock:
+            snapshot = _initial()
+    return snapshot
+
+
+def publish(snapshot):
+    """
+    Makes snapshot the current one. Plain reference assignment, so readers
+    see either the old or the new snapshot, never a mix.
+    """
+    global _current
+    _current = snapshot
+
+
+def update(change):
+    """
+    Applies change(snapshot) -> (new snapshot, result) under the writer lock,
+    publishes the new snapshot and returns result.
+    """
+    with _swap_lock:
+        snapshot, result = change(_initial())
+        publish(snapshot)
+        return result
+
+
+def reload(source=None, subject_careers_path=None):
+    """
+    Builds a new snapshot from the data files and swaps it in.
+    """
+    snapshot = build_snapshot(source, subject_careers_path)
+    with _swap_lock:
+        publish(snapshot)
+    return snapshot
+
+
+def reload_async(source=None, subject_careers_path=None):
+    """
+    Starts a background reload. Returns False if one is already running.
+    """
+    global _reload_thread
+    with _swap_lock:
+        if _reload_thread is not None and _reload_thread.is_alive():
+            return False
+        _reload_thread = threading.Thread(
+            target=_background_reload, args=(source, subject_careers_path),
+            name="catalogue-reload", daemon=True,
+        )
+        _reload_thread.start()
+    return True
+
+
+def _background_reload(source, subject_careers_path):
+    # A failed build leaves the current snapshot in place
+    global _last_reload_error
+    try:
+        reload(source, subject_careers_path)
+        _last_reload_error = None
+    except Exception as e:
+        _last_reload_error = f"{type(e).__name__}: {e}"
+
+
+def is_reloading():
+    return _reload_thread is not None and _reload_thread.is_alive()
+
+
+def last_reload_error():
+    """
+    Returns the error from the last background reload, or None if it succeeded.
+    """
+    return _last_reload_error
+
+
+def watch(paths, interval=5.0):
+    """
+    Polls the given data files and reloads in the background whenever one of
+    them changes. Returns the watcher thread.
+    """
+    def mtimes():
+        return [os.path.getmtime(p) if os.path.exists(p) else None for p in paths]
+
+    def run():
+        last = mtimes()
+        while True:
+            time.sleep(interval)
+            now = mtimes()
+            # If a reload is already running, try again on the next tick
+            if now != last and reload_async():
+                last = now
+
+    thread = threading.Thread(target=run, name="catalogue-watcher", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,189 @@
+"""
+Pluggable stream scorers with per-stream probabilities.
+
+A scorer takes an (n, len(FEATURES)) matrix (the eight quiz category
+averages followed by the three marks) and returns stream labels plus an
+(n, len(STREAMS)) matrix of probabilities, in a few vectorized operations:
+- RuleScorer: the original threshold rules, probability 1 for the chosen
+  stream. Kept as the reference the other scorers are compared against.
+- SoftRuleScorer (default): the same rules compiled into flat arrays, with
+  each threshold softened into a sigmoid. Labels are exactly the rules';
+  probabilities show how clearly a student clears each threshold.
+- LinearScorer: softmax over a weight matrix loaded from a JSON model file.
+
+Select one with $STREAM_SCORER ("rules", "soft_rules" or the path of a
+linear model file), or set_scorer() at runtime.
+"""
+import json
+import os
+import threading
+
+import numpy as np
+
+from .data import QUIZ_QUESTIONS
+
+MARKS_COLUMNS = (
+    "maths_marks_percent",
+    "social_science_marks_percent",
+    "commerce_marks_percent",
+)
+FEATURES = tuple(QUIZ_QUESTIONS) + MARKS_COLUMNS
+STREAMS = ("Science", "Arts", "Commerce", "Vocational")
+
+# Decision list, first match wins: (stream, [(feature, threshold), ...]),
+# every condition being feature > threshold. Students matching no rule get
+# DEFAULT_STREAM.
+STREAM_RULES = (
+    ("Science", (("scientific_interest_score", 3.5), ("maths_marks_percent", 70))),
+    ("Arts", (("creativity_score", 3.5), ("social_science_marks_percent", 60))),
+    ("Commerce", (("business_interest_score", 3.5), ("commerce_marks_percent", 65))),
+)
+DEFAULT_STREAM = "Vocational"
+
+# Sigmoid width per feature unit: how far past a threshold counts as "clearly"
+# past it (about 2 widths gives 88%)
+SOFT_SCALE_QUIZ = 0.25
+SOFT_SCALE_MARKS = 5.0
+
+
+class RuleScorer:
+    """
+    Reference scorer: the threshold rules as they are, one-hot probabilities.
+    """
+
+    name = "rules"
+
+    def __init__(self, rules=STREAM_RULES, default=DEFAULT_STREAM):
+        self._conditions = [
+            (STREAMS.index(stream), [(FEATURES.index(f), t) for f, t in conditions])
+            for stream, conditions in rules
+        ]
+        self._default = STREAMS.index(default)
+
+    def predict(self, features):
+        features = np.asarray(features, dtype=np.float64)
+        choice = np.select(
+            [
+                np.logical_and.reduce([features[:, f] > t for f, t in conditions])
+                for _, conditions in self._conditions
+            ],
+            [stream for stream, _ in self._conditions],
+            default=self._default,
+        )
+        probabilities = np.zeros((len(features), len(STREAMS)))
+        probabilities[np.arange(len(features)), choice] = 1.0
+        return np.array(STREAMS, dtype=object)[choice], probabilities
+
+
+class SoftRuleScorer:
+    """
+    The decision list compiled into flat arrays (one entry per condition).
+    A rule fires with probability prod(sigmoid((x - threshold) / scale)) over
+    its conditions; rules are tried in order, so stream i gets
+    p_i * prod(1 - p_j for earlier j), and the default stream the rest.
+    """
+
+    name = "soft_rules"
+
+    def __init__(self, rules=STREAM_RULES, default=DEFAULT_STREAM):
+        feature, threshold, scale, starts = [], [], [], []
+        for _, conditions in rules:
+            starts.append(len(feature))
+            for f, t in conditions:
+                feature.append(FEATURES.index(f))
+                threshold.append(t)
+                scale.append(SOFT_SCALE_MARKS if f in MARKS_COLUMNS else SOFT_SCALE_QUIZ)
+        self._feature = np.array(feature)
+        self._threshold = np.array(threshold, dtype=np.float64)
+        self._scale = np.array(scale, dtype=np.float64)
+        self._starts = np.array(starts)
+        self._rule_stream = np.array([STREAMS.index(stream) for stream, _ in rules])
+        self._default = STREAMS.index(default)
+
+    def predict(self, features):
+        x = np.asarray(features, dtype=np.float64)[:, self._feature]
+        n = len(x)
+
+        # Hard labels: first rule whose conditions all hold
+        fired = np.logical_and.reduceat(x > self._threshold, self._starts, axis=1)
+        first = np.argmax(fired, axis=1)
+        choice = np.where(fired.any(axis=1), self._rule_stream[first], self._default)
+
+        # Soft probabilities down the same list
+        p_rule = np.multiply.reduceat(
+            1.0 / (1.0 + np.exp(-(x - self._threshold) / self._scale)), self._starts, axis=1
+        )
+        not_yet = np.cumprod(1.0 - p_rule, axis=1)
+        reach = np.hstack([np.ones((n, 1)), not_yet[:, :-1]])
+        probabilities = np.zeros((n, len(STREAMS)))
+        for rule, stream in enumerate(self._rule_stream):
+            probabilities[:, stream] += p_rule[:, rule] * reach[:, rule]
+        probabilities[:, self._default] += not_yet[:, -1]
+        return np.array(STREAMS, dtype=object)[choice], probabilities
+
+
+class LinearScorer:
+    """
+    Softmax over weights @ features + bias. Model file format:
+    {"streams": [...], "features": [...], "weights": [[...] per stream], "bias": [...]}
+    Features missing from the file get weight 0; streams must be among STREAMS.
+    """
+
+    name = "linear"
+
+    def __init__(self, streams, features, weights, bias):
+        self._weights = np.zeros((len(STREAMS), len(FEATURES)))
+        self._bias = np.full(len(STREAMS), -np.inf)
+        for stream, row, b in zip(streams, weights, bias):
+            slot = STREAMS.index(stream)
+            self._bias[slot] = b
+            for feature, w in zip(features, row):
+                self._weights[slot, FEATURES.index(feature)] = w
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            model = json.load(f)
+        return cls(model["streams"], model["features"], model["weights"], model["bias"])
+
+    def predict(self, features):
+        logits = np.asarray(features, dtype=np.float64) @ self._weights.T + self._bias
+        logits -= logits.max(axis=1, keepdims=True)
+        probabilities = np.exp(logits)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+        return np.array(STREAMS, dtype=object)[probabilities.argmax(axis=1)], probabilities
+
+
+SCORERS = {"rules": RuleScorer, "soft_rules": SoftRuleScorer}
+
+_scorer = None
+_scorer_lock = threading.Lock()
+
+
+def load_scorer(spec):
+    """
+    "rules", "soft_rules" or the path of a linear model JSON file -> scorer.
+    """
+    if spec in SCORERS:
+        return SCORERS[spec]()
+    return LinearScorer.load(spec)
+
+
+def get_scorer():
+    """
+    Returns the active scorer, loading it from $STREAM_SCORER on first use.
+    """
+    global _scorer
+    if _scorer is None:
+        with _scorer_lock:
+            if _scorer is None:
+                _scorer = load_scorer(os.environ.get("STREAM_SCORER") or "soft_rules")
+    return _scorer
+
+
+def set_scorer(scorer):
+    """
+    Replaces the active scorer (anything with a name and predict()).
+    """
+    global _scorer
+    _scorer = scorer
@@ -0,0 +1,292 @@
+"""
+Where CPU-bound recommendation work runs.
+
+Request handlers `await pool.run(fn, *args)` instead of calling fn on the
+event loop. The strategy is chosen with $EXECUTION_MODE:
+- inline: fn runs on the event loop. No handoff cost, but it blocks every
+  other request while it runs.
+- thread (default): a bounded thread pool. Keeps the loop free for I/O and
+  cheap requests; the work itself still shares the GIL.
+- process: a pool of worker processes, each with its own warmed-up copy of
+  the catalogue, so scoring runs on several cores. fn and its arguments must
+  be picklable (module-level functions, plain data). The parent appends its
+  add_college / remove_college edits since the last load from the data
+  files to a temporary log file, and every job carries only the parent's
+  snapshot version and where that log ends. A worker that is behind reloads
+  the files if the parent did and reads and replays just the edits it
+  hasn't applied yet, so jobs stay the same size however many edits pile up.
+
+$EXECUTION_WORKERS sets the pool size. Backpressure: at most
+$EXECUTION_QUEUE_LIMIT jobs wait for a free worker; past that run() raises
+Overloaded at once (the API answers 503 with Retry-After) instead of letting
+the queue, and everyone's latency, grow without bound.
+"""
+import asyncio
+import math
+import multiprocessing
+import os
+import pickle
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from . import metrics
+from . import snapshot as _snapshots
+from .logic import warmup
+
+MODES = ("inline", "thread", "process")
+
+QUEUE_WAIT = metrics.HistogramFamily(
+    "execution_queue_wait_seconds", "Time jobs waited for a free worker.", ("mode",)
+)
+RUN_TIME = metrics.HistogramFamily(
+    "execution_run_seconds", "Time jobs spent running on a worker.", ("mode",)
+)
+
+
+class Overloaded(Exception):
+    """
+    Raised by run() when the queue is full. retry_after is a hint in seconds.
+    """
+
+    def __init__(self, retry_after):
+        super().__init__("Too many requests queued, retry later")
+        self.retry_after = retry_after
+
+
+# --- Worker side ---
+
+# Parent snapshot this process's catalogue matches (process workers): its
+# version, its base (see CatalogueSnapshot), how many of its edits have been
+# applied here, and the edit log file they are read from
+_parent_version = None
+_parent_base = None
+_applied_edits = 0
+_edit_log = None
+
+
+def _init_worker(parent_base):
+    global _parent_base
+    warmup()
+    _parent_base = parent_base
+
+
+def _sync_catalogue(parent):
+    global _parent_version, _parent_base, _applied_edits, _edit_log
+    version, base, log_path, edit_count = parent
+    if version == _parent_version:
+        return
+    if base != _parent_base:
+        _snapshots.reload()
+        _parent_base, _applied_edits = base, 0
+        if _edit_log is not None:
+            _edit_log.close()
+            _edit_log = None
+    if edit_count > _applied_edits:
+        try:
+            if _edit_log is None:
+                _edit_log = open(log_path, "rb")
+            pending = [pickle.load(_edit_log) for _ in range(edit_count - _applied_edits)]
+        except FileNotFoundError:
+            # The parent has reloaded since this job was queued; the next
+            # job brings the new base
+            _parent_version = None
+            return
+        _snapshots.update(lambda snapshot: (snapshot.with_edits(pending), None))
+    warmup()
+    _parent_version, _applied_edits = version, edit_count
+
+
+def _execute(fn, args, submitted_at, parent=None):
+    # Runs on the worker. Phases recorded by fn are sent back to the parent,
+    # which adds them to the request being served.
+    started = time.time()
+    if parent is not None:
+        _sync_catalogue(parent)
+    with metrics.recording_phases() as phases:
+        result = fn(*args)
+    return started - submitted_at, time.time() - started, phases, result
+
+
+def _ready():
+    return os.getpid()
+
+
+# --- Pool ---
+
+class _EditLog:
+    """
+    Parent side of the process workers' catalogue sync: the current
+    snapshot's edits, appended to a temporary file per base as they are
+    made. sync_point() is what a job carries.
+    """
+
+    def __init__(self):
+        self._base = None
+        self._path = None
+        self._file = None
+        self._written = 0
+        # The log of the previous base, kept for jobs still queued with it
+        self._previous = None
+
+    def sync_point(self):
+        snapshot = _snapshots.current()
+        if snapshot.base != self._base:
+            self._rotate(snapshot.base)
+        if len(snapshot.edits) > self._written:
+            if self._file is None:
+                fd, self._path = tempfile.mkstemp(prefix="catalogue-edits-", suffix=".log")
+                self._file = os.fdopen(fd, "wb")
+            for edit in snapshot.edits[self._written:]:
+                pickle.dump(edit, self._file, pickle.HIGHEST_PROTOCOL)
+            self._file.flush()
+            self._written = len(snapshot.edits)
+        return (snapshot.version, snapshot.base, self._path, self._written)
+
+    def _rotate(self, base):
+        if self._previous is not None:
+            os.unlink(self._previous)
+        if self._file is not None:
+            self._file.close()
+        self._previous = self._path
+        self._base, self._path, self._file, self._written = base, None, None, 0
+
+    def close(self):
+        self._rotate(None)
+        self._rotate(None)
+
+class WorkerPool:
+    """
+    Runs jobs inline, on a thread pool or on a process pool, with a bounded
+    queue. run() must be called from the event loop thread.
+    """
+
+    def __init__(self, mode="thread", workers=None, queue_limit=128):
+        if mode not in MODES:
+            raise ValueError(f"Unknown execution mode {mode!r}, expected one of {', '.join(MODES)}")
+        self.mode = mode
+        if mode == "inline":
+            workers = 1
+        self.workers = workers or ((os.cpu_count() or 1) if mode == "process" else 4)
+        self.queue_limit = queue_limit
+        self._executor = None
+        self._edit_log = _EditLog() if mode == "process" else None
+        self._in_flight = 0
+        self._freed = None
+        # Moving average of run time, for the Retry-After hint
+        self._avg_run = 0.0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            os.environ.get("EXECUTION_MODE") or "thread",
+            int(os.environ.get("EXECUTION_WORKERS") or 0) or None,
+            int(os.environ.get("EXECUTION_QUEUE_LIMIT") or 128),
+        )
+
+    def start(self):
+        """
+        Creates the executor. For the process pool this starts every worker and
+        waits until each has loaded the catalogue.
+        """
+        if self._executor is not None or self.mode == "inline":
+            return
+        if self.mode == "thread":
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="recommend")
+            return
+        # Workers are spawned, not forked: the parent already runs threads
+        # (reloads, the watcher, the profiler)
+        executor = ProcessPoolExecutor(
+            self.workers, mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker, initargs=(_snapshots.current().base,),
+        )
+        for future in [executor.submit(_ready) for _ in range(self.workers)]:
+            future.result()
+        self._executor = executor
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        if self._edit_log is not None:
+            self._edit_log.close()
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    @property
+    def queue_depth(self):
+        return max(0, self._in_flight - self.workers)
+
+    def _retry_after(self):
+        waiting = self.queue_depth + 1
+        return max(1, math.ceil(waiting * self._avg_run / self.workers))
+
+    async def run(self, fn, *args, wait=False):
+        """
+        Runs fn(*args) according to the execution mode and returns its result.
+        When the queue is full, raises Overloaded, or with wait=True waits for
+        room (for work that is already under way, e.g. later chunks of an
+        upload).
+        """
+        while self.queue_depth >= self.queue_limit:
+            if not wait:
+                self.rejected += 1
+                raise Overloaded(self._retry_after())
+            if self._freed is None:
+                self._freed = asyncio.Condition()
+            async with self._freed:
+                await self._freed.wait()
+
+        submitted_at = time.time()
+        self._in_flight += 1
+        try:
+            if self.mode == "inline":
+                waited, ran, phases, result = _execute(fn, args, submitted_at)
+            else:
+                self.start()
+                parent = self._edit_log.sync_point() if self.mode == "process" else None
+                waited, ran, phases, result = await asyncio.get_running_loop().run_in_executor(
+                    self._executor, _execute, fn, args, submitted_at, parent
+                )
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self._in_flight -= 1
+            if self._freed is not None:
+                async with self._freed:
+                    self._freed.notify()
+
+        self.completed += 1
+        self._avg_run += 0.1 * (ran - self._avg_run)
+        QUEUE_WAIT.observe((self.mode,), waited)
+        RUN_TIME.observe((self.mode,), ran)
+        metrics.add_phases([("queue", waited)] + phases)
+        return result
+
+    def metrics(self):
+        """
+        Prometheus text lines for the pool; pass to metrics.register_collector.
+        """
+        lines = [
+            "# TYPE execution_workers gauge",
+            f'execution_workers{{mode="{self.mode}"}} {self.workers}',
+            "# TYPE execution_in_flight gauge",
+            f"execution_in_flight {self._in_flight}",
+            "# TYPE execution_queue_depth gauge",
+            f"execution_queue_depth {self.queue_depth}",
+            "# TYPE execution_queue_limit gauge",
+            f"execution_queue_limit {self.queue_limit}",
+            "# TYPE execution_jobs_total counter",
+        ]
+        for outcome in ("completed", "failed", "rejected"):
+            lines.append(f'execution_jobs_total{{outcome="{outcome}"}} {getattr(self, outcome)}')
+        return lines + QUEUE_WAIT.render() + RUN_TIME.render()
+
+
+pool = WorkerPool.from_env()
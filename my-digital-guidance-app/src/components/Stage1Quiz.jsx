@@ -1,5 +1,6 @@
 import React, { useState } from "react";
 import { useBackend } from "../context/BackendContext";
+import { runPipeline } from "../constants/pipeline";
 
 // Quiz questions array
 const quiz_questions = [
@@ -29,7 +30,7 @@ const quiz_questions = [
   ["People come to me for advice when making decisions.", "Q24"],
 ];
 
-const Stage1Quiz = ({ setPredictedStream }) => {
+const Stage1Quiz = ({ setPredictedStream, setSession }) => {
   const { backendUrl, loading, error } = useBackend();
   const [answers, setAnswers] = useState({});
   const [marks, setMarks] = useState({
@@ -74,24 +75,21 @@ const Stage1Quiz = ({ setPredictedStream }) => {
         location_encoded: Number(location),
       };
 
-      console.log("Submitting payload to /stage1:", payload);
+      console.log("Submitting payload to /pipeline (stage 1):", payload);
 
-      const response = await fetch(`${backendUrl}/stage1`, {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify(payload),
-      });
-
-      if (!response.ok) throw new Error("Failed to get prediction");
-
-      const data = await response.json();
-      setResult(data);
-      console.log("Stage1 result:", data);
+      // The server keeps the result under a session token, so Stage 2 only
+      // has to send its own answers
+      await runPipeline(backendUrl, { stage1: payload }, (data) => {
+        if (data.stage !== 1) return;
+        setResult(data);
+        console.log("Stage1 result:", data);
 
-      // Pass predicted stream to parent for Stage 2
-     if (data.predicted_stream && setPredictedStream) {
-    setPredictedStream(data.predicted_stream);
-    }
+        if (setSession) setSession(data.session);
+        // Pass predicted stream to parent for Stage 2
+        if (data.predicted_stream && setPredictedStream) {
+          setPredictedStream(data.predicted_stream);
+        }
+      });
 
     } catch (err) {
       console.error(err);
@@ -1,5 +1,6 @@
 import React, { useState } from "react";
 import { useBackend } from "../context/BackendContext";
+import { runPipeline } from "../constants/pipeline";
 
 const stream_quizzes = {
   Science: [
@@ -32,7 +33,7 @@ const stream_quizzes = {
   ]
 };
 
-const Stage2Quiz = ({ predictedStream, setPredictedSubject }) => {
+const Stage2Quiz = ({ predictedStream, setPredictedSubject, session, setCollegeResult }) => {
   const { backendUrl, loading, error } = useBackend();
   const [answers, setAnswers] = useState({});
   const [result, setResult] = useState(null);
@@ -59,23 +60,27 @@ const Stage2Quiz = ({ predictedStream, setPredictedSubject }) => {
         ...answers
       };
 
-      console.log("Submitting payload to /stage2:", payload);
-
-      const response = await fetch(`${backendUrl}/stage2`, {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify(payload),
+      console.log("Submitting payload to /pipeline (stages 2-3):", payload);
+
+      // One round trip: the server streams the Stage 2 result, then the
+      // Stage 3 colleges for the predicted subject
+      let subject = null;
+      let colleges = null;
+      await runPipeline(backendUrl, { session, stage2: payload }, (data) => {
+        if (data.stage === 2) {
+          if (data.error) throw new Error(data.error);
+          setResult(data);
+          console.log("Stage2 result:", data);
+          subject = data.predicted_subject;
+        } else if (data.stage === 3) {
+          colleges = data;
+        }
       });
 
-      if (!response.ok) throw new Error("Failed to get career prediction");
-
-      const data = await response.json();
-      setResult(data);
-      console.log("Stage2 result:", data);
-
-      // Pass predicted subject to parent for Stage 3
-      if (data.predicted_subject && setPredictedSubject) {
-        setPredictedSubject(data.predicted_subject);
+      // Pass predicted subject (and its colleges) to parent for Stage 3
+      if (setCollegeResult) setCollegeResult(colleges);
+      if (subject && setPredictedSubject) {
+        setPredictedSubject(subject);
       }
 
     } catch (err) {
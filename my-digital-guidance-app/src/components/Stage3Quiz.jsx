@@ -1,17 +1,23 @@
 import React, { useState, useEffect } from "react";
 import { useBackend } from "../context/BackendContext";
 
-const Stage3Quiz = ({ predictedStream, predictedSubject }) => {
+const Stage3Quiz = ({ predictedStream, predictedSubject, collegeResult }) => {
   const { backendUrl, loading, error } = useBackend();
   const [colleges, setColleges] = useState([]);
   const [result, setResult] = useState(null);
   const [submitting, setSubmitting] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
-    if (predictedStream && predictedSubject && backendUrl) {
+    // Stage 2 usually brings the colleges along from /pipeline
+    if (collegeResult) {
+      setResult(collegeResult);
+      setColleges(collegeResult.recommended_colleges || []);
+      setSubmitting(false);
+    } else if (predictedStream && predictedSubject && backendUrl) {
       fetchColleges();
     }
-  }, [predictedStream, predictedSubject, backendUrl]);
+  }, [predictedStream, predictedSubject, backendUrl, collegeResult]);
 
   const fetchColleges = async () => {
     if (!backendUrl) return;
@@ -49,6 +55,35 @@ const Stage3Quiz = ({ predictedStream, predictedSubject }) => {
     }
   };
 
+  // Next page of colleges, continuing from the last response's cursor
+  const fetchMoreColleges = async () => {
+    if (!backendUrl || !result || !result.next_cursor) return;
+
+    setLoadingMore(true);
+    try {
+      const response = await fetch(`${backendUrl}/stage3`, {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({
+          predicted_stream: predictedStream,
+          predicted_subject: predictedSubject,
+          cursor: result.next_cursor
+        }),
+      });
+
+      if (!response.ok) throw new Error("Failed to load more colleges");
+
+      const data = await response.json();
+      setResult(data);
+      setColleges((previous) => [...previous, ...(data.recommended_colleges || [])]);
+    } catch (err) {
+      console.error(err);
+      setResult({ ...result, next_cursor: null, error: err.message });
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   if (loading) return <p>Loading backend URL...</p>;
   if (error) return <p className="text-red-600">Error: {error.message}</p>;
   if (!predictedStream || !predictedSubject) return <p>No stream or subject data available</p>;
@@ -206,6 +241,18 @@ const Stage3Quiz = ({ predictedStream, predictedSubject }) => {
         </div>
       )}
 
+      {result && result.next_cursor && (
+        <div className="text-center mt-6">
+          <button
+            onClick={fetchMoreColleges}
+            disabled={loadingMore}
+            className="px-4 py-2 bg-blue-600 text-white rounded hover:bg-blue-700 disabled:opacity-50"
+          >
+            {loadingMore ? "Loading..." : "Show more colleges"}
+          </button>
+        </div>
+      )}
+
       {colleges.length === 0 && !submitting && result && !result.error && (
         <div className="text-center py-8">
           <p className="text-gray-600">No colleges found for your criteria.</p>
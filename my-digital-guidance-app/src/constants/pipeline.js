@@ -0,0 +1,33 @@
+// POSTs to /pipeline and calls onStage(result) for each stage's result as
+// soon as its NDJSON line arrives, so Stage 2 can show its prediction while
+// the colleges for Stage 3 are still being ranked.
+export const runPipeline = async (backendUrl, body, onStage) => {
+  const post = (payload) => fetch(`${backendUrl}/pipeline`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify(payload),
+  });
+
+  let response = await post(body);
+  // 404: the session is gone (server restart, expiry) and the request relied
+  // on it; send it again as a fresh run
+  if (response.status === 404 && body.session) {
+    const { session, ...fresh } = body;
+    response = await post(fresh);
+  }
+
+  if (!response.ok) throw new Error("Pipeline request failed");
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    const lines = buffer.split("\n");
+    buffer = lines.pop();
+    lines.filter((line) => line.trim()).forEach((line) => onStage(JSON.parse(line)));
+  }
+  if (buffer.trim()) onStage(JSON.parse(buffer));
+};
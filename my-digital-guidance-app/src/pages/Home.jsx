@@ -6,17 +6,22 @@ import Stage3Quiz from "../components/Stage3Quiz";
 const Home = () => {
   const [predictedStream, setPredictedStream] = useState(null);
   const [predictedSubject, setPredictedSubject] = useState(null);
+  // /pipeline session token and the Stage 3 result that arrives with Stage 2
+  const [session, setSession] = useState(null);
+  const [collegeResult, setCollegeResult] = useState(null);
 
   return (
     <div className="p-4">
       {/* Stage 1 */}
-      <Stage1Quiz setPredictedStream={setPredictedStream} />
+      <Stage1Quiz setPredictedStream={setPredictedStream} setSession={setSession} />
 
       {/* Stage 2 */}
       {predictedStream && (
         <Stage2Quiz 
           predictedStream={predictedStream} 
           setPredictedSubject={setPredictedSubject}
+          session={session}
+          setCollegeResult={setCollegeResult}
         />
       )}
 
@@ -25,6 +30,7 @@ const Home = () => {
         <Stage3Quiz 
           predictedStream={predictedStream} 
           predictedSubject={predictedSubject}
+          collegeResult={collegeResult}
         />
       )}
     </div>